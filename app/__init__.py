@@ -34,6 +34,22 @@ def make_celery(app):
         backend=app.config.get("CELERY_RESULT_BACKEND"),
         broker=app.config.get("CELERY_BROKER_URL"),
     )
+    celery.conf.update(
+        # Nothing reads task results; a caller that needs one must pass
+        # ignore_result=False when sending the task
+        task_ignore_result=True,
+        # Long-running jobs (backups, scrubs): hand each worker one task at a
+        # time so a new job never queues behind a busy worker's prefetch
+        task_acks_late=True,
+        worker_prefetch_multiplier=1,
+        task_reject_on_worker_lost=True,
+        # Beat started as "celery -A celery_worker.celery beat" (installer,
+        # moxnas-service.py) only sees this schedule, not celery_beat_config.
+        # Request error events reach SystemLog only through this task
+        beat_schedule={
+            "ship-error-logs": {"task": "app.tasks.ship_error_logs", "schedule": 60.0},
+        },
+    )
 
     class ContextTask(celery.Task):
         """Make celery tasks work with Flask app context"""
@@ -50,12 +66,19 @@ def create_app(config_name="default"):
     """Application factory"""
     app = Flask(__name__)
 
+    from app.utils.json_provider import ORJSONProvider
+
+    app.json = ORJSONProvider(app)
+
     # Load configuration
     from config import config
 
     app.config.from_object(config[config_name])
     config[config_name].init_app(app)
 
+    # Must be set before anything touches app.jinja_env
+    _setup_template_cache(app)
+
     # Initialize extensions
     db.init_app(app)
     login_manager.init_app(app)
@@ -157,6 +180,9 @@ def create_app(config_name="default"):
 
     # Configure enhanced logging
     _setup_enhanced_logging(app)
+
+    # Compile error pages now so the first error on a worker skips parsing
+    _preload_error_templates(app)
     
     # Setup request correlation IDs
     @app.before_request
@@ -200,11 +226,70 @@ def create_app(config_name="default"):
     return app
 
 
+ERROR_TEMPLATES = (
+    "errors/400.html",
+    "errors/403.html",
+    "errors/404.html",
+    "errors/429.html",
+    "errors/500.html",
+    "errors/503.html",
+)
+
+
+def _setup_template_cache(app):
+    """Share compiled template bytecode between workers via the filesystem
+
+    Jinja executes whatever bytecode it finds in the cache directory, so
+    the directory must belong to this user and be closed to everyone else.
+    Without JINJA_BYTECODE_CACHE_DIR Jinja picks its own per-user 0700
+    directory and checks it; an explicit directory is checked here. An
+    empty setting disables the cache.
+    """
+    import stat
+    from jinja2 import FileSystemBytecodeCache
+
+    cache_dir = app.config.get("JINJA_BYTECODE_CACHE_DIR")
+    if cache_dir == "":
+        return
+
+    try:
+        if cache_dir is None:
+            bytecode_cache = FileSystemBytecodeCache()
+        else:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            st = os.lstat(cache_dir)
+            if (
+                not stat.S_ISDIR(st.st_mode)
+                or st.st_uid != os.getuid()
+                or st.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+            ):
+                raise OSError(f"{cache_dir} is not a directory private to this user")
+            bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    except (OSError, RuntimeError) as e:
+        app.logger.warning(f"Template bytecode cache disabled: {e}")
+        return
+
+    app.jinja_options = {**app.jinja_options, "bytecode_cache": bytecode_cache}
+
+
+def _preload_error_templates(app):
+    """Load error templates into the Jinja cache at startup"""
+    from jinja2 import TemplateError
+
+    for template_name in ERROR_TEMPLATES:
+        try:
+            app.jinja_env.get_template(template_name)
+        except TemplateError as e:
+            app.logger.warning(f"Could not preload {template_name}: {e}")
+
+
 def _setup_enhanced_logging(app):
     """Setup enhanced logging system"""
     from app.utils.enhanced_logging import (
-        StructuredLogFilter, PerformanceLogFilter, SecurityLogFilter
+        StructuredLogFilter, PerformanceLogFilter, SecurityLogFilter,
+        setup_error_log_sink
     )
+    import atexit
     import logging.handlers
     import json
     
@@ -305,6 +390,10 @@ def _setup_enhanced_logging(app):
             stdout_handler.addFilter(structured_filter)
             stdout_handler.setLevel(log_level)
             app.logger.addHandler(stdout_handler)
+        
+        # Error events from request handlers, shipped to SystemLog by a task
+        error_sink_listener = setup_error_log_sink(app)
+        atexit.register(error_sink_listener.stop)
 
 
 # Export socketio for use in run scripts
@@ -17,6 +17,7 @@ from app.models import (
     ShareStatus,
 )
 from app import db, limiter
+from app.utils.aggregates import invalidate_storage_aggregates
 from app.storage.manager import storage_manager
 from app.utils.error_handler import (
     secure_route,
@@ -212,6 +213,7 @@ def api_create_pool():
         success, error = DatabaseErrorHandler.safe_commit()
         if not success:
             return jsonify({"error": f"Database operation failed: {error}"}), 500
+        invalidate_storage_aggregates()
 
         SystemLog.log_event(
             level=LogLevel.INFO,
@@ -1,19 +1,70 @@
 """Backup management routes with enhanced error handling"""
 from flask import render_template, request, jsonify, flash, redirect, url_for
+from flask import Response, stream_with_context, abort
+from flask import current_app as flask_app
 from flask_login import login_required, current_user
 from app.backups import bp
 from app.models import BackupJob, BackupStatus, Dataset, SystemLog, LogLevel
-from app import db
+from app import db, make_celery
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, timedelta
 import os
 import subprocess
 from celery import current_app
+from sqlalchemy import delete as sql_delete, func, update
+from sqlalchemy.orm import load_only
+from sqlalchemy.exc import IntegrityError
+import orjson
 from app.utils.enhanced_logging import get_logger, log_operation
 from app.utils.error_handling import (
     with_error_handling, RetryPolicy, ErrorCategory, error_context,
     handle_database_errors, MoxNASError
 )
 
+# Path probes run here so a stalled NFS/ZFS mount cannot block the web worker
+_PATH_CHECK_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="backup-path-check")
+_PATH_CHECK_TIMEOUT = 2.0  # seconds
+
+# Unique constraints on backup job names, current and legacy table layout
+_NAME_UNIQUE_CONSTRAINTS = ("ix_backup_jobs_name", "ix_backup_job_name")
+# How drivers without constraint names (SQLite, MySQL) spell the same failure
+_NAME_UNIQUE_MARKERS = _NAME_UNIQUE_CONSTRAINTS + ("backup_jobs.name", "backup_job.name")
+
+
+def _get_celery():
+    """Return the Celery client bound to the current Flask app, creating it once"""
+    app = flask_app._get_current_object()
+    client = app.extensions.get("celery")
+    if client is None:
+        client = make_celery(app)
+        app.extensions["celery"] = client
+    return client
+
+
+def _path_exists(path):
+    """Check whether path exists, giving up after _PATH_CHECK_TIMEOUT
+
+    Returns True/False, or None if the check timed out.
+    """
+    future = _PATH_CHECK_EXECUTOR.submit(os.path.lexists, path)
+    try:
+        return future.result(timeout=_PATH_CHECK_TIMEOUT)
+    except FutureTimeoutError:
+        return None
+
+
+def _is_duplicate_name(error):
+    """Whether an IntegrityError came from the unique index on backup job names
+
+    Other constraint failures (NOT NULL, foreign keys) must not be reported
+    to the user as a duplicate name.
+    """
+    constraint = getattr(getattr(error.orig, "diag", None), "constraint_name", None)
+    if constraint:
+        return constraint in _NAME_UNIQUE_CONSTRAINTS
+    message = str(error.orig)
+    return any(marker in message for marker in _NAME_UNIQUE_MARKERS)
+
 
 @bp.route("/")
 @login_required
@@ -125,25 +176,27 @@ def create():
                     validation_errors.append("Backup job name must be at least 3 characters")
                 elif len(name) > 100:
                     validation_errors.append("Backup job name must be less than 100 characters")
-                
-                # Check for duplicate names
-                if name:
-                    existing_job = BackupJob.query.filter_by(name=name).first()
-                    if existing_job:
-                        validation_errors.append("Backup job name already exists")
 
                 # Validate paths
                 if not source_path:
                     validation_errors.append("Source path is required")
-                elif not os.path.exists(source_path):
-                    validation_errors.append(f"Source path does not exist: {source_path}")
-                elif not os.access(source_path, os.R_OK):
-                    validation_errors.append(f"Source path is not readable: {source_path}")
+                else:
+                    source_exists = _path_exists(source_path)
+                    if source_exists is None:
+                        validation_errors.append(f"Source path check timed out: {source_path}")
+                    elif not source_exists:
+                        validation_errors.append(f"Source path does not exist: {source_path}")
+                    elif not os.access(source_path, os.R_OK):
+                        validation_errors.append(f"Source path is not readable: {source_path}")
 
                 if not destination_path:
                     validation_errors.append("Destination path is required")
-                elif os.path.exists(destination_path) and not os.access(destination_path, os.W_OK):
-                    validation_errors.append(f"Destination path is not writable: {destination_path}")
+                else:
+                    destination_exists = _path_exists(destination_path)
+                    if destination_exists is None:
+                        validation_errors.append(f"Destination path check timed out: {destination_path}")
+                    elif destination_exists and not os.access(destination_path, os.W_OK):
+                        validation_errors.append(f"Destination path is not writable: {destination_path}")
                 
                 # Validate backup type
                 valid_backup_types = ['full', 'incremental', 'differential']
@@ -197,9 +250,23 @@ def create():
                             # Continue without scheduling
                             job.next_run = None
 
-                    # Save to database with error handling
+                    # Save to database; the unique index on name rejects duplicates
                     db.session.add(job)
-                    db.session.commit()
+                    try:
+                        db.session.commit()
+                    except IntegrityError as integrity_error:
+                        if not _is_duplicate_name(integrity_error):
+                            raise
+                        db.session.rollback()
+                        logger.warning(
+                            "Backup job creation failed validation",
+                            category='backups',
+                            operation_type='validation_failed',
+                            user_id=current_user.id,
+                            details={'errors': ["Backup job name already exists"], 'name': name}
+                        )
+                        flash("Backup job name already exists", "danger")
+                        return redirect(url_for("backups.create"))
 
                     logger.info(
                         f"Backup job created successfully: {name}",
@@ -296,49 +363,67 @@ def detail(job_id):
 @bp.route("/<int:job_id>/start", methods=["POST"])
 @login_required
 def start(job_id):
-    """Start backup job manually"""
+    """Start backup job manually
+
+    Workers run with -Ofair and a prefetch multiplier of 1, so the job is
+    picked up by an idle worker rather than queueing behind a running backup.
+    """
     if not current_user.is_admin():
         return jsonify({"success": False, "error": "Administrator privileges required"}), 403
 
-    job = BackupJob.query.get_or_404(job_id)
+    # Claim the job in one statement so two concurrent starts cannot both
+    # pass the "not running" check
+    job_name = db.session.execute(
+        update(BackupJob)
+        .where(BackupJob.id == job_id, BackupJob.status != BackupStatus.RUNNING)
+        .values(status=BackupStatus.RUNNING, last_run=datetime.utcnow(), error_message=None)
+        .returning(BackupJob.name)
+    ).scalar_one_or_none()
 
-    if job.status == BackupStatus.RUNNING:
+    if job_name is None:
+        db.session.rollback()
+        if db.session.get(BackupJob, job_id) is None:
+            abort(404)
         return jsonify({"success": False, "error": "Backup job is already running"}), 400
 
     try:
-        # Start backup task
-        from app.tasks import run_backup_job
-
-        task = run_backup_job.delay(job.id)
+        # Start backup task by name on a pooled producer connection. It goes
+        # to the default queue: deployed workers run without -Q, so nothing
+        # consumes a dedicated backups queue
+        celery_client = _get_celery()
+        with celery_client.producer_or_acquire() as producer:
+            task = celery_client.send_task(
+                "app.tasks.run_backup_job",
+                args=(job_id,),
+                ignore_result=True,
+                producer=producer,
+            )
 
-        # Update job status
-        job.status = BackupStatus.RUNNING
-        job.last_run = datetime.utcnow()
-        job.error_message = None
         db.session.commit()
 
         SystemLog.log_event(
             level=LogLevel.INFO,
             category="backups",
-            message=f"Backup job started: {job.name} by {current_user.username}",
+            message=f"Backup job started: {job_name} by {current_user.username}",
             user_id=current_user.id,
             ip_address=request.remote_addr,
-            details={"job_id": job.id, "task_id": task.id},
+            details={"job_id": job_id, "task_id": task.id},
         )
 
         return jsonify(
             {
                 "success": True,
-                "message": f'Backup job "{job.name}" started successfully',
+                "message": f'Backup job "{job_name}" started successfully',
                 "task_id": task.id,
             }
         )
 
     except Exception as e:
+        db.session.rollback()
         SystemLog.log_event(
             level=LogLevel.ERROR,
             category="backups",
-            message=f"Error starting backup job {job.name}: {str(e)}",
+            message=f"Error starting backup job {job_name}: {str(e)}",
             user_id=current_user.id,
             ip_address=request.remote_addr,
         )
@@ -352,18 +437,21 @@ def stop(job_id):
     if not current_user.is_admin():
         return jsonify({"success": False, "error": "Administrator privileges required"}), 403
 
-    job = BackupJob.query.get_or_404(job_id)
+    job = db.session.get(
+        BackupJob, job_id, options=[load_only(BackupJob.id, BackupJob.name, BackupJob.status)]
+    )
+    if job is None:
+        abort(404)
 
     if job.status != BackupStatus.RUNNING:
         return jsonify({"success": False, "error": "Backup job is not running"}), 400
 
     try:
         # Implement Celery task cancellation
-        from app import celery
-        from app.tasks import backup_task
+        celery = _get_celery()
 
         # Find and revoke the running task
-        active_tasks = celery.control.active()
+        active_tasks = celery.control.inspect().active() or {}
         task_cancelled = False
 
         for worker, tasks in active_tasks.items():
@@ -415,14 +503,20 @@ def delete(job_id):
     if not current_user.is_admin():
         return jsonify({"success": False, "error": "Administrator privileges required"}), 403
 
-    job = BackupJob.query.get_or_404(job_id)
+    # Delete only if not running, in one statement
+    job_name = db.session.execute(
+        sql_delete(BackupJob)
+        .where(BackupJob.id == job_id, BackupJob.status != BackupStatus.RUNNING)
+        .returning(BackupJob.name)
+    ).scalar_one_or_none()
 
-    if job.status == BackupStatus.RUNNING:
+    if job_name is None:
+        db.session.rollback()
+        if db.session.get(BackupJob, job_id) is None:
+            abort(404)
         return jsonify({"success": False, "error": "Cannot delete running backup job"}), 400
 
     try:
-        job_name = job.name
-        db.session.delete(job)
         db.session.commit()
 
         SystemLog.log_event(
@@ -443,7 +537,7 @@ def delete(job_id):
         SystemLog.log_event(
             level=LogLevel.ERROR,
             category="backups",
-            message=f"Error deleting backup job {job.name}: {str(e)}",
+            message=f"Error deleting backup job {job_name}: {str(e)}",
             user_id=current_user.id,
             ip_address=request.remote_addr,
         )
@@ -453,32 +547,59 @@ def delete(job_id):
 @bp.route("/api/status")
 @login_required
 def api_status():
-    """API endpoint for backup status summary"""
-    jobs = BackupJob.query.all()
+    """API endpoint for backup status summary
+
+    The job list is streamed row by row so memory stays flat however many
+    jobs exist.
+    """
+    counts = dict(
+        db.session.query(BackupJob.status, func.count(BackupJob.id))
+        .group_by(BackupJob.status)
+        .all()
+    )
 
     status_summary = {
-        "total_jobs": len(jobs),
-        "scheduled": len([j for j in jobs if j.status == BackupStatus.SCHEDULED]),
-        "running": len([j for j in jobs if j.status == BackupStatus.RUNNING]),
-        "completed": len([j for j in jobs if j.status == BackupStatus.COMPLETED]),
-        "failed": len([j for j in jobs if j.status == BackupStatus.FAILED]),
-        "jobs": [],
+        "total_jobs": sum(counts.values()),
+        "scheduled": counts.get(BackupStatus.SCHEDULED, 0),
+        "running": counts.get(BackupStatus.RUNNING, 0),
+        "completed": counts.get(BackupStatus.COMPLETED, 0),
+        "failed": counts.get(BackupStatus.FAILED, 0),
     }
 
-    for job in jobs:
-        status_summary["jobs"].append(
-            {
-                "id": job.id,
-                "name": job.name,
-                "status": job.status.value,
-                "last_run": job.last_run.isoformat() if job.last_run else None,
-                "next_run": job.next_run.isoformat() if job.next_run else None,
-                "bytes_backed_up": job.bytes_backed_up,
-                "error_message": job.error_message,
-            }
+    rows = (
+        db.session.query(
+            BackupJob.id,
+            BackupJob.name,
+            BackupJob.status,
+            BackupJob.last_run,
+            BackupJob.next_run,
+            BackupJob.bytes_backed_up,
+            BackupJob.error_message,
         )
+        .order_by(BackupJob.id)
+        .execution_options(yield_per=500)
+    )
+
+    def generate():
+        # Summary object with its closing brace swapped for the jobs array
+        yield orjson.dumps(status_summary)[:-1] + b',"jobs":['
+        separator = b""
+        for job in rows:
+            yield separator + orjson.dumps(
+                {
+                    "id": job.id,
+                    "name": job.name,
+                    "status": job.status.value,
+                    "last_run": job.last_run.isoformat() if job.last_run else None,
+                    "next_run": job.next_run.isoformat() if job.next_run else None,
+                    "bytes_backed_up": job.bytes_backed_up,
+                    "error_message": job.error_message,
+                }
+            )
+            separator = b","
+        yield b"]}"
 
-    return jsonify(status_summary)
+    return Response(stream_with_context(generate()), mimetype="application/json")
 
 
 def calculate_next_run(schedule_expression):
@@ -1,24 +1,140 @@
-"""Enhanced error handlers with structured logging and standardized responses"""
-from flask import render_template, request, jsonify, current_app
+"""Enhanced error handlers with structured logging and standardized responses
+
+Handlers must not hold a database connection across slow work: the pool
+gives up after SQLALCHEMY_ENGINE_OPTIONS['pool_timeout'] seconds, and an
+error storm would otherwise starve normal requests of connections.
+"""
+from flask import render_template, request, current_app
 from werkzeug.exceptions import HTTPException
 from app.errors import bp
-from app.models import SystemLog, LogLevel
-from app.utils.enhanced_logging import get_logger, correlation_context
+from app.utils.enhanced_logging import (
+    get_logger, correlation_context, log_error_event, SystemLogHandler
+)
 from app.utils.error_handling import MoxNASError, ErrorSeverity
+from cachetools import TTLCache
+import logging
+import itertools
+import orjson
+import os
+import secrets
+import threading
 import traceback
-import uuid
 from datetime import datetime
 
 
+# Warning and above from this module's logger are mirrored into SystemLog.
+# system_error records (500s) reach it via the JSON-lines sink instead, so a
+# failing database is never written to from the error path.
+_error_logger = logging.getLogger('error_handler')
+if not any(isinstance(h, SystemLogHandler) for h in _error_logger.handlers):
+    _error_logger.addHandler(SystemLogHandler(exclude_categories={'system_error'}))
+
+# Error ids: per-process random prefix + counter, no urandom read per error
+_EID_PREFIX = secrets.token_hex(8)
+_EID_COUNTER = itertools.count()
+
+
+def _reseed_error_ids():
+    """Give forked workers their own error id prefix"""
+    global _EID_PREFIX, _EID_COUNTER
+    _EID_PREFIX = secrets.token_hex(8)
+    _EID_COUNTER = itertools.count()
+
+
+os.register_at_fork(after_in_child=_reseed_error_ids)
+
+
+def _eid():
+    """Return a process-unique error id"""
+    return f"{_EID_PREFIX}{next(_EID_COUNTER):08x}"
+
+
+# (ip, path) pairs that already produced a 404 recently; repeats from
+# scanners are served without logging again
+_404_SEEN = TTLCache(maxsize=50000, ttl=60)
+_404_SEEN_LOCK = threading.Lock()
+
+# HTTP status code per MoxNASError category
+_STATUS_CODES = {
+    'validation': 400,
+    'authentication': 401,
+    'authorization': 403,
+    'network': 503,
+    'database': 503,
+    'storage': 503,
+    'system': 500
+}
+
+# Logger method name per MoxNASError severity
+_LOG_METHODS = {
+    ErrorSeverity.LOW: 'info',
+    ErrorSeverity.MEDIUM: 'warning',
+    ErrorSeverity.HIGH: 'error',
+    ErrorSeverity.CRITICAL: 'critical'
+}
+
+# Error page template per HTTP status code
+_TEMPLATE_MAP = {
+    400: "errors/400.html",
+    401: "errors/401.html",
+    403: "errors/403.html",
+    500: "errors/500.html",
+    503: "errors/503.html"
+}
+
+
+def _build_envelope(code, message, **extra):
+    """Pre-serialize a constant error envelope
+
+    Only error_id, correlation_id and timestamp vary per response; they are
+    filled into the %b slots by _json_error.
+    """
+    error_fields = b''.join(b',"%s":%s' % (k.encode(), orjson.dumps(v)) for k, v in extra.items())
+    return (
+        b'{"success":false,"error":{"code":%d,"message":%s,'
+        b'"error_id":%%b,"correlation_id":%%b%s},"timestamp":%%b}'
+        % (code, orjson.dumps(message), error_fields)
+    )
+
+
+_ENV_400 = _build_envelope(400, "Bad request - invalid or malformed request data")
+_ENV_403 = _build_envelope(403, "Access denied - insufficient privileges")
+_ENV_404 = _build_envelope(404, "Resource not found")
+_ENV_500 = _build_envelope(500, "Internal server error - the server encountered an unexpected condition")
+_ENV_500_UNHANDLED = _build_envelope(500, "An unexpected error occurred")
+_ENV_503 = _build_envelope(503, "Service temporarily unavailable - please try again later", retry_after=60)
+
+
+def _json_error(envelope, status_code, error_id):
+    """Fill a pre-serialized envelope and wrap it in a JSON response"""
+    body = envelope % (
+        orjson.dumps(error_id),
+        orjson.dumps(correlation_context.correlation_id),
+        orjson.dumps(datetime.utcnow().isoformat() + 'Z'),
+    )
+    return current_app.response_class(body, status=status_code, mimetype='application/json')
+
+
+def _json_response(data, status_code):
+    """Serialize a variable-shape payload with orjson"""
+    return current_app.response_class(orjson.dumps(data), status=status_code, mimetype='application/json')
+
+
+def _capture_traceback():
+    """Whether to format the current traceback; format_exc walks the whole stack"""
+    return current_app.debug or current_app.config.get('CAPTURE_TRACEBACKS', False)
+
+
 @bp.app_errorhandler(400)
 def bad_request(error):
     """Handle 400 Bad Request errors with enhanced logging"""
     logger = get_logger('error_handler')
+    url = request.url
     
-    error_id = str(uuid.uuid4())
+    error_id = _eid()
     error_details = {
         'error_id': error_id,
-        'url': request.url,
+        'url': url,
         'method': request.method,
         'user_agent': request.headers.get('User-Agent'),
         'content_type': request.content_type
@@ -32,25 +148,8 @@ def bad_request(error):
         details=error_details
     )
     
-    SystemLog.log_event(
-        level=LogLevel.WARNING,
-        category="http_error",
-        message=f"Bad request: {request.url}",
-        ip_address=request.remote_addr,
-        details=error_details,
-    )
-    
     if request.is_json:
-        return jsonify({
-            "success": False,
-            "error": {
-                "code": 400,
-                "message": "Bad request - invalid or malformed request data",
-                "error_id": error_id,
-                "correlation_id": correlation_context.correlation_id
-            },
-            "timestamp": datetime.utcnow().isoformat() + 'Z'
-        }), 400
+        return _json_error(_ENV_400, 400, error_id)
     
     return render_template("errors/400.html", error_id=error_id), 400
 
@@ -59,43 +158,28 @@ def bad_request(error):
 def forbidden(error):
     """Handle 403 Forbidden errors with security logging"""
     logger = get_logger('error_handler')
+    headers = request.headers
+    url = request.url
     
-    error_id = str(uuid.uuid4())
+    error_id = _eid()
     error_details = {
         'error_id': error_id,
-        'url': request.url,
+        'url': url,
         'method': request.method,
         'endpoint': request.endpoint,
-        'user_agent': request.headers.get('User-Agent'),
-        'referer': request.headers.get('Referer')
+        'user_agent': headers.get('User-Agent'),
+        'referer': headers.get('Referer')
     }
     
     logger.security_event(
         'access_denied',
         'medium',
-        f"Access denied to {request.url}",
+        f"Access denied to {url}",
         **error_details
     )
     
-    SystemLog.log_event(
-        level=LogLevel.WARNING,
-        category="security",
-        message=f"Access denied to {request.url}",
-        ip_address=request.remote_addr,
-        details=error_details,
-    )
-    
     if request.is_json:
-        return jsonify({
-            "success": False,
-            "error": {
-                "code": 403,
-                "message": "Access denied - insufficient privileges",
-                "error_id": error_id,
-                "correlation_id": correlation_context.correlation_id
-            },
-            "timestamp": datetime.utcnow().isoformat() + 'Z'
-        }), 403
+        return _json_error(_ENV_403, 403, error_id)
     
     return render_template("errors/403.html", error_id=error_id), 403
 
@@ -103,38 +187,46 @@ def forbidden(error):
 @bp.app_errorhandler(404)
 def not_found(error):
     """Handle 404 Not Found errors"""
+    path = request.path
+    is_json = request.is_json
+    key = (request.remote_addr, path)
+    with _404_SEEN_LOCK:
+        repeat = key in _404_SEEN
+        if not repeat:
+            _404_SEEN[key] = True
+    
+    is_static = path.startswith('/static/')
+    
+    # Repeated probes and missing static assets get the page without an id
+    # or any logging
+    if (repeat or is_static) and not is_json:
+        return render_template("errors/404.html"), 404
+    
     logger = get_logger('error_handler')
     
-    error_id = str(uuid.uuid4())
+    error_id = _eid()
     
-    # Don't log static assets as errors to avoid log spam
-    if not request.path.startswith('/static/'):
+    # Don't log static assets or repeated probes as errors to avoid log spam
+    if not repeat and not is_static:
+        headers = request.headers
+        url = request.url
         error_details = {
             'error_id': error_id,
-            'url': request.url,
+            'url': url,
             'method': request.method,
-            'user_agent': request.headers.get('User-Agent'),
-            'referer': request.headers.get('Referer')
+            'user_agent': headers.get('User-Agent'),
+            'referer': headers.get('Referer')
         }
         
         logger.info(
-            f"Resource not found: {request.url}",
+            f"Resource not found: {url}",
             category='http_error',
             error_code=404,
             details=error_details
         )
     
-    if request.is_json:
-        return jsonify({
-            "success": False,
-            "error": {
-                "code": 404,
-                "message": "Resource not found",
-                "error_id": error_id,
-                "correlation_id": correlation_context.correlation_id
-            },
-            "timestamp": datetime.utcnow().isoformat() + 'Z'
-        }), 404
+    if is_json:
+        return _json_error(_ENV_404, 404, error_id)
     
     return render_template("errors/404.html", error_id=error_id), 404
 
@@ -150,9 +242,14 @@ def internal_error(error):
     try:
         db.session.rollback()
     except Exception as rollback_error:
-        logger.error(f"Failed to rollback database session: {rollback_error}")
+        # system_error keeps this off SystemLog; the database is what failed
+        logger.error(
+            f"Failed to rollback database session: {rollback_error}",
+            category='system_error'
+        )
     
-    error_id = str(uuid.uuid4())
+    debug = current_app.debug
+    error_id = _eid()
     error_details = {
         'error_id': error_id,
         'url': request.url,
@@ -160,7 +257,7 @@ def internal_error(error):
         'endpoint': request.endpoint,
         'user_agent': request.headers.get('User-Agent'),
         'error_type': type(error).__name__,
-        'traceback': traceback.format_exc() if current_app.debug else None
+        'traceback': traceback.format_exc() if _capture_traceback() else None
     }
     
     logger.critical(
@@ -170,56 +267,53 @@ def internal_error(error):
         details=error_details
     )
     
-    SystemLog.log_event(
-        level=LogLevel.ERROR,
-        category="system",
-        message=f"Internal server error [ID: {error_id}]: {str(error)}",
+    # The database may be what failed, so record the event off-DB
+    log_error_event(
+        logging.ERROR,
+        "system",
+        f"Internal server error [ID: {error_id}]: {str(error)}",
         ip_address=request.remote_addr,
         details=error_details,
     )
     
     if request.is_json:
-        response_data = {
-            "success": False,
-            "error": {
-                "code": 500,
-                "message": "Internal server error - the server encountered an unexpected condition",
-                "error_id": error_id,
-                "correlation_id": correlation_context.correlation_id
-            },
-            "timestamp": datetime.utcnow().isoformat() + 'Z'
-        }
-        
         # Include traceback in debug mode
-        if current_app.debug and error_details['traceback']:
-            response_data['error']['traceback'] = error_details['traceback']
+        if debug and error_details['traceback']:
+            return _json_response({
+                "success": False,
+                "error": {
+                    "code": 500,
+                    "message": "Internal server error - the server encountered an unexpected condition",
+                    "error_id": error_id,
+                    "correlation_id": correlation_context.correlation_id,
+                    "traceback": error_details['traceback']
+                },
+                "timestamp": datetime.utcnow().isoformat() + 'Z'
+            }, 500)
         
-        return jsonify(response_data), 500
+        return _json_error(_ENV_500, 500, error_id)
     
     return render_template(
         "errors/500.html", 
         error_id=error_id,
-        show_details=current_app.debug,
-        error_details=error_details if current_app.debug else None
+        show_details=debug,
+        error_details=error_details if debug else None
     ), 500
 
 
 @bp.app_errorhandler(429)
 def ratelimit_handler(error):
     """Handle rate limiting errors"""
-    SystemLog.log_event(
-        level=LogLevel.WARNING,
+    endpoint = request.endpoint
+    get_logger('error_handler').warning(
+        f"Rate limit exceeded for {endpoint}",
         category="security",
-        message=f"Rate limit exceeded for {request.endpoint}",
-        ip_address=request.remote_addr,
-        details={"endpoint": request.endpoint, "method": request.method},
+        details={"endpoint": endpoint, "method": request.method},
     )
 
     if request.is_json:
-        return (
-            jsonify(
-                {"error": "Rate limit exceeded", "retry_after": getattr(error, "retry_after", None)}
-            ),
+        return _json_response(
+            {"error": "Rate limit exceeded", "retry_after": getattr(error, "retry_after", None)},
             429,
         )
     return render_template("errors/429.html"), 429
@@ -230,7 +324,7 @@ def service_unavailable(error):
     """Handle 503 Service Unavailable errors"""
     logger = get_logger('error_handler')
     
-    error_id = str(uuid.uuid4())
+    error_id = _eid()
     error_details = {
         'error_id': error_id,
         'url': request.url,
@@ -245,26 +339,8 @@ def service_unavailable(error):
         details=error_details
     )
     
-    SystemLog.log_event(
-        level=LogLevel.ERROR,
-        category="system",
-        message="Service temporarily unavailable",
-        ip_address=request.remote_addr,
-        details=error_details,
-    )
-    
     if request.is_json:
-        return jsonify({
-            "success": False,
-            "error": {
-                "code": 503,
-                "message": "Service temporarily unavailable - please try again later",
-                "error_id": error_id,
-                "correlation_id": correlation_context.correlation_id,
-                "retry_after": 60  # Suggest retry after 60 seconds
-            },
-            "timestamp": datetime.utcnow().isoformat() + 'Z'
-        }), 503
+        return _json_error(_ENV_503, 503, error_id)
     
     return render_template("errors/503.html", error_id=error_id), 503
 
@@ -274,29 +350,13 @@ def handle_moxnas_error(error: MoxNASError):
     """Handle custom MoxNAS errors with detailed context"""
     logger = get_logger('error_handler')
     
-    error_id = str(uuid.uuid4())
+    error_id = _eid()
     
     # Determine HTTP status code based on error category
-    status_codes = {
-        'validation': 400,
-        'authentication': 401,
-        'authorization': 403,
-        'network': 503,
-        'database': 503,
-        'storage': 503,
-        'system': 500
-    }
-    status_code = status_codes.get(error.category.value, 500)
+    status_code = _STATUS_CODES.get(error.category.value, 500)
     
     # Log with appropriate level based on severity
-    log_levels = {
-        ErrorSeverity.LOW: logger.info,
-        ErrorSeverity.MEDIUM: logger.warning,
-        ErrorSeverity.HIGH: logger.error,
-        ErrorSeverity.CRITICAL: logger.critical
-    }
-    
-    log_func = log_levels.get(error.severity, logger.error)
+    log_func = getattr(logger, _LOG_METHODS.get(error.severity, 'error'))
     log_func(
         f"MoxNAS Error: {error.message}",
         category=error.category.value,
@@ -306,36 +366,15 @@ def handle_moxnas_error(error: MoxNASError):
         details=error.context.additional_data if error.context else {}
     )
     
-    SystemLog.log_event(
-        level=LogLevel.ERROR if error.severity in [ErrorSeverity.HIGH, ErrorSeverity.CRITICAL] else LogLevel.WARNING,
-        category=error.category.value,
-        message=f"[{error_id}] {error.message}",
-        ip_address=request.remote_addr,
-        details={
-            'error_id': error_id,
-            'severity': error.severity.value,
-            'recoverable': error.recoverable,
-            'context': error.context.additional_data if error.context else {}
-        }
-    )
-    
     if request.is_json:
         response_data = error.to_dict()
         response_data['error']['error_id'] = error_id
         response_data['error']['correlation_id'] = correlation_context.correlation_id
         
-        return jsonify(response_data), status_code
+        return _json_response(response_data, status_code)
     
     # For HTML responses, use appropriate error template
-    template_map = {
-        400: "errors/400.html",
-        401: "errors/401.html",
-        403: "errors/403.html",
-        500: "errors/500.html",
-        503: "errors/503.html"
-    }
-    
-    template = template_map.get(status_code, "errors/500.html")
+    template = _TEMPLATE_MAP.get(status_code, "errors/500.html")
     return render_template(
         template,
         error_id=error_id,
@@ -352,13 +391,13 @@ def handle_generic_exception(error: Exception):
     if isinstance(error, HTTPException):
         return error
     
-    error_id = str(uuid.uuid4())
+    error_id = _eid()
     error_details = {
         'error_id': error_id,
         'url': request.url,
         'method': request.method,
         'error_type': type(error).__name__,
-        'traceback': traceback.format_exc()
+        'traceback': traceback.format_exc() if _capture_traceback() else None
     }
     
     logger.critical(
@@ -368,10 +407,10 @@ def handle_generic_exception(error: Exception):
         details=error_details
     )
     
-    SystemLog.log_event(
-        level=LogLevel.CRITICAL,
-        category="system",
-        message=f"Unhandled exception [ID: {error_id}]: {type(error).__name__}",
+    log_error_event(
+        logging.CRITICAL,
+        "system",
+        f"Unhandled exception [ID: {error_id}]: {type(error).__name__}",
         ip_address=request.remote_addr,
         details=error_details,
     )
@@ -384,20 +423,12 @@ def handle_generic_exception(error: Exception):
         pass  # Don't let rollback failure mask the original error
     
     if request.is_json:
-        return jsonify({
-            "success": False,
-            "error": {
-                "code": 500,
-                "message": "An unexpected error occurred",
-                "error_id": error_id,
-                "correlation_id": correlation_context.correlation_id
-            },
-            "timestamp": datetime.utcnow().isoformat() + 'Z'
-        }), 500
+        return _json_error(_ENV_500_UNHANDLED, 500, error_id)
     
+    debug = current_app.debug
     return render_template(
         "errors/500.html",
         error_id=error_id,
-        show_details=current_app.debug,
-        error_details=error_details if current_app.debug else None
+        show_details=debug,
+        error_details=error_details if debug else None
     ), 500
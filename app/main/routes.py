@@ -2,10 +2,63 @@
 from flask import render_template, jsonify, request, current_app
 from flask_login import login_required, current_user
 from app.main import bp
-from app.models import StoragePool, StorageDevice, Share, BackupJob, SystemLog
+from app.models import (
+    StoragePool, StorageDevice, Share, BackupJob, SystemLog,
+    DeviceStatus, ShareStatus, BackupStatus,
+)
 from app import db
+from app.utils.aggregates import get_storage_aggregates, status_counts
+from sqlalchemy import func, select
 import psutil
+import hashlib
 import json
+import threading
+import time
+
+# psutil samples shared between requests: {key: (taken_at, value)}
+_psutil_cache = {}
+
+# systemd status of the NAS services, shared between page views
+_SVC_TTL = 3.0
+_svc_cache = {"ts": 0.0, "data": None}
+_svc_refresh_lock = threading.Lock()
+
+# cpu_percent(interval=None) measures since the previous call, so take a
+# first sample at import time to give the first dashboard a real value
+psutil.cpu_percent(interval=None)
+
+
+def _cached(key, ttl, fn):
+    """Return fn() reusing the previous result for ttl seconds"""
+    now = time.monotonic()
+    hit = _psutil_cache.get(key)
+    if hit and now - hit[0] < ttl:
+        return hit[1]
+    value = fn()
+    _psutil_cache[key] = (now, value)
+    return value
+
+
+def _cpu_percent():
+    """Non-blocking CPU usage, sampled at most once per second"""
+    return _cached("cpu", 1.0, lambda: psutil.cpu_percent(interval=None))
+
+
+def _non_loopback_interfaces(net_io):
+    """Names of non-loopback interfaces, recomputed every 30 seconds"""
+    return _cached(
+        "net_ifaces", 30.0, lambda: frozenset(n for n in net_io if not n.startswith("lo"))
+    )
+
+
+def _device_summary(counts):
+    """Device count and health buckets from a status Counter"""
+    return {
+        "device_count": sum(counts.values()),
+        "healthy_devices": counts[DeviceStatus.HEALTHY],
+        "warning_devices": counts[DeviceStatus.WARNING],
+        "failed_devices": counts[DeviceStatus.FAILED] + counts[DeviceStatus.SMART_FAIL],
+    }
 
 
 @bp.route("/")
@@ -15,36 +68,49 @@ def dashboard():
     """Main dashboard with system overview"""
     # System statistics
     system_stats = {
-        "cpu_percent": psutil.cpu_percent(interval=1),
-        "memory": psutil.virtual_memory(),
-        "disk_usage": psutil.disk_usage("/"),
-        "boot_time": psutil.boot_time(),
+        "cpu_percent": _cpu_percent(),
+        "memory": _cached("virtual_memory", 1.0, psutil.virtual_memory),
+        "disk_usage": _cached("disk_usage", 1.0, lambda: psutil.disk_usage("/")),
+        "boot_time": _cached("boot_time", 3600.0, psutil.boot_time),
         "load_avg": psutil.getloadavg() if hasattr(psutil, "getloadavg") else (0, 0, 0),
     }
 
-    # Storage overview
-    storage_pools = StoragePool.query.all()
+    # Storage overview (the template lists every pool, so the rows are
+    # needed anyway and the totals are summed from them)
+    storage_pools = StoragePool.query.options(
+        db.load_only(
+            StoragePool.id,
+            StoragePool.name,
+            StoragePool.total_size,
+            StoragePool.used_size,
+            StoragePool.status,
+        )
+    ).all()
     total_storage = sum(pool.total_size or 0 for pool in storage_pools)
     used_storage = sum(pool.used_size or 0 for pool in storage_pools)
 
     # Device health
-    devices = StorageDevice.query.all()
-    healthy_devices = len([d for d in devices if d.status.value == "healthy"])
-    warning_devices = len([d for d in devices if d.status.value == "warning"])
-    failed_devices = len([d for d in devices if d.status.value in ["failed", "smart_fail"]])
+    device_summary = _device_summary(get_storage_aggregates())
 
     # Shares status
-    shares = Share.query.all()
-    active_shares = len([s for s in shares if s.status.value == "active"])
-    inactive_shares = len([s for s in shares if s.status.value == "inactive"])
+    share_counts = status_counts(Share)
+    active_shares = share_counts.get(ShareStatus.ACTIVE, 0)
+    inactive_shares = share_counts.get(ShareStatus.INACTIVE, 0)
 
     # Backup status
-    backup_jobs = BackupJob.query.all()
-    running_backups = len([b for b in backup_jobs if b.status.value == "running"])
-    failed_backups = len([b for b in backup_jobs if b.status.value == "failed"])
+    backup_counts = status_counts(BackupJob)
+    running_backups = backup_counts.get(BackupStatus.RUNNING, 0)
+    failed_backups = backup_counts.get(BackupStatus.FAILED, 0)
 
     # Recent system logs (last 10)
-    recent_logs = SystemLog.query.order_by(SystemLog.timestamp.desc()).limit(10).all()
+    recent_logs = (
+        SystemLog.query.options(
+            db.load_only(SystemLog.id, SystemLog.category, SystemLog.message, SystemLog.level)
+        )
+        .order_by(SystemLog.timestamp.desc())
+        .limit(10)
+        .all()
+    )
 
     return render_template(
         "dashboard.html",
@@ -53,9 +119,9 @@ def dashboard():
         total_storage=total_storage,
         used_storage=used_storage,
         devices_summary={
-            "healthy": healthy_devices,
-            "warning": warning_devices,
-            "failed": failed_devices,
+            "healthy": device_summary["healthy_devices"],
+            "warning": device_summary["warning_devices"],
+            "failed": device_summary["failed_devices"],
         },
         shares_summary={"active": active_shares, "inactive": inactive_shares},
         backup_summary={"running": running_backups, "failed": failed_backups},
@@ -67,86 +133,135 @@ def dashboard():
 @login_required
 def services():
     """Services management page"""
+    return render_template("services/index.html", services_status=_services_status())
+
+
+def _refresh_services_status(app):
+    """Re-read every NAS service's systemd state into _svc_cache"""
     from app.services.manager import service_manager
 
-    # Get basic service status for template context
-    services_status = {}
     try:
-        services_status = service_manager.get_all_nas_services_status()
+        with app.app_context():
+            data = service_manager.get_all_nas_services_status()
+        _svc_cache.update(ts=time.monotonic(), data=data)
     except Exception as e:
-        current_app.logger.error(f"Failed to get services status: {str(e)}")
+        app.logger.error(f"Failed to get services status: {str(e)}")
+    finally:
+        _svc_refresh_lock.release()
 
-    return render_template("services/index.html", services_status=services_status)
 
+def _services_status():
+    """NAS service status, at most _SVC_TTL seconds old where possible
+
+    The first call waits for systemctl; after that a stale entry is
+    returned immediately while a background thread refreshes it.
+    """
+    if time.monotonic() - _svc_cache["ts"] <= _SVC_TTL:
+        return _svc_cache["data"]
+    if _svc_refresh_lock.acquire(blocking=False):
+        app = current_app._get_current_object()
+        if _svc_cache["data"] is None:
+            _refresh_services_status(app)
+        else:
+            threading.Thread(
+                target=_refresh_services_status, args=(app,), name="services-status", daemon=True
+            ).start()
+    return _svc_cache["data"] or {}
+
+
+def _collect_system_stats():
+    """Sample CPU, memory, disk and network counters into a dict"""
+    # Take every sample once up front; each psutil call re-reads /proc
+    vm = _cached("virtual_memory", 1.0, psutil.virtual_memory)
+    sm = psutil.swap_memory()
+    du = _cached("disk_usage", 1.0, lambda: psutil.disk_usage("/"))
+    dio = psutil.disk_io_counters()
+    freq = psutil.cpu_freq()
+    net_io = psutil.net_io_counters(pernic=True)
 
-@bp.route("/api/system/stats")
-@login_required
-def system_stats_api():
-    """Real-time system statistics API"""
     stats = {
-        "timestamp": psutil.time.time(),
+        "timestamp": time.time(),
         "cpu": {
-            "percent": psutil.cpu_percent(interval=0.1),
+            "percent": _cpu_percent(),
             "count": psutil.cpu_count(),
-            "freq": psutil.cpu_freq()._asdict() if psutil.cpu_freq() else None,
-        },
-        "memory": {
-            "total": psutil.virtual_memory().total,
-            "available": psutil.virtual_memory().available,
-            "percent": psutil.virtual_memory().percent,
-            "used": psutil.virtual_memory().used,
-            "free": psutil.virtual_memory().free,
-        },
-        "swap": {
-            "total": psutil.swap_memory().total,
-            "used": psutil.swap_memory().used,
-            "free": psutil.swap_memory().free,
-            "percent": psutil.swap_memory().percent,
+            "freq": freq._asdict() if freq else None,
         },
+        "memory": vm._asdict(),
+        "swap": sm._asdict(),
         "disk": {
-            "usage": {
-                "total": psutil.disk_usage("/").total,
-                "used": psutil.disk_usage("/").used,
-                "free": psutil.disk_usage("/").free,
-                "percent": (psutil.disk_usage("/").used / psutil.disk_usage("/").total) * 100,
-            },
-            "io": psutil.disk_io_counters()._asdict() if psutil.disk_io_counters() else None,
+            "usage": du._asdict(),
+            "io": dio._asdict() if dio else None,
+        },
+        "network": {
+            name: net_io[name]._asdict()
+            for name in _non_loopback_interfaces(net_io)
+            if name in net_io
         },
-        "network": {},
     }
 
-    # Network interfaces
-    net_io = psutil.net_io_counters(pernic=True)
-    for interface, io_stats in net_io.items():
-        if not interface.startswith("lo"):  # Skip loopback
-            stats["network"][interface] = {
-                "bytes_sent": io_stats.bytes_sent,
-                "bytes_recv": io_stats.bytes_recv,
-                "packets_sent": io_stats.packets_sent,
-                "packets_recv": io_stats.packets_recv,
-                "errin": io_stats.errin,
-                "errout": io_stats.errout,
-                "dropin": io_stats.dropin,
-                "dropout": io_stats.dropout,
-            }
-
     # Load average (Unix-like systems)
     if hasattr(psutil, "getloadavg"):
         stats["load_avg"] = psutil.getloadavg()
 
-    return jsonify(stats)
+    return stats
+
+
+@bp.route("/api/system/stats")
+@login_required
+def system_stats_api():
+    """Real-time system statistics API"""
+    return jsonify(_collect_system_stats())
+
+
+def _storage_etag():
+    """ETag that changes whenever a pool or device row is added, changed or removed"""
+    signature = db.session.execute(
+        select(
+            select(func.max(StoragePool.updated_at)).scalar_subquery(),
+            select(func.count(StoragePool.id)).scalar_subquery(),
+            select(func.max(StorageDevice.updated_at)).scalar_subquery(),
+            select(func.count(StorageDevice.id)).scalar_subquery(),
+        )
+    ).one()
+    return hashlib.blake2b(repr(tuple(signature)).encode(), digest_size=16).hexdigest()
+
+
+def _cacheable(response, etag):
+    """Mark response as revalidatable by the browser for a few seconds"""
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.max_age = 5
+    return response
 
 
 @bp.route("/api/storage/overview")
 @login_required
 def storage_overview_api():
     """Storage overview API"""
-    pools = StoragePool.query.all()
-    devices = StorageDevice.query.all()
+    etag = _storage_etag()
+    if request.if_none_match.contains(etag):
+        return _cacheable(current_app.response_class(status=304), etag)
+
+    pools = StoragePool.query.options(
+        db.load_only(
+            StoragePool.id,
+            StoragePool.name,
+            StoragePool.raid_level,
+            StoragePool.filesystem_type,
+            StoragePool.mount_point,
+            StoragePool.total_size,
+            StoragePool.used_size,
+            StoragePool.available_size,
+            StoragePool.status,
+            StoragePool.device_count,
+            StoragePool.healthy_count,
+            StoragePool.warning_count,
+            StoragePool.failed_count,
+        )
+    ).all()
 
     pool_data = []
     for pool in pools:
-        pool_devices = [d for d in devices if d.pool_id == pool.id]
         pool_data.append(
             {
                 "id": pool.id,
@@ -158,27 +273,25 @@ def storage_overview_api():
                 "used_size": pool.used_size,
                 "available_size": pool.available_size,
                 "status": pool.status.value,
-                "device_count": len(pool_devices),
-                "healthy_devices": len([d for d in pool_devices if d.status.value == "healthy"]),
-                "warning_devices": len([d for d in pool_devices if d.status.value == "warning"]),
-                "failed_devices": len(
-                    [d for d in pool_devices if d.status.value in ["failed", "smart_fail"]]
-                ),
+                "device_count": pool.device_count,
+                "healthy_devices": pool.healthy_count,
+                "warning_devices": pool.warning_count,
+                "failed_devices": pool.failed_count,
             }
         )
 
-    return jsonify(
+    summary = _device_summary(get_storage_aggregates(etag))
+    response = jsonify(
         {
             "pools": pool_data,
             "total_pools": len(pools),
-            "total_devices": len(devices),
-            "healthy_devices": len([d for d in devices if d.status.value == "healthy"]),
-            "warning_devices": len([d for d in devices if d.status.value == "warning"]),
-            "failed_devices": len(
-                [d for d in devices if d.status.value in ["failed", "smart_fail"]]
-            ),
+            "total_devices": summary["device_count"],
+            "healthy_devices": summary["healthy_devices"],
+            "warning_devices": summary["warning_devices"],
+            "failed_devices": summary["failed_devices"],
         }
     )
+    return _cacheable(response, etag)
 
 
 @bp.route("/about")
@@ -5,12 +5,68 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta, timezone
+import atexit
 import enum
-import json
+import logging
+import queue
 import re
+import threading
+import time
+from flask import current_app
+from sqlalchemy import case, event, func, insert, select, update
+from sqlalchemy.orm.attributes import NO_VALUE, set_committed_value
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 from app import db
 
 
+_logger = logging.getLogger(__name__)
+
+# SystemLog write-behind buffer; drained in batches by a daemon thread
+_LOG_QUEUE: "queue.Queue[tuple[Any, Dict[str, Any]]]" = queue.Queue(maxsize=10000)
+_LOG_BATCH_SIZE = 100
+_LOG_FLUSH_INTERVAL = 0.2  # seconds
+_log_writer: Optional[threading.Thread] = None
+_log_writer_lock = threading.Lock()
+_log_write_lock = threading.Lock()  # held while a batch is being written
+
+# Password policy: each pattern must match somewhere in a new password
+_PASSWORD_CHECKS = (
+    (re.compile(r"[A-Z]"), "uppercase letter"),
+    (re.compile(r"[a-z]"), "lowercase letter"),
+    (re.compile(r"[0-9]"), "number"),
+    (re.compile(r'[!@#$%^&*()_+\-=\[\]{};:",.<>/?]'), "special character"),
+)
+
+
+class utcnow(FunctionElement):
+    """Current UTC time evaluated by the database, for column defaults"""
+
+    type = db.DateTime()
+    inherit_cache = True
+
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utcnow, "postgresql")
+def _utcnow_postgresql(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utcnow, "sqlite")
+def _utcnow_sqlite(element, compiler, **kw):
+    # CURRENT_TIMESTAMP has whole-second precision on SQLite
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+# JSON document column; JSONB on PostgreSQL so it can be indexed and queried
+JSONColumn = db.JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+
 # Enums for better data integrity
 class UserRole(enum.Enum):
     ADMIN = "admin"
@@ -101,21 +157,21 @@ class User(UserMixin, db.Model):
     failed_login_attempts = db.Column(db.Integer, default=0)
     locked_until = db.Column(db.DateTime, index=True)
     last_login = db.Column(db.DateTime)
-    last_password_change = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    last_password_change = db.Column(db.DateTime, server_default=utcnow())
     force_password_change = db.Column(db.Boolean, default=False)
 
     # 2FA support
     totp_secret = db.Column(db.String(32))
     totp_enabled = db.Column(db.Boolean, default=False)
-    backup_codes = db.Column(db.Text)  # JSON stored backup codes
+    backup_codes = db.Column(JSONColumn)
 
     # Audit trail
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), index=True)
     created_by_id = db.Column(db.Integer, db.ForeignKey("users.id"))
     updated_at = db.Column(
         db.DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=utcnow(),
+        onupdate=utcnow(),
     )
     is_active = db.Column(db.Boolean, default=True, index=True)
 
@@ -130,16 +186,13 @@ class User(UserMixin, db.Model):
         """Hash and set password with security checks"""
         if len(password) < 8:
             raise ValueError("Password must be at least 8 characters long")
-        if not re.search(r"[A-Z]", password):
-            raise ValueError("Password must contain at least one uppercase letter")
-        if not re.search(r"[a-z]", password):
-            raise ValueError("Password must contain at least one lowercase letter")
-        if not re.search(r"[0-9]", password):
-            raise ValueError("Password must contain at least one number")
-        if not re.search(r'[!@#$%^&*()_+\-=\[\]{};:",.<>/?]', password):
-            raise ValueError("Password must contain at least one special character")
-
-        self.password_hash = generate_password_hash(password)
+        for pattern, requirement in _PASSWORD_CHECKS:
+            if not pattern.search(password):
+                raise ValueError(f"Password must contain at least one {requirement}")
+
+        self.password_hash = generate_password_hash(
+            password, method=current_app.config.get("PASSWORD_HASH_METHOD", "scrypt")
+        )
         self.last_password_change = datetime.now(timezone.utc)
 
     def check_password(self, password: str) -> bool:
@@ -150,8 +203,13 @@ class User(UserMixin, db.Model):
         # Skip lockout logic if security hardening is disabled (e.g., in tests)
         security_enabled: bool = current_app.config.get("SECURITY_HARDENING_ENABLED", True)
 
-        if security_enabled and self.is_locked():
-            return False
+        if security_enabled:
+            if self.is_locked():
+                return False
+            if self.locked_until is not None:
+                # Lock has expired; the caller's commit persists the reset
+                self.locked_until = None
+                self.failed_login_attempts = 0
 
         if check_password_hash(self.password_hash, password):
             self.failed_login_attempts = 0
@@ -159,25 +217,22 @@ class User(UserMixin, db.Model):
             return True
         else:
             if security_enabled:
-                self.failed_login_attempts += 1
-                if self.failed_login_attempts >= 5:
-                    self.locked_until = datetime.now(timezone.utc) + timedelta(minutes=30)
+                self.increment_failed_login_attempts()
             return False
 
     def is_locked(self) -> bool:
-        """Check if account is locked"""
-        if self.locked_until and datetime.now(timezone.utc) < self.locked_until:
-            return True
-        if self.locked_until and datetime.now(timezone.utc) >= self.locked_until:
-            # Account lock has expired, reset it
-            self.locked_until = None
-            self.failed_login_attempts = 0
-            # Try to commit the changes, but don't fail if it doesn't work
-            try:
-                db.session.commit()
-            except Exception:
-                db.session.rollback()
-        return False
+        """Check if account is locked
+
+        Read-only: expired locks are cleared by check_password on the next
+        login attempt, or in bulk by the clear_expired_lockouts task.
+        """
+        if not self.locked_until:
+            return False
+        # The column is naive; values read back from the database are UTC
+        locked_until = self.locked_until
+        if locked_until.tzinfo is None:
+            locked_until = locked_until.replace(tzinfo=timezone.utc)
+        return datetime.now(timezone.utc) < locked_until
 
     def unlock_account(self) -> None:
         """Unlock account (admin function)"""
@@ -185,10 +240,33 @@ class User(UserMixin, db.Model):
         self.failed_login_attempts = 0
 
     def increment_failed_login_attempts(self) -> None:
-        """Safely increment failed login attempts"""
-        self.failed_login_attempts += 1
-        if self.failed_login_attempts >= 5:
-            self.locked_until = datetime.now(timezone.utc) + timedelta(minutes=30)
+        """Count a failed login and lock the account at 5 attempts
+
+        Done as a single UPDATE ... SET n = n + 1 so concurrent attempts
+        cannot overwrite each other's count; the caller's commit persists it.
+        """
+        if self.id is None:
+            self.failed_login_attempts = (self.failed_login_attempts or 0) + 1
+            if self.failed_login_attempts >= 5:
+                self.locked_until = datetime.now(timezone.utc) + timedelta(minutes=30)
+            return
+
+        attempts = func.coalesce(User.failed_login_attempts, 0) + 1
+        row = db.session.execute(
+            update(User)
+            .where(User.id == self.id)
+            .values(
+                failed_login_attempts=attempts,
+                locked_until=case(
+                    (attempts >= 5, datetime.now(timezone.utc) + timedelta(minutes=30)),
+                    else_=User.locked_until,
+                ),
+            )
+            .returning(User.failed_login_attempts, User.locked_until)
+            .execution_options(synchronize_session=False)
+        ).one()
+        set_committed_value(self, "failed_login_attempts", row.failed_login_attempts)
+        set_committed_value(self, "locked_until", row.locked_until)
 
     def update_last_login(self) -> None:
         """Safely update last login timestamp"""
@@ -201,7 +279,7 @@ class User(UserMixin, db.Model):
             db.session.rollback()
 
     def is_admin(self) -> bool:
-        return self.role == UserRole.ADMIN
+        return self.role is UserRole.ADMIN
 
     def __repr__(self) -> str:
         return f"<User {self.username}>"
@@ -211,6 +289,10 @@ class StorageDevice(db.Model):
     """Physical storage device model"""
 
     __tablename__ = "storage_devices"
+    __table_args__ = (
+        # Covers the per-pool status GROUP BY behind the dashboard counts
+        db.Index("ix_storage_devices_pool_status", "pool_id", "status"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     device_path = db.Column(db.String(255), unique=True, nullable=False, index=True)
@@ -224,7 +306,7 @@ class StorageDevice(db.Model):
     status = db.Column(
         db.Enum(DeviceStatus), nullable=False, default=DeviceStatus.HEALTHY, index=True
     )
-    smart_data = db.Column(db.Text)  # JSON stored SMART data
+    smart_data = db.Column(JSONColumn)
     temperature = db.Column(db.Integer)  # Celsius
     power_on_hours = db.Column(db.Integer)
 
@@ -232,17 +314,16 @@ class StorageDevice(db.Model):
     pool_id = db.Column(db.Integer, db.ForeignKey("storage_pools.id"), index=True)
 
     # Audit trail
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), index=True)
     updated_at = db.Column(
         db.DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=utcnow(),
+        onupdate=utcnow(),
     )
 
     def update_smart_data(self, smart_info: Dict[str, Any]) -> None:
         """Update SMART data and status"""
-        self.smart_data = json.dumps(smart_info)
-        self.updated_at = datetime.now(timezone.utc)
+        self.smart_data = smart_info
 
         # Update status based on SMART data
         if smart_info.get("overall_health") == "FAILED":
@@ -254,9 +335,7 @@ class StorageDevice(db.Model):
 
     def get_smart_data(self) -> Dict[str, Any]:
         """Get parsed SMART data"""
-        if self.smart_data:
-            return json.loads(self.smart_data)
-        return {}
+        return self.smart_data or {}
 
     @property
     def serial_number(self) -> Optional[str]:
@@ -290,6 +369,14 @@ class StoragePool(db.Model):
 
     # Status and health
     status = db.Column(db.Enum(PoolStatus), nullable=False, default=PoolStatus.HEALTHY, index=True)
+
+    # Member device counts, kept up to date by the StorageDevice listeners
+    # below so readers do not have to aggregate storage_devices
+    device_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    healthy_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    warning_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    failed_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     last_scrub = db.Column(db.DateTime, index=True)
     scrub_progress = db.Column(db.Integer, default=0)  # Percentage
 
@@ -298,12 +385,12 @@ class StoragePool(db.Model):
     scrub_schedule = db.Column(db.String(128))  # Cron expression
 
     # Audit trail
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), index=True)
     created_by_id = db.Column(db.Integer, db.ForeignKey("users.id"))
     updated_at = db.Column(
         db.DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=utcnow(),
+        onupdate=utcnow(),
     )
 
     # Relationships
@@ -335,10 +422,147 @@ class StoragePool(db.Model):
         self.status = PoolStatus.SCRUBBING
         self.scrub_progress = 0
 
+    @staticmethod
+    def recount_devices(pool_ids: Optional[List[int]] = None) -> None:
+        """Recompute device counters from storage_devices
+
+        Call after bulk DELETE/UPDATE statements on storage_devices, which
+        bypass the mapper events that keep the counters current.
+        """
+        db.session.execute(_pool_counter_recount_stmt(pool_ids))
+
     def __repr__(self) -> str:
         return f"<StoragePool {self.name}>"
 
 
+def _pool_counter_columns(status: Optional[DeviceStatus]) -> List[str]:
+    """StoragePool counter columns a device with this status counts towards"""
+    columns = ["device_count"]
+    if status == DeviceStatus.HEALTHY:
+        columns.append("healthy_count")
+    elif status == DeviceStatus.WARNING:
+        columns.append("warning_count")
+    elif status in (DeviceStatus.FAILED, DeviceStatus.SMART_FAIL):
+        columns.append("failed_count")
+    return columns
+
+
+def _adjust_pool_counters(
+    connection: Any, pool_id: Optional[int], status: Optional[DeviceStatus], delta: int
+) -> None:
+    """Add delta to the counters of pool_id for a device with status"""
+    if pool_id is None:
+        return
+    table = StoragePool.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id == pool_id)
+        .values({name: table.c[name] + delta for name in _pool_counter_columns(status)})
+    )
+
+
+def _pool_counter_recount_stmt(pool_ids: Optional[List[int]] = None):
+    """UPDATE recomputing the device counters of pool_ids (all pools if None)
+
+    Used where the incremental mapper events cannot see the change: bulk
+    DELETE/UPDATE statements on storage_devices, or a flushed device whose
+    pool or status was never loaded.
+    """
+    pools = StoragePool.__table__
+    devices = StorageDevice.__table__
+
+    def count(*criteria):
+        return (
+            select(func.count())
+            .select_from(devices)
+            .where(devices.c.pool_id == pools.c.id, *criteria)
+            .scalar_subquery()
+        )
+
+    stmt = pools.update().values(
+        device_count=count(),
+        healthy_count=count(devices.c.status == DeviceStatus.HEALTHY),
+        warning_count=count(devices.c.status == DeviceStatus.WARNING),
+        failed_count=count(devices.c.status.in_([DeviceStatus.FAILED, DeviceStatus.SMART_FAIL])),
+    )
+    if pool_ids is not None:
+        stmt = stmt.where(pools.c.id.in_(pool_ids))
+    return stmt
+
+
+def _recount_pools(connection: Any, *pool_ids: Any) -> None:
+    """Recount the given pools, or every pool if any of them is unknown"""
+    known = [pool_id for pool_id in pool_ids if pool_id is not None]
+    if any(pool_id is NO_VALUE for pool_id in known):
+        connection.execute(_pool_counter_recount_stmt())
+    elif known:
+        connection.execute(_pool_counter_recount_stmt(known))
+
+
+def _previous_value(target: StorageDevice, key: str) -> Any:
+    """Value of key before the pending flush, or NO_VALUE if it was never loaded
+
+    Reads only what the session already holds: after_delete runs once the
+    row is gone, so a lazy load there would fail.
+    """
+    history = db.inspect(target).attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.added:
+        # active_history loads the old value on set; an empty deleted list
+        # means it was None
+        return None
+    if history.unchanged:
+        return history.unchanged[0]
+    return NO_VALUE
+
+
+def _current_value(target: StorageDevice, key: str) -> Any:
+    """Value of key as flushed, or NO_VALUE if it is not loaded"""
+    return db.inspect(target).attrs[key].loaded_value
+
+
+@event.listens_for(StorageDevice.status, "set", active_history=True)
+@event.listens_for(StorageDevice.pool_id, "set", active_history=True)
+def _track_device_placement(target, value, oldvalue, initiator):
+    """No-op; registered so the old value is loaded and kept in history"""
+
+
+@event.listens_for(StorageDevice, "after_insert")
+def _device_inserted(mapper, connection, target):
+    pool_id, status = _current_value(target, "pool_id"), _current_value(target, "status")
+    if NO_VALUE in (pool_id, status):
+        _recount_pools(connection, pool_id)
+    else:
+        _adjust_pool_counters(connection, pool_id, status, 1)
+
+
+@event.listens_for(StorageDevice, "after_update")
+def _device_updated(mapper, connection, target):
+    state = db.inspect(target)
+    if not (
+        state.attrs["pool_id"].history.has_changes()
+        or state.attrs["status"].history.has_changes()
+    ):
+        return
+    old = (_previous_value(target, "pool_id"), _previous_value(target, "status"))
+    new = (_current_value(target, "pool_id"), _current_value(target, "status"))
+    if NO_VALUE in old or NO_VALUE in new:
+        _recount_pools(connection, old[0], new[0])
+    elif old != new:
+        _adjust_pool_counters(connection, old[0], old[1], -1)
+        _adjust_pool_counters(connection, new[0], new[1], 1)
+
+
+@event.listens_for(StorageDevice, "after_delete")
+def _device_deleted(mapper, connection, target):
+    pool_id, status = _previous_value(target, "pool_id"), _previous_value(target, "status")
+    if NO_VALUE in (pool_id, status):
+        _recount_pools(connection, pool_id)
+    else:
+        _adjust_pool_counters(connection, pool_id, status, -1)
+
+
 class Dataset(db.Model):
     """Dataset (directory/filesystem) model"""
 
@@ -359,12 +583,12 @@ class Dataset(db.Model):
     permissions = db.Column(db.String(10), default="755")
 
     # Audit trail
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), index=True)
     created_by_id = db.Column(db.Integer, db.ForeignKey("users.id"))
     updated_at = db.Column(
         db.DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=utcnow(),
+        onupdate=utcnow(),
     )
 
     # Relationships
@@ -392,7 +616,7 @@ class Share(db.Model):
     read_only = db.Column(db.Boolean, default=False)
 
     # Network settings
-    allowed_hosts = db.Column(db.Text)  # JSON list of allowed IP addresses
+    allowed_hosts = db.Column(JSONColumn)  # List of allowed IP addresses
 
     # Status
     status = db.Column(
@@ -405,12 +629,12 @@ class Share(db.Model):
     last_access = db.Column(db.DateTime, index=True)
 
     # Audit trail
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), index=True)
     created_by_id = db.Column(db.Integer, db.ForeignKey("users.id"))
     updated_at = db.Column(
         db.DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=utcnow(),
+        onupdate=utcnow(),
     )
 
     # Relationships
@@ -418,13 +642,11 @@ class Share(db.Model):
 
     def get_allowed_hosts(self) -> List[str]:
         """Get list of allowed hosts"""
-        if self.allowed_hosts:
-            return json.loads(self.allowed_hosts)
-        return []
+        return self.allowed_hosts or []
 
     def set_allowed_hosts(self, hosts: List[str]) -> None:
         """Set allowed hosts list"""
-        self.allowed_hosts = json.dumps(hosts)
+        self.allowed_hosts = hosts
 
     def __repr__(self) -> str:
         return f"<Share {self.name}>"
@@ -434,6 +656,15 @@ class BackupJob(db.Model):
     """Backup job model"""
 
     __tablename__ = "backup_jobs"
+    __table_args__ = (
+        # The scheduler only ever looks at enabled jobs
+        db.Index(
+            "ix_backup_jobs_active_next_run",
+            "next_run",
+            postgresql_where=db.text("is_active"),
+            sqlite_where=db.text("is_active"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(128), unique=True, nullable=False, index=True)
@@ -469,12 +700,12 @@ class BackupJob(db.Model):
     max_retries = db.Column(db.Integer, default=3)
 
     # Audit trail
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), index=True)
     created_by_id = db.Column(db.Integer, db.ForeignKey("users.id"))
     updated_at = db.Column(
         db.DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=utcnow(),
+        onupdate=utcnow(),
     )
     is_active = db.Column(db.Boolean, default=True, index=True)
 
@@ -486,9 +717,13 @@ class SystemLog(db.Model):
     """System audit and event log"""
 
     __tablename__ = "system_logs"
+    __table_args__ = (
+        # Logs page filters on level and category, newest first
+        db.Index("ix_system_logs_level_category_timestamp", "level", "category", "timestamp"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
-    timestamp = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    timestamp = db.Column(db.DateTime, server_default=utcnow(), index=True)
     level = db.Column(db.Enum(LogLevel), nullable=False, index=True)
     category = db.Column(
         db.String(64), nullable=False, index=True
@@ -501,7 +736,7 @@ class SystemLog(db.Model):
     user_agent = db.Column(db.Text)
 
     # Additional context
-    details = db.Column(db.Text)  # JSON stored additional details
+    details = db.Column(JSONColumn)
 
     # Relationships
     user = db.relationship("User", backref="log_entries")
@@ -515,35 +750,188 @@ class SystemLog(db.Model):
         ip_address: Optional[str] = None, 
         details: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Create a log entry"""
-        log_entry = SystemLog(
-            level=level,
-            category=category,
-            message=message,
-            user_id=user_id,
-            ip_address=ip_address,
-            details=json.dumps(details) if details else None,
-        )
-        db.session.add(log_entry)
+        """Create a log entry
+
+        Entries are queued and written in batches by a background thread so
+        callers never wait on a commit. If the queue is full, or async logging
+        is disabled (SYSTEM_LOG_ASYNC = False), the entry is written inline.
+        """
+        row = {
+            "timestamp": datetime.now(timezone.utc),
+            "level": level,
+            "category": category,
+            "message": message,
+            "user_id": user_id,
+            "ip_address": ip_address,
+            "details": details or None,
+        }
+
+        if current_app.config.get("SYSTEM_LOG_ASYNC", True):
+            app = current_app._get_current_object()
+            try:
+                _LOG_QUEUE.put_nowait((app, row))
+                _ensure_log_writer()
+                return
+            except queue.Full:
+                pass  # Fall through to a direct write so nothing is lost
+
+        db.session.add(SystemLog(**row))
         try:
             db.session.commit()
         except Exception:
             db.session.rollback()
 
+    @staticmethod
+    def bulk_log(events: List[Dict[str, Any]]) -> None:
+        """Write many log entries with a single executemany INSERT and commit
+
+        Each entry is a dict of log_event's keyword arguments, optionally
+        with a timestamp. Unlike log_event, errors are raised to the caller
+        after the session is rolled back.
+        """
+        if not events:
+            return
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "timestamp": entry.get("timestamp") or now,
+                "level": entry["level"],
+                "category": entry["category"],
+                "message": entry["message"],
+                "user_id": entry.get("user_id"),
+                "ip_address": entry.get("ip_address"),
+                "details": entry.get("details") or None,
+            }
+            for entry in events
+        ]
+        try:
+            db.session.execute(insert(SystemLog), rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
     def get_details(self) -> Dict[str, Any]:
         """Get parsed details"""
-        if self.details:
-            return json.loads(self.details)
-        return {}
+        return self.details or {}
 
     def __repr__(self) -> str:
         return f"<SystemLog {self.level.value}: {self.message[:50]}>"
 
 
+def _ensure_log_writer() -> None:
+    """Start the SystemLog writer thread if it is not running"""
+    global _log_writer
+    if _log_writer is not None and _log_writer.is_alive():
+        return
+    with _log_writer_lock:
+        if _log_writer is None or not _log_writer.is_alive():
+            _log_writer = threading.Thread(
+                target=_drain_log_queue, name="systemlog-writer", daemon=True
+            )
+            _log_writer.start()
+
+
+def _drain_log_queue() -> None:
+    """Write queued SystemLog entries every _LOG_BATCH_SIZE rows or _LOG_FLUSH_INTERVAL"""
+    while True:
+        batch = [_LOG_QUEUE.get()]
+        deadline = time.monotonic() + _LOG_FLUSH_INTERVAL
+        while len(batch) < _LOG_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_LOG_QUEUE.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        _write_log_batch(batch)
+
+
+def _write_log_batch(batch: List[tuple[Any, Dict[str, Any]]]) -> None:
+    """Insert queued rows with one executemany INSERT per app
+
+    If the batch INSERT fails, the rows are retried one at a time so a
+    single bad row does not take the rest of the batch with it.
+    """
+    by_app: Dict[Any, List[Dict[str, Any]]] = {}
+    for app, row in batch:
+        by_app.setdefault(app, []).append(row)
+
+    with _log_write_lock:
+        for app, rows in by_app.items():
+            with app.app_context():
+                try:
+                    db.session.execute(insert(SystemLog), rows)
+                    db.session.commit()
+                except Exception:
+                    db.session.rollback()
+                    _logger.warning(
+                        "SystemLog batch of %d rows failed, retrying row by row",
+                        len(rows),
+                        exc_info=True,
+                    )
+                    _write_log_rows(rows)
+                finally:
+                    db.session.remove()
+
+
+def _write_log_rows(rows: List[Dict[str, Any]]) -> None:
+    """Insert rows one per transaction; rows that still fail go to the stdlib log
+
+    Failures are reported through the module logger, never SystemLog, so a
+    database outage cannot feed back into the queue it is draining.
+    """
+    for row in rows:
+        try:
+            db.session.execute(insert(SystemLog), [row])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            _logger.error(
+                "Dropped SystemLog entry [%s] %s: %s",
+                getattr(row.get("level"), "value", row.get("level")),
+                row.get("category"),
+                row.get("message"),
+                exc_info=True,
+            )
+
+
+def flush_logs() -> None:
+    """Write every queued SystemLog entry now
+
+    Registered with atexit so a clean shutdown does not drop the last
+    partial batch; also waits for a batch the writer thread has in flight.
+    """
+    batch = []
+    while True:
+        try:
+            batch.append(_LOG_QUEUE.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        _write_log_batch(batch)
+    elif _log_write_lock.acquire(timeout=5):
+        _log_write_lock.release()
+
+
+atexit.register(flush_logs)
+
+
 class Alert(db.Model):
     """System alert model"""
 
     __tablename__ = "alerts"
+    __table_args__ = (
+        # Alert lists show the newest active alerts first
+        db.Index(
+            "ix_alerts_active_created_at",
+            "created_at",
+            postgresql_where=db.text("is_active"),
+            sqlite_where=db.text("is_active"),
+        ),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
@@ -562,21 +950,47 @@ class Alert(db.Model):
     resolved_at = db.Column(db.DateTime, index=True)
 
     # Audit trail
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+    created_at = db.Column(db.DateTime, server_default=utcnow(), index=True)
     updated_at = db.Column(
         db.DateTime,
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=utcnow(),
+        onupdate=utcnow(),
     )
 
     # Relationships
     acknowledged_by = db.relationship("User", backref="acknowledged_alerts")
 
+    @classmethod
+    def acknowledge_by_id(cls, alert_id: int, user_id: int) -> Optional[datetime]:
+        """Acknowledge an alert with a single UPDATE, without loading the row
+
+        Returns the acknowledgement time, or None if no alert has that id.
+        The caller's commit persists it.
+        """
+        return db.session.execute(
+            update(cls)
+            .where(cls.id == alert_id)
+            .values(
+                acknowledged_at=datetime.now(timezone.utc),
+                acknowledged_by_id=user_id,
+                is_active=False,
+            )
+            .returning(cls.acknowledged_at)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+
     def acknowledge(self, user_id: int) -> None:
         """Acknowledge the alert"""
-        self.acknowledged_at = datetime.now(timezone.utc)
-        self.acknowledged_by_id = user_id
-        self.is_active = False
+        if self.id is None:
+            self.acknowledged_at = datetime.now(timezone.utc)
+            self.acknowledged_by_id = user_id
+            self.is_active = False
+            return
+
+        acknowledged_at = Alert.acknowledge_by_id(self.id, user_id)
+        set_committed_value(self, "acknowledged_at", acknowledged_at)
+        set_committed_value(self, "acknowledged_by_id", user_id)
+        set_committed_value(self, "is_active", False)
 
     def __repr__(self) -> str:
         return f"<Alert {self.title}>"
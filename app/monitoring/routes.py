@@ -1,13 +1,39 @@
 """Monitoring and metrics routes"""
-from flask import render_template, request, jsonify
+from flask import abort, render_template, request, jsonify
 from flask_login import login_required, current_user
 from app.monitoring import bp
-from app.models import SystemLog, Alert, StorageDevice, StoragePool, Share
+from app.models import (
+    SystemLog, Alert, StorageDevice, StoragePool, Share,
+    DeviceStatus, PoolStatus, ShareStatus,
+)
 from app import db
+from app.utils.aggregates import status_counts
+from sqlalchemy import func, lambda_stmt, select, tuple_
+from cachetools.func import ttl_cache
+from collections import Counter
+import heapq
 import psutil
+import threading
+import time
 import json
 import os
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+
+# Host identity does not change while the process runs
+_UNAME = os.uname()
+
+# Process table sampled off the request path; the sampler thread starts on
+# first use and exits once nobody has read a sample for _PROC_SAMPLER_IDLE
+_PROC_SAMPLE_INTERVAL = 2.0
+_PROC_SAMPLER_IDLE = 60.0
+_proc_lock = threading.Lock()
+_proc_state = {"sample": None, "last_read": 0.0, "thread": None}
+
+# cpu_percent(interval=None) measures since the previous call; prime it so
+# the first metrics request gets a real value without blocking
+psutil.cpu_percent(interval=None)
+
+LOGS_PER_PAGE = 50
 
 
 @bp.route("/")
@@ -18,13 +44,21 @@ def index():
     system_info = get_system_info()
 
     # Recent alerts
-    recent_alerts = (
-        Alert.query.filter_by(is_active=True).order_by(Alert.created_at.desc()).limit(10).all()
-    )
-
-    # Storage health
-    devices = StorageDevice.query.all()
-    pools = StoragePool.query.all()
+    recent_alerts = db.session.scalars(_recent_alerts_stmt(10)).all()
+
+    # Storage health (only the columns the template renders)
+    devices = StorageDevice.query.options(
+        db.load_only(
+            StorageDevice.id,
+            StorageDevice.device_name,
+            StorageDevice.device_model,
+            StorageDevice.status,
+            StorageDevice.temperature,
+        )
+    ).all()
+    pools = StoragePool.query.options(
+        db.load_only(StoragePool.id, StoragePool.name, StoragePool.status)
+    ).all()
 
     return render_template(
         "monitoring/index.html",
@@ -39,11 +73,13 @@ def index():
 @login_required
 def logs():
     """System logs page"""
-    page = request.args.get("page", 1, type=int)
     level_filter = request.args.get("level")
     category_filter = request.args.get("category")
+    # Keyset cursor: the (timestamp, id) of the last row on the previous page
+    after_ts = request.args.get("after_ts", type=datetime.fromisoformat)
+    after_id = request.args.get("after_id", type=int)
 
-    query = SystemLog.query
+    query = SystemLog.query.options(db.joinedload(SystemLog.user))
 
     if level_filter:
         query = query.filter_by(level=level_filter)
@@ -51,13 +87,25 @@ def logs():
     if category_filter:
         query = query.filter_by(category=category_filter)
 
-    logs = query.order_by(SystemLog.timestamp.desc()).paginate(
-        page=page, per_page=50, error_out=False
+    if after_ts is not None and after_id is not None:
+        query = query.filter(tuple_(SystemLog.timestamp, SystemLog.id) < (after_ts, after_id))
+
+    # One extra row tells us whether an older page exists, without a COUNT(*)
+    logs = (
+        query.order_by(SystemLog.timestamp.desc(), SystemLog.id.desc())
+        .limit(LOGS_PER_PAGE + 1)
+        .all()
+    )
+    has_more = len(logs) > LOGS_PER_PAGE
+    logs = logs[:LOGS_PER_PAGE]
+    next_cursor = (
+        {"after_ts": logs[-1].timestamp.isoformat(), "after_id": logs[-1].id}
+        if has_more
+        else None
     )
 
     # Get unique categories and levels for filters
-    categories = db.session.query(SystemLog.category).distinct().all()
-    categories = [c[0] for c in categories]
+    categories = _log_categories()
 
     from app.models import LogLevel
 
@@ -66,6 +114,8 @@ def logs():
     return render_template(
         "monitoring/logs.html",
         logs=logs,
+        next_cursor=next_cursor,
+        is_first_page=after_ts is None,
         categories=categories,
         levels=levels,
         current_level=level_filter,
@@ -80,7 +130,7 @@ def alerts():
     page = request.args.get("page", 1, type=int)
     show_all = request.args.get("show_all", False, type=bool)
 
-    query = Alert.query
+    query = Alert.query.options(db.joinedload(Alert.acknowledged_by))
     if not show_all:
         query = query.filter_by(is_active=True)
 
@@ -98,18 +148,20 @@ def acknowledge_alert(alert_id):
     if not current_user.is_admin():
         return jsonify({"success": False, "error": "Administrator privileges required"}), 403
 
-    alert = Alert.query.get_or_404(alert_id)
-
     try:
-        alert.acknowledge(current_user.id)
-        db.session.commit()
-
-        return jsonify({"success": True, "message": f"Alert acknowledged successfully"})
+        acknowledged_at = Alert.acknowledge_by_id(alert_id, current_user.id)
+        if acknowledged_at is not None:
+            db.session.commit()
 
     except Exception as e:
         db.session.rollback()
         return jsonify({"success": False, "error": str(e)}), 500
 
+    if acknowledged_at is None:
+        abort(404)
+
+    return jsonify({"success": True, "message": f"Alert acknowledged successfully"})
+
 
 @bp.route("/performance")
 @login_required
@@ -126,10 +178,11 @@ def performance():
 def api_system_metrics():
     """Real-time system metrics API"""
     try:
+        statuses = _process_snapshot()["statuses"]
         metrics = {
             "timestamp": datetime.utcnow().isoformat(),
             "cpu": {
-                "percent": psutil.cpu_percent(interval=0.1),
+                "percent": psutil.cpu_percent(interval=None),
                 "count": psutil.cpu_count(),
                 "load_avg": list(psutil.getloadavg())
                 if hasattr(psutil, "getloadavg")
@@ -151,13 +204,9 @@ def api_system_metrics():
             "disk": get_disk_metrics(),
             "network": get_network_metrics(),
             "processes": {
-                "total": len(psutil.pids()),
-                "running": len(
-                    [p for p in psutil.process_iter(["status"]) if p.info["status"] == "running"]
-                ),
-                "sleeping": len(
-                    [p for p in psutil.process_iter(["status"]) if p.info["status"] == "sleeping"]
-                ),
+                "total": sum(statuses.values()),
+                "running": statuses[psutil.STATUS_RUNNING],
+                "sleeping": statuses[psutil.STATUS_SLEEPING],
             },
         }
 
@@ -170,29 +219,67 @@ def api_system_metrics():
 @bp.route("/api/storage/health")
 @login_required
 def api_storage_health():
-    """Storage health metrics API"""
+    """Storage health metrics API
+
+    Pass summary_only=1 to skip the per-device and per-pool listings.
+    """
     try:
-        devices = StorageDevice.query.all()
-        pools = StoragePool.query.all()
+        summary_only = _flag_arg("summary_only")
+
+        device_counts = status_counts(StorageDevice)
+        pool_counts = status_counts(StoragePool)
+        total_devices = sum(device_counts.values())
+        total_pools = sum(pool_counts.values())
+        healthy_devices = device_counts[DeviceStatus.HEALTHY]
+        warning_devices = device_counts[DeviceStatus.WARNING]
+        healthy_pools = pool_counts[PoolStatus.HEALTHY]
+        degraded_pools = pool_counts[PoolStatus.DEGRADED]
 
         health_data = {
             "devices": [],
             "pools": [],
             "summary": {
-                "total_devices": len(devices),
-                "healthy_devices": 0,
-                "warning_devices": 0,
-                "failed_devices": 0,
-                "total_pools": len(pools),
-                "healthy_pools": 0,
-                "degraded_pools": 0,
-                "failed_pools": 0,
+                "total_devices": total_devices,
+                "healthy_devices": healthy_devices,
+                "warning_devices": warning_devices,
+                "failed_devices": total_devices - healthy_devices - warning_devices,
+                "total_pools": total_pools,
+                "healthy_pools": healthy_pools,
+                "degraded_pools": degraded_pools,
+                "failed_pools": total_pools - healthy_pools - degraded_pools,
             },
         }
 
-        # Process devices
-        for device in devices:
-            device_data = {
+        if summary_only:
+            return jsonify(health_data)
+
+        # Pull only the SMART verdict out of smart_data rather than the whole document
+        devices = db.session.execute(
+            select(
+                StorageDevice.id,
+                StorageDevice.device_path,
+                StorageDevice.device_name,
+                StorageDevice.device_model,
+                StorageDevice.device_size,
+                StorageDevice.status,
+                StorageDevice.temperature,
+                StorageDevice.smart_data["overall_health"].as_string().label("smart_status"),
+            )
+        ).all()
+        pools = db.session.execute(
+            select(
+                StoragePool.id,
+                StoragePool.name,
+                StoragePool.status,
+                StoragePool.raid_level,
+                StoragePool.total_size,
+                StoragePool.used_size,
+                StoragePool.device_count,
+            )
+        ).all()
+
+        health_data["devices"] = [
+            {
                 "id": device.id,
                 "path": device.device_path,
                 "name": device.device_name,
@@ -200,38 +287,22 @@ def api_storage_health():
                 "size": device.device_size,
                 "status": device.status.value,
                 "temperature": device.temperature,
-                "smart_status": device.get_smart_data().get("overall_health", "unknown"),
+                "smart_status": device.smart_status or "unknown",
             }
-            health_data["devices"].append(device_data)
-
-            # Update summary
-            if device.status.value == "healthy":
-                health_data["summary"]["healthy_devices"] += 1
-            elif device.status.value == "warning":
-                health_data["summary"]["warning_devices"] += 1
-            else:
-                health_data["summary"]["failed_devices"] += 1
-
-        # Process pools
-        for pool in pools:
-            pool_data = {
+            for device in devices
+        ]
+        health_data["pools"] = [
+            {
                 "id": pool.id,
                 "name": pool.name,
                 "status": pool.status.value,
                 "raid_level": pool.raid_level,
                 "total_size": pool.total_size,
                 "used_size": pool.used_size,
-                "device_count": pool.devices.count(),
+                "device_count": pool.device_count,
             }
-            health_data["pools"].append(pool_data)
-
-            # Update summary
-            if pool.status.value == "healthy":
-                health_data["summary"]["healthy_pools"] += 1
-            elif pool.status.value == "degraded":
-                health_data["summary"]["degraded_pools"] += 1
-            else:
-                health_data["summary"]["failed_pools"] += 1
+            for pool in pools
+        ]
 
         return jsonify(health_data)
 
@@ -239,12 +310,44 @@ def api_storage_health():
         return jsonify({"error": str(e)}), 500
 
 
+def _recent_alerts_stmt(limit):
+    """Newest active alerts, as a lambda statement
+
+    The lambda's code location is the cache key, so the statement is
+    built and compiled once and later calls only bind the new limit.
+    """
+    return lambda_stmt(
+        lambda: select(Alert)
+        .filter_by(is_active=True)
+        .order_by(Alert.created_at.desc())
+        .limit(limit)
+    )
+
+
+@ttl_cache(maxsize=1, ttl=60)
+def _log_categories():
+    """Distinct SystemLog categories for the logs page filter
+
+    The set only grows when code starts logging under a new category, so a
+    minute-old copy spares every page view a scan of the category index.
+    """
+    return tuple(db.session.scalars(select(SystemLog.category).distinct()))
+
+
+def _flag_arg(name):
+    """True when query parameter name is set to 1, true or yes"""
+    return request.args.get(name, "").lower() in ("1", "true", "yes")
+
+
 @bp.route("/api/network/activity")
 @login_required
 def api_network_activity():
-    """Network activity metrics API"""
+    """Network activity metrics API
+
+    Pass summary_only=1 to skip the per-share listing.
+    """
     try:
-        shares = Share.query.all()
+        summary_only = _flag_arg("summary_only")
 
         activity_data = {
             "shares": [],
@@ -255,8 +358,41 @@ def api_network_activity():
             },
         }
 
-        for share in shares:
-            share_data = {
+        # Protocol summary: one row per (protocol, status)
+        summary_rows = db.session.execute(
+            select(
+                Share.protocol,
+                Share.status,
+                func.count(Share.id),
+                func.coalesce(func.sum(Share.connections_count), 0),
+            ).group_by(Share.protocol, Share.status)
+        ).all()
+        for protocol, status, share_count, connections in summary_rows:
+            summary = activity_data["protocols"].setdefault(
+                protocol.value, {"active": 0, "connections": 0}
+            )
+            if status is ShareStatus.ACTIVE:
+                summary["active"] += share_count
+            summary["connections"] += connections
+
+        if summary_only:
+            return jsonify(activity_data)
+
+        # Plain rows rather than ORM instances: nothing here needs identity tracking
+        shares = db.session.execute(
+            select(
+                Share.id,
+                Share.name,
+                Share.protocol,
+                Share.status,
+                Share.bytes_transferred,
+                Share.connections_count,
+                Share.last_access,
+            )
+        ).all()
+
+        activity_data["shares"] = [
+            {
                 "id": share.id,
                 "name": share.name,
                 "protocol": share.protocol.value,
@@ -265,13 +401,8 @@ def api_network_activity():
                 "connections_count": share.connections_count,
                 "last_access": share.last_access.isoformat() if share.last_access else None,
             }
-            activity_data["shares"].append(share_data)
-
-            # Update protocol summary
-            protocol = share.protocol.value
-            if share.status.value == "active":
-                activity_data["protocols"][protocol]["active"] += 1
-            activity_data["protocols"][protocol]["connections"] += share.connections_count
+            for share in shares
+        ]
 
         return jsonify(activity_data)
 
@@ -279,6 +410,9 @@ def api_network_activity():
         return jsonify({"error": str(e)}), 500
 
 
+# psutil readings below are cached per worker for a few seconds so that
+# dashboard polling does not statvfs every mount on each request
+@ttl_cache(maxsize=1, ttl=5)
 def get_system_info():
     """Get comprehensive system information"""
     try:
@@ -286,20 +420,14 @@ def get_system_info():
         uptime = datetime.now() - boot_time
 
         return {
-            "hostname": os.uname().nodename,
-            "platform": f"{os.uname().sysname} {os.uname().release}",
-            "architecture": os.uname().machine,
+            "hostname": _UNAME.nodename,
+            "platform": f"{_UNAME.sysname} {_UNAME.release}",
+            "architecture": _UNAME.machine,
             "boot_time": boot_time,
             "uptime": str(uptime).split(".")[0],  # Remove microseconds
             "cpu_count": psutil.cpu_count(),
             "memory_total": psutil.virtual_memory().total,
-            "disk_total": sum(
-                [
-                    psutil.disk_usage(p.mountpoint).total
-                    for p in psutil.disk_partitions()
-                    if p.fstype and not p.mountpoint.startswith("/snap")
-                ]
-            ),
+            "disk_total": sum(_filesystem_size(p.mountpoint) for p in _mounted_partitions()),
         }
     except Exception as e:
         return {"error": str(e)}
@@ -315,15 +443,9 @@ def get_performance_metrics():
         memory = psutil.virtual_memory()
 
         # Top processes by CPU and memory
-        processes = []
-        for proc in psutil.process_iter(["pid", "name", "cpu_percent", "memory_percent"]):
-            try:
-                processes.append(proc.info)
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
-
-        top_cpu = sorted(processes, key=lambda x: x["cpu_percent"] or 0, reverse=True)[:5]
-        top_memory = sorted(processes, key=lambda x: x["memory_percent"] or 0, reverse=True)[:5]
+        snapshot = _process_snapshot()
+        top_cpu = snapshot["top_cpu"]
+        top_memory = snapshot["top_memory"]
 
         return {
             "cpu_per_core": cpu_per_core,
@@ -343,29 +465,100 @@ def get_performance_metrics():
         return {"error": str(e)}
 
 
+@ttl_cache(maxsize=1, ttl=60)
+def _mounted_partitions():
+    """Real filesystems worth reporting, re-read from the mount table every minute"""
+    return tuple(
+        p
+        for p in psutil.disk_partitions()
+        if p.fstype and not p.mountpoint.startswith("/snap")
+    )
+
+
+def _filesystem_size(mountpoint):
+    """Total size in bytes of the filesystem at mountpoint, 0 if unreadable"""
+    try:
+        st = os.statvfs(mountpoint)
+    except OSError:
+        return 0
+    return st.f_blocks * st.f_frsize
+
+
+def _sample_processes():
+    """One /proc scan: status counts plus the top 5 processes by CPU and memory"""
+    processes = [
+        p.info
+        for p in psutil.process_iter(["pid", "name", "cpu_percent", "memory_percent", "status"])
+    ]
+    return {
+        "statuses": Counter(info["status"] for info in processes),
+        "top_cpu": heapq.nlargest(5, processes, key=lambda x: x["cpu_percent"] or 0),
+        "top_memory": heapq.nlargest(5, processes, key=lambda x: x["memory_percent"] or 0),
+    }
+
+
+def _process_sampler():
+    """Refresh the shared process sample until readers go away
+
+    If a scan raises, the thread still unregisters itself so the next
+    reader starts a new sampler.
+    """
+    try:
+        while True:
+            sample = _sample_processes()
+            with _proc_lock:
+                _proc_state["sample"] = sample
+                if time.monotonic() - _proc_state["last_read"] > _PROC_SAMPLER_IDLE:
+                    _proc_state["thread"] = None
+                    return
+            time.sleep(_PROC_SAMPLE_INTERVAL)
+    finally:
+        with _proc_lock:
+            if _proc_state["thread"] is threading.current_thread():
+                _proc_state["thread"] = None
+
+
+def _process_snapshot():
+    """Latest process sample, at most _PROC_SAMPLE_INTERVAL seconds old
+
+    Starts the sampler thread if it is not running. Only the very first
+    call, before any sample exists, scans /proc on the request thread. The
+    returned dict is shared and must not be modified.
+    """
+    with _proc_lock:
+        _proc_state["last_read"] = time.monotonic()
+        if _proc_state["thread"] is None:
+            _proc_state["thread"] = threading.Thread(
+                target=_process_sampler, name="process-sampler", daemon=True
+            )
+            _proc_state["thread"].start()
+        sample = _proc_state["sample"]
+    return sample if sample is not None else _sample_processes()
+
+
+@ttl_cache(maxsize=1, ttl=5)
 def get_disk_metrics():
     """Get disk I/O metrics"""
     try:
         disk_io = psutil.disk_io_counters()
         partitions = []
 
-        for partition in psutil.disk_partitions():
-            if partition.fstype and not partition.mountpoint.startswith("/snap"):
-                try:
-                    usage = psutil.disk_usage(partition.mountpoint)
-                    partitions.append(
-                        {
-                            "device": partition.device,
-                            "mountpoint": partition.mountpoint,
-                            "fstype": partition.fstype,
-                            "total": usage.total,
-                            "used": usage.used,
-                            "free": usage.free,
-                            "percent": (usage.used / usage.total) * 100 if usage.total > 0 else 0,
-                        }
-                    )
-                except PermissionError:
-                    continue
+        for partition in _mounted_partitions():
+            try:
+                usage = psutil.disk_usage(partition.mountpoint)
+                partitions.append(
+                    {
+                        "device": partition.device,
+                        "mountpoint": partition.mountpoint,
+                        "fstype": partition.fstype,
+                        "total": usage.total,
+                        "used": usage.used,
+                        "free": usage.free,
+                        "percent": (usage.used / usage.total) * 100 if usage.total > 0 else 0,
+                    }
+                )
+            except PermissionError:
+                continue
 
         return {
             "io_counters": {
@@ -380,6 +573,7 @@ def get_disk_metrics():
         return {"error": str(e)}
 
 
+@ttl_cache(maxsize=1, ttl=5)
 def get_network_metrics():
     """Get network interface metrics"""
     try:
@@ -4,22 +4,124 @@ Provides deep integration with Proxmox VE for VM/CT storage, backup coordination
 and cluster-aware storage management
 """
 import requests
-import json
+import hashlib
+import orjson
+import random
+import re
 import ssl
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Any
-from dataclasses import dataclass
+from urllib.parse import urlencode
+from typing import List, Dict, Optional, Tuple, Any, Callable, Iterable
+from dataclasses import dataclass, field
 from enum import Enum
 import urllib3
+from cachetools import LRUCache, TTLCache
+from flask import current_app, has_app_context
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from app.models import StoragePool, SystemLog, LogLevel
+from app.models import StoragePool, PoolStatus, SystemLog, LogLevel
 from app import db
+from sqlalchemy import select
 
 # Disable SSL warnings for self-signed certificates
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+# Transient statuses retried by urllib3 for idempotent methods
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# POST is only resent when Proxmox rejected it before doing any work
+POST_RETRY_STATUS_CODES = (429, 503)
+POST_RETRY_ATTEMPTS = 3
+# Total time one request may spend waiting between retries, Retry-After
+# included, so a throttling host cannot hold a web worker for minutes
+RETRY_MAX_WAIT = 10.0  # seconds
+
+# Cluster and storage status reads change on the order of seconds, so repeat
+# GETs of these endpoints within GET_CACHE_TTL are answered from memory
+GET_CACHE_TTL = 5.0  # seconds
+GET_CACHE_SIZE = 64
+_CACHEABLE_GET = re.compile(r"^/?(cluster/resources|cluster/status|nodes/[^/]+/storage|storage)/?$")
+# Once that copy expires the same endpoints are revalidated with the ETag
+# of the last response, if the Proxmox build sent one; a 304 reuses the
+# decoded body
+
+# Tickets from /access/ticket live for two hours; clients created later in
+# the same process (re-initialisation, several managers) reuse a live one
+# instead of logging in again. Verified API tokens are remembered the same
+# way so the /version probe is not repeated.
+AUTH_CACHE_TTL = 7000  # seconds
+_AUTH_CACHE: Dict[Tuple, Tuple[Optional[str], Optional[str], float]] = {}
+_AUTH_CACHE_LOCK = threading.Lock()
+
+# Fan-out calls (per-guest status, per-pool registration) run here so they
+# overlap their network round trips instead of queueing behind each other
+MAX_CONCURRENT_REQUESTS = 16
+_API_EXECUTOR = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_REQUESTS, thread_name_prefix="proxmox-api"
+)
+
+# Proxmox hosts usually present self-signed certificates, so most clients
+# run unverified. urllib3 otherwise builds a fresh SSLContext (and loads the
+# system CA store into it) for every new connection; unverified clients share
+# this one instead. Verifying clients keep requests' own CA handling.
+_INSECURE_SSL_CONTEXT = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+_INSECURE_SSL_CONTEXT.check_hostname = False
+_INSECURE_SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+_INSECURE_SSL_CONTEXT.minimum_version = ssl.TLSVersion.TLSv1_2
+
+
+class _BoundedRetry(Retry):
+    """urllib3 Retry whose waits add up to at most RETRY_MAX_WAIT seconds
+
+    Retry-After and backoff delays are both cut to what is left of the
+    budget. new() carries the time already waited over to the Retry
+    object used for the next attempt.
+    """
+
+    def __init__(self, *args, waited: float = 0.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waited = waited
+
+    def new(self, **kw):
+        kw.setdefault("waited", self.waited)
+        return super().new(**kw)
+
+    def _remaining(self) -> float:
+        return max(0.0, RETRY_MAX_WAIT - self.waited)
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, self._remaining())
+
+    def get_backoff_time(self) -> float:
+        return min(super().get_backoff_time(), self._remaining())
+
+    def sleep(self, response=None) -> None:
+        started = time.monotonic()
+        super().sleep(response)
+        self.waited += time.monotonic() - started
+
+
+class _SharedSSLContextAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools all use one pre-built SSLContext"""
+
+    def __init__(self, ssl_context: Optional[ssl.SSLContext] = None, **kwargs):
+        # Set before super().__init__, which calls init_poolmanager
+        self._ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self._ssl_context is not None:
+            kwargs.setdefault("ssl_context", self._ssl_context)
+        return super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        if self._ssl_context is not None:
+            proxy_kwargs.setdefault("ssl_context", self._ssl_context)
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
+
 
 class ProxmoxResourceType(Enum):
     """Proxmox resource types"""
@@ -44,9 +146,19 @@ class StorageType(Enum):
     GLUSTER = "glusterfs"
 
 
-@dataclass
+# Enum.value is a descriptor call; these plain dicts answer the same lookup
+# with one hash probe in the per-pool loops below
+_STORAGE_TYPE_VALUES = {storage_type: storage_type.value for storage_type in StorageType}
+_POOL_STATUS_VALUES = {status: status.value for status in PoolStatus}
+
+
+@dataclass(frozen=True)
 class ProxmoxCredentials:
-    """Proxmox authentication credentials"""
+    """Proxmox authentication credentials
+
+    Immutable: ProxmoxAPIClient derives its base URL and auth cache key
+    from these once, so they must not change underneath it.
+    """
 
     host: str
     port: int = 8006
@@ -59,7 +171,12 @@ class ProxmoxCredentials:
 
 @dataclass
 class StorageDefinition:
-    """Proxmox storage definition"""
+    """Proxmox storage definition
+
+    content and nodes are joined into the comma-separated form Proxmox
+    expects when the definition is built; replace the definition rather
+    than mutating those lists afterwards.
+    """
 
     storage_id: str
     storage_type: StorageType
@@ -78,6 +195,104 @@ class StorageDefinition:
     thin: bool = False  # For LVM
     saferemove: bool = False
     saferemove_throughput: str = None
+    content_csv: str = field(init=False, repr=False, compare=False)
+    nodes_csv: Optional[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.content_csv = ",".join(self.content)
+        self.nodes_csv = ",".join(self.nodes) if self.nodes else None
+
+
+def _json(response: requests.Response) -> Dict:
+    """Decode a Proxmox API response body; empty bodies decode to {}"""
+    return orjson.loads(response.content) if response.content else {}
+
+
+def _cached_auth(key: Tuple) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """(ticket, csrf_token) remembered for key, or None if absent or expired"""
+    with _AUTH_CACHE_LOCK:
+        entry = _AUTH_CACHE.get(key)
+        if entry is None:
+            return None
+        if entry[2] <= time.monotonic():
+            del _AUTH_CACHE[key]
+            return None
+        return entry[0], entry[1]
+
+
+def _remember_auth(key: Tuple, ticket: Optional[str], csrf_token: Optional[str]) -> None:
+    """Remember a successful login for AUTH_CACHE_TTL seconds"""
+    with _AUTH_CACHE_LOCK:
+        _AUTH_CACHE[key] = (ticket, csrf_token, time.monotonic() + AUTH_CACHE_TTL)
+
+
+def _forget_auth(key: Tuple) -> None:
+    """Discard a remembered login, e.g. after Proxmox answers 401"""
+    with _AUTH_CACHE_LOCK:
+        _AUTH_CACHE.pop(key, None)
+
+
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+
+def _form_body(data: Optional[Dict]) -> Optional[bytes]:
+    """URL-encode form data up front, dropping None values as requests would"""
+    if not data:
+        return None
+    return urlencode([(k, v) for k, v in data.items() if v is not None], doseq=True).encode()
+
+
+# Form fields whose values never go into SystemLog details
+_SENSITIVE_FIELD = re.compile(r"pass|secret|token|key", re.IGNORECASE)
+
+
+def _redact(data: Dict) -> Dict:
+    """Copy of request data safe to log: credential values are masked"""
+    return {k: "***" if _SENSITIVE_FIELD.search(str(k)) else v for k, v in data.items()}
+
+
+def _dir_config(storage_def: StorageDefinition) -> Dict[str, str]:
+    """Directory storage: just the path"""
+    return {"path": storage_def.path}
+
+
+def _nfs_config(storage_def: StorageDefinition) -> Dict[str, str]:
+    """NFS storage: server, export and local mount path"""
+    return {
+        "server": storage_def.server,
+        "export": storage_def.export,
+        "path": storage_def.path,
+    }
+
+
+def _cifs_config(storage_def: StorageDefinition) -> Dict[str, str]:
+    """CIFS storage: server, share and credentials"""
+    config = {
+        "server": storage_def.server,
+        "share": storage_def.export,
+        "username": storage_def.username,
+        "password": storage_def.password,
+    }
+    if storage_def.domain:
+        config["domain"] = storage_def.domain
+    return config
+
+
+def _zfs_config(storage_def: StorageDefinition) -> Dict[str, str]:
+    """ZFS pool storage, sparse when thin provisioned"""
+    config = {"pool": storage_def.pool}
+    if storage_def.thin:
+        config["sparse"] = "1"
+    return config
+
+
+# Type-specific /storage parameters; types not listed need only the common ones
+_STORAGE_CONFIG_BUILDERS: Dict[StorageType, Callable[[StorageDefinition], Dict[str, str]]] = {
+    StorageType.DIR: _dir_config,
+    StorageType.NFS: _nfs_config,
+    StorageType.CIFS: _cifs_config,
+    StorageType.ZFS: _zfs_config,
+}
 
 
 class ProxmoxAPIClient:
@@ -91,14 +306,33 @@ class ProxmoxAPIClient:
         self.ticket = None
         self.api_token = None
 
+        # Short-lived copies of cluster/storage status reads, see get()
+        self._get_cache = TTLCache(maxsize=GET_CACHE_SIZE, ttl=GET_CACHE_TTL)
+        self._etag_cache = LRUCache(maxsize=GET_CACHE_SIZE)
+        self._get_cache_lock = threading.Lock()
+
         # Configure session with retries
-        retry_strategy = Retry(
-            total=3,
-            status_forcelist=[429, 500, 502, 503, 504],
-            method_whitelist=["HEAD", "GET", "OPTIONS"],
-            backoff_factor=1,
+        retry_strategy = _BoundedRetry(
+            total=5,
+            connect=3,
+            read=3,
+            status=5,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["HEAD", "GET", "OPTIONS", "PUT", "DELETE"]),
+            backoff_factor=1.0,
+            backoff_jitter=0.5,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # One host per client, but keep a connection per fan-out worker so
+        # concurrent calls reuse TLS sessions instead of discarding them.
+        # requests already sends keep-alive and gzip headers by default.
+        adapter = _SharedSSLContextAdapter(
+            ssl_context=None if credentials.verify_ssl else _INSECURE_SSL_CONTEXT,
+            max_retries=retry_strategy,
+            pool_connections=1,
+            pool_maxsize=MAX_CONCURRENT_REQUESTS,
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
@@ -106,6 +340,50 @@ class ProxmoxAPIClient:
         if not credentials.verify_ssl:
             self.session.verify = False
 
+    def map_concurrent(self, func: Callable[[Any], Any], items: Iterable) -> List[Any]:
+        """Call func on every item concurrently and return the results in order
+
+        func is expected to use this client, so the calls share its pooled
+        session. Each call runs inside the caller's app context, if any, so
+        SystemLog.log_event works from the worker threads. func must not
+        itself call map_concurrent.
+        """
+        items = list(items)
+        if len(items) < 2:
+            return [func(item) for item in items]
+
+        app = current_app._get_current_object() if has_app_context() else None
+
+        def call(item):
+            if app is None:
+                return func(item)
+            with app.app_context():
+                return func(item)
+
+        return list(_API_EXECUTOR.map(call, items))
+
+    def _auth_cache_key(self) -> Tuple[str, int, str, str]:
+        """Key for _AUTH_CACHE; includes a digest of the secret so a changed
+        or wrong password never matches a ticket issued for the old one"""
+        creds = self.credentials
+        if creds.api_token_id and creds.api_token_secret:
+            user, secret = creds.api_token_id, creds.api_token_secret
+        else:
+            user, secret = creds.username, creds.password or ""
+        return (creds.host, creds.port, user, hashlib.sha256(secret.encode()).hexdigest())
+
+    def _apply_ticket(self, ticket: str, csrf_token: str) -> None:
+        """Send ticket and CSRF token with every following request"""
+        self.ticket = ticket
+        self.csrf_token = csrf_token
+        self.session.cookies.set("PVEAuthCookie", ticket)
+        self.session.headers.update({"CSRFPreventionToken": csrf_token})
+
+    def _check_auth(self, response: requests.Response) -> None:
+        """Drop the cached ticket or token check once Proxmox rejects it"""
+        if response.status_code == 401:
+            _forget_auth(self._auth_cache_key())
+
     def authenticate(self) -> Tuple[bool, str]:
         """Authenticate with Proxmox API"""
         try:
@@ -116,9 +394,14 @@ class ProxmoxAPIClient:
                 )
                 self.session.headers.update({"Authorization": f"PVEAPIToken={self.api_token}"})
 
+                # A token this process verified recently needs no second probe
+                if _cached_auth(self._auth_cache_key()) is not None:
+                    return True, "API token authentication successful (cached)"
+
                 # Test authentication
                 response = self.session.get(f"{self.base_url}/version")
                 if response.status_code == 200:
+                    _remember_auth(self._auth_cache_key(), None, None)
                     SystemLog.log_event(
                         level=LogLevel.INFO,
                         category="proxmox",
@@ -129,7 +412,12 @@ class ProxmoxAPIClient:
                     return False, f"API token authentication failed: {response.status_code}"
 
             else:
-                # Use username/password authentication
+                # Use username/password authentication, reusing a live ticket
+                cached = _cached_auth(self._auth_cache_key())
+                if cached is not None:
+                    self._apply_ticket(*cached)
+                    return True, "Username/password authentication successful (cached ticket)"
+
                 auth_data = {
                     "username": self.credentials.username,
                     "password": self.credentials.password,
@@ -137,14 +425,12 @@ class ProxmoxAPIClient:
 
                 response = self.session.post(f"{self.base_url}/access/ticket", data=auth_data)
                 if response.status_code == 200:
-                    result = response.json()
+                    result = _json(response)
                     if result.get("data"):
-                        self.ticket = result["data"]["ticket"]
-                        self.csrf_token = result["data"]["CSRFPreventionToken"]
-
-                        # Update session headers
-                        self.session.cookies.set("PVEAuthCookie", self.ticket)
-                        self.session.headers.update({"CSRFPreventionToken": self.csrf_token})
+                        self._apply_ticket(
+                            result["data"]["ticket"], result["data"]["CSRFPreventionToken"]
+                        )
+                        _remember_auth(self._auth_cache_key(), self.ticket, self.csrf_token)
 
                         SystemLog.log_event(
                             level=LogLevel.INFO,
@@ -165,89 +451,144 @@ class ProxmoxAPIClient:
             )
             return False, str(e)
 
-    def get(self, endpoint: str, params: Dict = None) -> Tuple[bool, Dict]:
-        """GET request to Proxmox API"""
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Dict = None,
+        data: Dict = None,
+        ok_statuses: Tuple[int, ...] = (200,),
+        etag_key: Optional[Tuple] = None,
+    ) -> Tuple[bool, Dict]:
+        """Send one API request and return (success, decoded body or error)
+
+        Every verb goes through here, so auth expiry, cache invalidation
+        and failure logging are handled in one place. Non-GET requests
+        clear the GET cache; POSTs go through _post_with_retry. A GET with
+        an etag_key is sent conditionally when an ETag is known for it.
+        """
+        validator = None
         try:
             url = f"{self.base_url}/{endpoint.lstrip('/')}"
-            response = self.session.get(url, params=params)
-
-            if response.status_code == 200:
-                return True, response.json()
-            else:
-                SystemLog.log_event(
-                    level=LogLevel.WARNING,
-                    category="proxmox",
-                    message=f"Proxmox API GET failed: {endpoint}",
-                    details={"status_code": response.status_code, "response": response.text[:500]},
+            if method == "POST":
+                response = self._post_with_retry(url, data)
+            elif data:
+                response = self.session.request(
+                    method, url, params=params, data=_form_body(data), headers=_FORM_HEADERS
                 )
-                return False, {"error": f"HTTP {response.status_code}", "details": response.text}
-
-        except Exception as e:
+            else:
+                headers = None
+                if etag_key is not None:
+                    with self._get_cache_lock:
+                        validator = self._etag_cache.get(etag_key)
+                    if validator is not None:
+                        headers = {"If-None-Match": validator[0]}
+                response = self.session.request(method, url, params=params, headers=headers)
+            self._check_auth(response)
+            if method != "GET":
+                self._invalidate_get_cache()
+
+            if response.status_code == 304 and validator is not None:
+                return True, validator[1]
+
+            if response.status_code in ok_statuses:
+                result = _json(response)
+                etag = response.headers.get("ETag")
+                if etag_key is not None and etag:
+                    with self._get_cache_lock:
+                        self._etag_cache[etag_key] = (etag, result)
+                return True, result
+
+            details = {"status_code": response.status_code, "response": response.text[:500]}
+            if data is not None:
+                details["data"] = _redact(data)
             SystemLog.log_event(
-                level=LogLevel.ERROR,
+                level=LogLevel.WARNING,
                 category="proxmox",
-                message=f"Proxmox API GET error: {e}",
-                details={"endpoint": endpoint},
+                message=f"Proxmox API {method} failed: {endpoint}",
+                details=details,
             )
-            return False, {"error": str(e)}
-
-    def post(self, endpoint: str, data: Dict = None) -> Tuple[bool, Dict]:
-        """POST request to Proxmox API"""
-        try:
-            url = f"{self.base_url}/{endpoint.lstrip('/')}"
-            response = self.session.post(url, data=data)
-
-            if response.status_code in [200, 201]:
-                return True, response.json()
-            else:
-                SystemLog.log_event(
-                    level=LogLevel.WARNING,
-                    category="proxmox",
-                    message=f"Proxmox API POST failed: {endpoint}",
-                    details={
-                        "status_code": response.status_code,
-                        "response": response.text[:500],
-                        "data": data,
-                    },
-                )
-                return False, {"error": f"HTTP {response.status_code}", "details": response.text}
+            return False, {"error": f"HTTP {response.status_code}", "details": response.text}
 
         except Exception as e:
+            details = {"endpoint": endpoint}
+            if data is not None:
+                details["data"] = _redact(data)
             SystemLog.log_event(
                 level=LogLevel.ERROR,
                 category="proxmox",
-                message=f"Proxmox API POST error: {e}",
-                details={"endpoint": endpoint, "data": data},
+                message=f"Proxmox API {method} error: {e}",
+                details=details,
             )
             return False, {"error": str(e)}
 
-    def put(self, endpoint: str, data: Dict = None) -> Tuple[bool, Dict]:
-        """PUT request to Proxmox API"""
-        try:
-            url = f"{self.base_url}/{endpoint.lstrip('/')}"
-            response = self.session.put(url, data=data)
+    def get(self, endpoint: str, params: Dict = None) -> Tuple[bool, Dict]:
+        """GET request to Proxmox API
+
+        Successful reads of cluster and storage status endpoints are reused
+        for GET_CACHE_TTL seconds and revalidated by ETag afterwards; the
+        returned dict is then shared between callers and must not be
+        modified.
+        """
+        if not _CACHEABLE_GET.match(endpoint):
+            return self._request("GET", endpoint, params=params)
+
+        cache_key = (endpoint.strip("/"), frozenset((params or {}).items()))
+        with self._get_cache_lock:
+            cached = self._get_cache.get(cache_key)
+        if cached is not None:
+            return True, cached
+
+        success, result = self._request("GET", endpoint, params=params, etag_key=cache_key)
+        if success:
+            with self._get_cache_lock:
+                self._get_cache[cache_key] = result
+        return success, result
 
-            if response.status_code in [200, 201]:
-                return True, response.json()
-            else:
-                return False, {"error": f"HTTP {response.status_code}", "details": response.text}
+    def post(self, endpoint: str, data: Dict = None) -> Tuple[bool, Dict]:
+        """POST request to Proxmox API"""
+        return self._request("POST", endpoint, data=data, ok_statuses=(200, 201))
 
-        except Exception as e:
-            return False, {"error": str(e)}
+    def put(self, endpoint: str, data: Dict = None) -> Tuple[bool, Dict]:
+        """PUT request to Proxmox API"""
+        return self._request("PUT", endpoint, data=data, ok_statuses=(200, 201))
 
     def delete(self, endpoint: str) -> Tuple[bool, Dict]:
         """DELETE request to Proxmox API"""
-        try:
-            url = f"{self.base_url}/{endpoint.lstrip('/')}"
-            response = self.session.delete(url)
-
-            if response.status_code in [200, 204]:
-                return True, response.json() if response.content else {}
+        return self._request("DELETE", endpoint, ok_statuses=(200, 204))
+
+    def _invalidate_get_cache(self) -> None:
+        """Forget cached reads after a write; any write may change storage status"""
+        with self._get_cache_lock:
+            self._get_cache.clear()
+
+    def _post_with_retry(self, url: str, data: Dict = None) -> requests.Response:
+        """POST, resending only when Proxmox refused the request as overloaded
+
+        urllib3 never retries POST since it is not idempotent, but 429 and
+        503 mean the request was turned away unprocessed, so resending is
+        safe. Waits for Retry-After when given, else backs off with jitter,
+        for at most RETRY_MAX_WAIT seconds in total.
+        """
+        body = _form_body(data)
+        waited = 0.0
+        for attempt in range(POST_RETRY_ATTEMPTS):
+            response = self.session.post(url, data=body, headers=_FORM_HEADERS)
+            if response.status_code not in POST_RETRY_STATUS_CODES:
+                break
+            if attempt == POST_RETRY_ATTEMPTS - 1:
+                break
+            retry_after = response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = float(retry_after)
             else:
-                return False, {"error": f"HTTP {response.status_code}", "details": response.text}
-
-        except Exception as e:
-            return False, {"error": str(e)}
+                delay = 2**attempt + random.uniform(0, 0.5)
+            delay = min(delay, RETRY_MAX_WAIT - waited)
+            if delay <= 0:
+                break
+            time.sleep(delay)
+            waited += delay
+        return response
 
 
 class ProxmoxStorageIntegration:
@@ -264,34 +605,20 @@ class ProxmoxStorageIntegration:
             # Build storage configuration
             config_data = {
                 "storage": storage_def.storage_id,
-                "type": storage_def.storage_type.value,
-                "content": ",".join(storage_def.content),
+                "type": _STORAGE_TYPE_VALUES[storage_def.storage_type],
+                "content": storage_def.content_csv,
                 "shared": "1" if storage_def.shared else "0",
                 "disable": "0" if storage_def.enabled else "1",
             }
 
             # Add type-specific configuration
-            if storage_def.storage_type == StorageType.DIR:
-                config_data["path"] = storage_def.path
-            elif storage_def.storage_type == StorageType.NFS:
-                config_data["server"] = storage_def.server
-                config_data["export"] = storage_def.export
-                config_data["path"] = storage_def.path
-            elif storage_def.storage_type == StorageType.CIFS:
-                config_data["server"] = storage_def.server
-                config_data["share"] = storage_def.export
-                config_data["username"] = storage_def.username
-                config_data["password"] = storage_def.password
-                if storage_def.domain:
-                    config_data["domain"] = storage_def.domain
-            elif storage_def.storage_type == StorageType.ZFS:
-                config_data["pool"] = storage_def.pool
-                if storage_def.thin:
-                    config_data["sparse"] = "1"
+            builder = _STORAGE_CONFIG_BUILDERS.get(storage_def.storage_type)
+            if builder:
+                config_data.update(builder(storage_def))
 
             # Add nodes if specified
-            if storage_def.nodes:
-                config_data["nodes"] = ",".join(storage_def.nodes)
+            if storage_def.nodes_csv:
+                config_data["nodes"] = storage_def.nodes_csv
 
             # Create storage in Proxmox
             success, result = self.api.post("/storage", data=config_data)
@@ -300,7 +627,10 @@ class ProxmoxStorageIntegration:
                     level=LogLevel.INFO,
                     category="proxmox",
                     message=f"MoxNAS storage registered with Proxmox: {storage_def.storage_id}",
-                    details={"pool_name": pool_name, "type": storage_def.storage_type.value},
+                    details={
+                        "pool_name": pool_name,
+                        "type": _STORAGE_TYPE_VALUES[storage_def.storage_type],
+                    },
                 )
                 return True, f"Storage {storage_def.storage_id} registered successfully"
             else:
@@ -489,22 +819,34 @@ class ProxmoxVMManager:
             return result.get("data", [])
         return []
 
-    def get_all_vm_status(self) -> List[Dict]:
-        """Get status of all VMs and containers"""
+    def get_all_vm_status(
+        self, detailed: bool = False, vmids: Optional[Iterable[int]] = None
+    ) -> List[Dict]:
+        """Get status of all VMs and containers
+
+        /cluster/resources already reports status, cpu, mem, maxmem, disk
+        and uptime for every guest, so by default those records are
+        returned without further requests. Pass detailed=True for each
+        guest's status/current (QEMU agent, balloon and HA details); vmids
+        limits either form to the given guests.
+        """
         vms = self.get_all_vms()
-        status_list = []
-
-        for vm in vms:
-            node = vm.get("node")
-            vmid = vm.get("vmid")
-            vm_type = "qemu" if vm.get("type") == "qemu" else "lxc"
+        if vmids is not None:
+            wanted = set(vmids)
+            vms = [vm for vm in vms if vm.get("vmid") in wanted]
+        if not detailed:
+            return list(vms)
 
-            if node and vmid:
-                success, result = self.api.get(f"/nodes/{node}/{vm_type}/{vmid}/status/current")
-                if success:
-                    status_list.append(result.get("data", {}))
+        endpoints = [
+            f"/nodes/{vm['node']}/{'qemu' if vm.get('type') == 'qemu' else 'lxc'}"
+            f"/{vm['vmid']}/status/current"
+            for vm in vms
+            if vm.get("node") and vm.get("vmid")
+        ]
 
-        return status_list
+        # One GET per guest, issued concurrently
+        responses = self.api.map_concurrent(self.api.get, endpoints)
+        return [result.get("data", {}) for success, result in responses if success]
 
 
 class ProxmoxTemplateManager:
@@ -514,8 +856,14 @@ class ProxmoxTemplateManager:
         self.api = api_client
 
     def list_templates(self, node: str, storage: str) -> List[Dict]:
-        """List templates on a storage"""
-        success, result = self.api.get(f"/nodes/{node}/storage/{storage}/content")
+        """List container templates on a storage
+
+        Proxmox filters by content type server side; unfiltered, the
+        listing also carries every VM disk and backup on the storage.
+        """
+        success, result = self.api.get(
+            f"/nodes/{node}/storage/{storage}/content", params={"content": "vztmpl"}
+        )
         if success:
             return result.get("data", [])
         return []
@@ -556,8 +904,9 @@ class MoxNASProxmoxManager:
 
         try:
             # Get all MoxNAS storage pools
-            pools = StoragePool.query.filter_by(status="healthy").all()
+            pools = StoragePool.query.filter_by(status=PoolStatus.HEALTHY).all()
 
+            registrations = []
             for pool in pools:
                 # Determine storage type based on pool configuration
                 if pool.filesystem_type == "zfs":
@@ -579,15 +928,18 @@ class MoxNASProxmoxManager:
                         content=["images", "rootdir", "backup", "iso", "vztmpl"],
                         shared=True,
                     )
+                registrations.append((pool.name, storage_def))
 
-                # Register with Proxmox
-                success, message = self.storage_integration.register_moxnas_storage(
-                    pool.name, storage_def
-                )
+            # Register with Proxmox; the POSTs are independent, so send them together
+            outcomes = self.api_client.map_concurrent(
+                lambda reg: self.storage_integration.register_moxnas_storage(*reg),
+                registrations,
+            )
+            for (pool_name, _), (success, message) in zip(registrations, outcomes):
                 if success:
-                    results.append(f"Registered: {pool.name}")
+                    results.append(f"Registered: {pool_name}")
                 else:
-                    errors.append(f"Failed to register {pool.name}: {message}")
+                    errors.append(f"Failed to register {pool_name}: {message}")
 
             if results:
                 SystemLog.log_event(
@@ -613,36 +965,41 @@ class MoxNASProxmoxManager:
             # Get Proxmox cluster storage status
             cluster_storage = self.storage_integration.get_cluster_storage_status()
 
-            # Get MoxNAS pools
-            moxnas_pools = {f"moxnas-{pool.name}": pool for pool in StoragePool.query.all()}
+            # Get MoxNAS pools (name and status only, as plain rows)
+            moxnas_pools = {
+                f"moxnas-{name}": (name, status)
+                for name, status in db.session.execute(
+                    select(StoragePool.name, StoragePool.status)
+                )
+            }
+            proxmox_storage_ids = {storage.get("id", "") for storage in cluster_storage}
+            synchronized = moxnas_pools.keys() & proxmox_storage_ids
+            missing_in_moxnas = {
+                storage_id
+                for storage_id in proxmox_storage_ids - moxnas_pools.keys()
+                if storage_id.startswith("moxnas-")
+            }
 
             sync_status = {
                 "proxmox_storage": len(cluster_storage),
                 "moxnas_pools": len(moxnas_pools),
-                "synchronized": [],
-                "missing_in_proxmox": [],
-                "missing_in_moxnas": [],
+                "synchronized": [
+                    {"id": storage_id, "pool_name": name, "status": _POOL_STATUS_VALUES[status]}
+                    for storage_id, (name, status) in moxnas_pools.items()
+                    if storage_id in synchronized
+                ],
+                "missing_in_proxmox": [
+                    {"id": storage_id, "pool_name": name}
+                    for storage_id, (name, _) in moxnas_pools.items()
+                    if storage_id not in synchronized
+                ],
+                "missing_in_moxnas": [
+                    storage
+                    for storage in cluster_storage
+                    if storage.get("id", "") in missing_in_moxnas
+                ],
             }
 
-            # Find synchronized storage
-            proxmox_storage_ids = {storage.get("id", "") for storage in cluster_storage}
-
-            for storage_id, pool in moxnas_pools.items():
-                if storage_id in proxmox_storage_ids:
-                    sync_status["synchronized"].append(
-                        {"id": storage_id, "pool_name": pool.name, "status": pool.status.value}
-                    )
-                else:
-                    sync_status["missing_in_proxmox"].append(
-                        {"id": storage_id, "pool_name": pool.name}
-                    )
-
-            # Find Proxmox storage not in MoxNAS
-            for storage in cluster_storage:
-                storage_id = storage.get("id", "")
-                if storage_id.startswith("moxnas-") and storage_id not in moxnas_pools:
-                    sync_status["missing_in_moxnas"].append(storage)
-
             return sync_status
 
         except Exception as e:
@@ -2,18 +2,73 @@
 Security hardening module for MoxNAS
 Implements additional security measures beyond basic Flask security
 """
+import base64
+import os
 import secrets
 import hashlib
 import hmac
+import threading
 import time
 from datetime import datetime, timedelta
 from flask import request, current_app, session, g
 from functools import wraps
 import re
 import ipaddress
+from collections import deque
+from cachetools import LRUCache
 from app.models import SystemLog, LogLevel, User
 from app import db
 
+RATE_LIMIT_SHARDS = 64
+# Identifiers tracked at once across all shards; the least recently seen
+# are forgotten first
+RATE_LIMIT_MAX_IDENTIFIERS = 100_000
+
+# Content Security Policy - Allow CSS files to load properly. Only the
+# per-response nonce is filled in at request time.
+CSP_TEMPLATE = (
+    "default-src 'self'; "
+    "script-src 'self' 'nonce-{nonce}' https://cdn.jsdelivr.net https://cdn.socket.io; "
+    "style-src 'self' 'unsafe-inline' 'nonce-{nonce}' https://cdn.jsdelivr.net; "
+    "img-src 'self' data: https:; "
+    "font-src 'self' https://cdn.jsdelivr.net; "
+    "connect-src 'self' ws: wss:; "
+    "frame-ancestors 'none'; "
+    "base-uri 'self'; "
+    "form-action 'self'; "
+    "upgrade-insecure-requests"
+)
+
+# CSP nonces are sliced from a per-thread buffer of os.urandom output, one
+# getrandom() call per NONCE_POOL_SIZE // NONCE_BYTES responses
+NONCE_BYTES = 16
+NONCE_POOL_SIZE = 4096
+_nonce_pool = threading.local()
+
+
+def _csp_nonce():
+    """Return a URL-safe nonce equivalent to secrets.token_urlsafe(NONCE_BYTES)"""
+    pid = os.getpid()
+    # A forked worker must not hand out bytes its parent buffered
+    if getattr(_nonce_pool, "pid", None) != pid or _nonce_pool.offset >= NONCE_POOL_SIZE:
+        _nonce_pool.buffer = os.urandom(NONCE_POOL_SIZE)
+        _nonce_pool.offset = 0
+        _nonce_pool.pid = pid
+    start = _nonce_pool.offset
+    _nonce_pool.offset = start + NONCE_BYTES
+    chunk = _nonce_pool.buffer[start : start + NONCE_BYTES]
+    return base64.urlsafe_b64encode(chunk).rstrip(b"=").decode("ascii")
+
+
+STATIC_SECURITY_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("X-XSS-Protection", "1; mode=block"),
+    ("Strict-Transport-Security", "max-age=31536000; includeSubDomains"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+    ("Permissions-Policy", "geolocation=(), microphone=(), camera=()"),
+)
+
 
 class SecurityHardening:
     """Centralized security hardening utilities"""
@@ -31,16 +86,29 @@ class SecurityHardening:
         app.config.setdefault("SESSION_TIMEOUT", 28800)  # 8 hours
         app.config.setdefault("FAILED_LOGIN_TRACKING", True)
 
+        # Key for session fingerprints, derived once so each request only
+        # runs a single keyed BLAKE2b over the IP / User-Agent
+        secret = app.config.get("SECRET_KEY") or ""
+        if isinstance(secret, str):
+            secret = secret.encode()
+        app.extensions["security_hardening"] = {
+            "fingerprint_key": hashlib.sha256(secret).digest()
+        }
+
         # Register security handlers
-        app.before_request(self.security_headers)
-        app.before_request(self.session_security)
+        app.before_request(self.before_request)
         app.after_request(self.response_security_headers)
 
-    def security_headers(self):
-        """Add security headers to requests"""
+    def before_request(self):
+        """Run the session checks once per request behind a single config check"""
         if not current_app.config.get("SECURITY_HARDENING_ENABLED"):
             return
 
+        self._track_activity()
+        self._verify_session()
+
+    def _track_activity(self):
+        """Expire idle sessions and record this request's activity"""
         # Track session security
         if "last_activity" in session:
             last_activity = datetime.fromisoformat(session["last_activity"])
@@ -57,14 +125,13 @@ class SecurityHardening:
 
         session["last_activity"] = datetime.utcnow().isoformat()
 
-    def session_security(self):
-        """Enhanced session security checks"""
-        if not current_app.config.get("SECURITY_HARDENING_ENABLED"):
-            return
+    def _verify_session(self):
+        """Check the session fingerprint and rotate it periodically"""
+        now = time.time()
 
         # Check for session fixation attempts
         if "session_creation_time" not in session:
-            session["session_creation_time"] = time.time()
+            session["session_creation_time"] = now
             session["original_ip_hash"] = self._hash_ip(request.remote_addr)
             session["original_user_agent_hash"] = self._hash_user_agent(
                 request.headers.get("User-Agent", "")
@@ -74,10 +141,12 @@ class SecurityHardening:
             current_ip_hash = self._hash_ip(request.remote_addr)
             current_ua_hash = self._hash_user_agent(request.headers.get("User-Agent", ""))
 
-            # Only invalidate session if both IP and User-Agent changed (prevents NAT issues)
-            if (
-                session.get("original_ip_hash") != current_ip_hash
-                and session.get("original_user_agent_hash") != current_ua_hash
+            # Only invalidate session if both IP and User-Agent changed (prevents NAT issues).
+            # compare_digest keeps the comparison time independent of where they differ
+            if not hmac.compare_digest(
+                session.get("original_ip_hash", ""), current_ip_hash
+            ) and not hmac.compare_digest(
+                session.get("original_user_agent_hash", ""), current_ua_hash
             ):
                 SystemLog.log_event(
                     level=LogLevel.WARNING,
@@ -89,13 +158,11 @@ class SecurityHardening:
                 return
 
         # Rotate session ID periodically (every 15 minutes)
-        if time.time() - session.get("session_creation_time", 0) > 900:
+        if now - session.get("session_creation_time", 0) > 900:
             session.permanent = True
-            # Flask doesn't have session.regenerate(), so we manually refresh the session
-            old_data = dict(session)
-            session.clear()
-            session.update(old_data)
-            session["session_creation_time"] = time.time()
+            # The signed cookie session has no server-side ID to regenerate;
+            # changing its contents re-signs and reissues the cookie
+            session["session_creation_time"] = now
 
     def response_security_headers(self, response):
         """Add security headers to responses"""
@@ -103,47 +170,39 @@ class SecurityHardening:
             return response
 
         # Generate nonce for inline scripts and styles
-        nonce = secrets.token_urlsafe(16)
+        nonce = _csp_nonce()
         g.csp_nonce = nonce
 
-        # Content Security Policy - Allow CSS files to load properly
-        csp = (
-            "default-src 'self'; "
-            f"script-src 'self' 'nonce-{nonce}' https://cdn.jsdelivr.net https://cdn.socket.io; "
-            f"style-src 'self' 'unsafe-inline' 'nonce-{nonce}' https://cdn.jsdelivr.net; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' https://cdn.jsdelivr.net; "
-            "connect-src 'self' ws: wss:; "
-            "frame-ancestors 'none'; "
-            "base-uri 'self'; "
-            "form-action 'self'; "
-            "upgrade-insecure-requests"
-        )
-        response.headers["Content-Security-Policy"] = csp
+        response.headers["Content-Security-Policy"] = CSP_TEMPLATE.format(nonce=nonce)
 
         # Additional security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = "geolocation=(), microphone=(), camera=()"
+        for name, value in STATIC_SECURITY_HEADERS:
+            response.headers[name] = value
 
         return response
 
+    def _fingerprint(self, value):
+        """Keyed 64-bit BLAKE2b digest of value as 16 hex characters
+
+        Keyed with the app secret, so stored fingerprints cannot be matched
+        against a precomputed table of IPs or User-Agents.
+        """
+        key = current_app.extensions["security_hardening"]["fingerprint_key"]
+        return hashlib.blake2b(value.encode(), digest_size=8, key=key).hexdigest()
+
     def _hash_ip(self, ip_address):
         """Hash IP address for privacy-preserving session validation"""
         try:
             # Normalize IP address and hash it
             ip = ipaddress.ip_address(ip_address)
-            return hashlib.sha256(str(ip).encode()).hexdigest()[:16]
+            return self._fingerprint(str(ip))
         except ValueError:
             # Fallback for invalid IP addresses
-            return hashlib.sha256(ip_address.encode()).hexdigest()[:16]
+            return self._fingerprint(ip_address)
 
     def _hash_user_agent(self, user_agent):
         """Hash user agent for session fingerprinting"""
-        return hashlib.sha256(user_agent.encode()).hexdigest()[:16]
+        return self._fingerprint(user_agent)
 
 
 class InputSanitizer:
@@ -154,12 +213,21 @@ class InputSanitizer:
     EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
     FILENAME_PATTERN = re.compile(r"^[a-zA-Z0-9._-]+$")
     PATH_PATTERN = re.compile(r"^[a-zA-Z0-9._/-]+$")
-    SMB_SHARE_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_-]{1,80}$")
+    # Also rejects names reserved by Windows (CON, PRN, AUX, NUL, COM1-9, LPT1-9)
+    SMB_SHARE_NAME_PATTERN = re.compile(
+        r"^(?!(?:CON|PRN|AUX|NUL|COM[1-9]|LPT[1-9])$)[a-zA-Z0-9_-]{1,80}$", re.IGNORECASE
+    )
     SMB_COMMENT_PATTERN = re.compile(r"^[a-zA-Z0-9\s._-]{0,100}$")
     NFS_PATH_PATTERN = re.compile(r"^/[a-zA-Z0-9._/-]*$")
     NFS_HOST_PATTERN = re.compile(r"^[a-zA-Z0-9.-]+$|^\*$|^[0-9./]+$")
     IP_PATTERN = re.compile(r"^(?:[0-9]{1,3}\.){3}[0-9]{1,3}$")
 
+    # Everything sanitize_shell_argument removes
+    SHELL_UNSAFE_CHARS = re.compile(r"[^a-zA-Z0-9./_-]")
+
+    # str.translate table deleting control characters except tab, LF and CR
+    CONTROL_CHARS = dict.fromkeys(code for code in range(32) if code not in (9, 10, 13))
+
     @staticmethod
     def validate_username(username):
         """Validate username format"""
@@ -217,7 +285,7 @@ class InputSanitizer:
             return ""
 
         # Remove null bytes and control characters
-        sanitized = "".join(char for char in value if ord(char) >= 32 or char in "\n\r\t")
+        sanitized = value.translate(InputSanitizer.CONTROL_CHARS)
 
         # Truncate to max length
         return sanitized[:max_length].strip()
@@ -225,34 +293,7 @@ class InputSanitizer:
     @staticmethod
     def validate_smb_share_name(name):
         """Validate SMB share name"""
-        if not name or len(name) > 80:
-            return False
-        # Forbidden names in Windows
-        forbidden = {
-            "CON",
-            "PRN",
-            "AUX",
-            "NUL",
-            "COM1",
-            "COM2",
-            "COM3",
-            "COM4",
-            "COM5",
-            "COM6",
-            "COM7",
-            "COM8",
-            "COM9",
-            "LPT1",
-            "LPT2",
-            "LPT3",
-            "LPT4",
-            "LPT5",
-            "LPT6",
-            "LPT7",
-            "LPT8",
-            "LPT9",
-        }
-        if name.upper() in forbidden:
+        if not name:
             return False
         return bool(InputSanitizer.SMB_SHARE_NAME_PATTERN.match(name))
 
@@ -284,14 +325,9 @@ class InputSanitizer:
         if not arg:
             return ""
 
-        # Remove dangerous characters
-        dangerous_chars = ["|", "&", ";", "(", ")", "<", ">", "`", "$", "\\", '"', "'", "\n", "\r"]
-        sanitized = arg
-        for char in dangerous_chars:
-            sanitized = sanitized.replace(char, "")
-
-        # Only allow alphanumeric, dots, slashes, dashes, underscores
-        sanitized = re.sub(r"[^a-zA-Z0-9./_-]", "", sanitized)
+        # Only allow alphanumeric, dots, slashes, dashes, underscores; this
+        # also drops every shell metacharacter
+        sanitized = InputSanitizer.SHELL_UNSAFE_CHARS.sub("", arg)
 
         return sanitized[:1000]  # Limit length
 
@@ -331,30 +367,42 @@ class TokenGenerator:
 
 
 class RateLimiter:
-    """Enhanced rate limiting functionality"""
+    """Enhanced rate limiting functionality
+
+    Identifiers are spread over RATE_LIMIT_SHARDS independently locked
+    stores, so concurrent requests only contend when they hash to the same
+    shard. Each store is an LRU cache, so identifiers that stop making
+    requests are dropped once RATE_LIMIT_MAX_IDENTIFIERS is reached.
+    """
 
     def __init__(self):
-        self.attempts = {}
+        # Each shard maps identifier -> attempt timestamps, oldest first
+        shard_size = RATE_LIMIT_MAX_IDENTIFIERS // RATE_LIMIT_SHARDS
+        self._shards = [
+            (threading.Lock(), LRUCache(maxsize=shard_size)) for _ in range(RATE_LIMIT_SHARDS)
+        ]
 
     def is_rate_limited(self, identifier, max_attempts=5, window=300):
         """Check if identifier is rate limited"""
-        now = time.time()
-
-        if identifier not in self.attempts:
-            self.attempts[identifier] = []
-
-        # Clean old attempts
-        self.attempts[identifier] = [
-            timestamp for timestamp in self.attempts[identifier] if now - timestamp < window
-        ]
-
-        # Check if rate limited
-        if len(self.attempts[identifier]) >= max_attempts:
-            return True
+        lock, store = self._shards[hash(identifier) % RATE_LIMIT_SHARDS]
+        with lock:
+            now = time.time()
+            attempts = store.get(identifier)
+            if attempts is None:
+                attempts = store[identifier] = deque()
+
+            # Clean old attempts; they are in time order, so stop at the first live one
+            cutoff = now - window
+            while attempts and attempts[0] <= cutoff:
+                attempts.popleft()
+
+            # Check if rate limited
+            if len(attempts) >= max_attempts:
+                return True
 
-        # Record attempt
-        self.attempts[identifier].append(now)
-        return False
+            # Record attempt
+            attempts.append(now)
+            return False
 
 
 def security_audit_decorator(audit_action):
@@ -408,6 +456,13 @@ def security_audit_decorator(audit_action):
 
 def ip_whitelist_required(whitelist):
     """Decorator to restrict access to whitelisted IPs"""
+    # Parse the whitelist once; entries that are not valid networks never match
+    networks = []
+    for allowed_ip in whitelist:
+        try:
+            networks.append(ipaddress.ip_network(allowed_ip))
+        except ValueError:
+            continue
 
     def decorator(f):
         @wraps(f)
@@ -415,12 +470,12 @@ def ip_whitelist_required(whitelist):
             client_ip = request.remote_addr
 
             # Check if IP is in whitelist
-            for allowed_ip in whitelist:
-                try:
-                    if ipaddress.ip_address(client_ip) in ipaddress.ip_network(allowed_ip):
-                        return f(*args, **kwargs)
-                except ValueError:
-                    continue
+            try:
+                address = ipaddress.ip_address(client_ip)
+            except ValueError:
+                address = None
+            if address is not None and any(address in network for network in networks):
+                return f(*args, **kwargs)
 
             # Log unauthorized access attempt
             SystemLog.log_event(
@@ -441,6 +496,16 @@ def ip_whitelist_required(whitelist):
 class SecurityMonitor:
     """Security monitoring and alerting"""
 
+    # Each detector scans the content once with a single alternation
+    SQL_INJECTION_PATTERN = re.compile(
+        r"union\s+select|drop\s+table|insert\s+into|delete\s+from|update\s+set|--|/\*|\*/",
+        re.IGNORECASE,
+    )
+    XSS_PATTERN = re.compile(
+        r"<script|javascript:|onload=|onerror=|alert\(|document\.cookie|window\.location",
+        re.IGNORECASE,
+    )
+
     def __init__(self):
         self.threat_indicators = {
             "brute_force": self.detect_brute_force,
@@ -472,42 +537,13 @@ class SecurityMonitor:
 
     def detect_sql_injection(self, request_data):
         """Detect potential SQL injection attempts"""
-        suspicious_patterns = [
-            r"union\s+select",
-            r"drop\s+table",
-            r"insert\s+into",
-            r"delete\s+from",
-            r"update\s+set",
-            r"--",
-            r"/\*",
-            r"\*/",
-        ]
-
         request_content = str(request_data.get("content", ""))
-        for pattern in suspicious_patterns:
-            if re.search(pattern, request_content, re.IGNORECASE):
-                return True
-
-        return False
+        return bool(self.SQL_INJECTION_PATTERN.search(request_content))
 
     def detect_xss_attempt(self, request_data):
         """Detect potential XSS attempts"""
-        xss_patterns = [
-            r"<script",
-            r"javascript:",
-            r"onload=",
-            r"onerror=",
-            r"alert\(",
-            r"document\.cookie",
-            r"window\.location",
-        ]
-
         request_content = str(request_data.get("content", ""))
-        for pattern in xss_patterns:
-            if re.search(pattern, request_content, re.IGNORECASE):
-                return True
-
-        return False
+        return bool(self.XSS_PATTERN.search(request_content))
 
     def analyze_request(self, request_data):
         """Analyze request for security threats"""
@@ -23,7 +23,9 @@ from app.security.hardening import InputSanitizer
 def index() -> str:
     """Shares overview page"""
     page = request.args.get("page", 1, type=int)
-    shares = Share.query.paginate(page=page, per_page=20, error_out=False)
+    shares = Share.query.options(db.joinedload(Share.dataset)).paginate(
+        page=page, per_page=20, error_out=False
+    )
 
     # Statistics
     total_shares = Share.query.count()
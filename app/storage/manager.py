@@ -11,7 +11,9 @@ import re
 import time
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple, Any, Union
-from app.models import StorageDevice, StoragePool, DeviceStatus, PoolStatus, SystemLog, LogLevel
+from app.models import (
+    StorageDevice, StoragePool, DeviceStatus, PoolStatus, SystemLog, LogLevel, utcnow,
+)
 from app import db
 from app.utils.atomic_operations import AtomicDirectoryOperations
 
@@ -850,7 +852,7 @@ class StorageManager:
                         }
                         db_device.update_smart_data(smart_data)
 
-                    db_device.updated_at = datetime.utcnow()
+                    db_device.updated_at = utcnow()
                 else:
                     # Create new device - map fields correctly
                     temperature_val = None
@@ -16,6 +16,7 @@ from app.models import (
     UserRole,
 )
 from app import db
+from app.utils.aggregates import invalidate_storage_aggregates
 from datetime import datetime
 from app.utils.error_handler import (
     secure_route,
@@ -65,7 +66,9 @@ def index():
 def devices():
     """Storage devices page"""
     page = request.args.get("page", 1, type=int)
-    devices = StorageDevice.query.paginate(page=page, per_page=20, error_out=False)
+    devices = StorageDevice.query.options(db.joinedload(StorageDevice.pool)).paginate(
+        page=page, per_page=20, error_out=False
+    )
 
     return render_template("storage/devices.html", devices=devices)
 
@@ -86,6 +89,8 @@ def scan_devices():
         
         # Nettoyer les anciens périphériques
         StorageDevice.query.delete()
+        # The bulk delete skips the mapper events, so reset the pool counters
+        StoragePool.recount_devices()
         
         # Ajouter les nouveaux périphériques détectés
         devices_added = 0
@@ -122,6 +127,7 @@ def scan_devices():
                 print(f"Erreur lors de l'ajout du périphérique {device_info['device_name']}: {device_error}")
         
         db.session.commit()
+        invalidate_storage_aggregates()
 
         SystemLog.log_event(
             level=LogLevel.INFO,
@@ -160,6 +166,7 @@ def device_smart_data(device_id):
         # Update database with fresh data
         device.update_smart_data(smart_data)
         DatabaseErrorHandler.safe_commit()
+        invalidate_storage_aggregates()
 
     return jsonify(
         {
@@ -275,6 +282,7 @@ def create_pool():
             if not success:
                 flash(f"Failed to save pool configuration: {error}", "danger")
                 return redirect(url_for("storage.create_pool"))
+            invalidate_storage_aggregates()
 
             SystemLog.log_event(
                 level=LogLevel.INFO,
@@ -403,6 +411,7 @@ def delete_pool(pool_id):
                     jsonify({"success": False, "error": f"Database deletion failed: {error}"}),
                     500,
                 )
+            invalidate_storage_aggregates()
 
             SystemLog.log_event(
                 level=LogLevel.WARNING,
@@ -517,7 +526,9 @@ def update_pool_sizes():
 def datasets():
     """Datasets page"""
     page = request.args.get("page", 1, type=int)
-    datasets = Dataset.query.paginate(page=page, per_page=20, error_out=False)
+    datasets = Dataset.query.options(db.joinedload(Dataset.pool)).paginate(
+        page=page, per_page=20, error_out=False
+    )
 
     return render_template("storage/datasets.html", datasets=datasets)
 
@@ -1,6 +1,7 @@
 """Background tasks for MoxNAS"""
 from celery import current_task
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import update
 from app import db, make_celery
 from app.models import (
     StorageDevice,
@@ -12,15 +13,17 @@ from app.models import (
     Alert,
     DeviceStatus,
     PoolStatus,
+    User,
 )
 from app.storage.manager import storage_manager
 import os
 import subprocess
 import shutil
-import json
+import orjson
 
-# This will be initialized when the worker starts
-celery = None
+# Tasks register on the current Celery app; celery_worker creates it with
+# make_celery before importing this module
+from celery import current_app as celery
 
 
 @celery.task(bind=True)
@@ -52,6 +55,7 @@ def check_device_health(self):
         devices = StorageDevice.query.all()
         issues_found = 0
         alerts_created = 0
+        log_events = []
 
         for device in devices:
             smart_data = storage_manager.get_smart_data(device.device_path)
@@ -78,23 +82,28 @@ def check_device_health(self):
                         db.session.add(alert)
                         alerts_created += 1
 
-                    SystemLog.log_event(
-                        level=LogLevel.WARNING,
-                        category="storage",
-                        message=f'Device health warning: {device.device_path} - {smart_data.get("overall_health", "unknown")}',
-                        details={"device_id": device.id, "smart_data": smart_data},
+                    log_events.append(
+                        {
+                            "level": LogLevel.WARNING,
+                            "category": "storage",
+                            "message": f'Device health warning: {device.device_path} - {smart_data.get("overall_health", "unknown")}',
+                            "details": {"device_id": device.id, "smart_data": smart_data},
+                        }
                     )
 
                 # Check temperature warnings
                 if device.temperature and device.temperature > 60:
-                    SystemLog.log_event(
-                        level=LogLevel.WARNING,
-                        category="storage",
-                        message=f"High temperature warning: {device.device_path} - {device.temperature}°C",
-                        details={"device_id": device.id, "temperature": device.temperature},
+                    log_events.append(
+                        {
+                            "level": LogLevel.WARNING,
+                            "category": "storage",
+                            "message": f"High temperature warning: {device.device_path} - {device.temperature}°C",
+                            "details": {"device_id": device.id, "temperature": device.temperature},
+                        }
                     )
 
         db.session.commit()
+        SystemLog.bulk_log(log_events)
 
         return {
             "success": True,
@@ -220,6 +229,39 @@ def cleanup_old_logs(self):
         return {"success": False, "error": str(e)}
 
 
+@celery.task(bind=True)
+def clear_expired_lockouts(self):
+    """Reset failed login counters on accounts whose lock has expired"""
+    try:
+        result = db.session.execute(
+            update(User)
+            .where(User.locked_until < datetime.now(timezone.utc))
+            .values(locked_until=None, failed_login_attempts=0)
+        )
+        db.session.commit()
+        return {"success": True, "accounts_unlocked": result.rowcount}
+
+    except Exception as e:
+        db.session.rollback()
+        return {"success": False, "error": str(e)}
+
+
+@celery.task(bind=True)
+def ship_error_logs(self):
+    """Copy new entries from the JSON-lines error log into SystemLog"""
+    from flask import current_app
+    from app.utils.enhanced_logging import ship_error_log
+
+    path = current_app.config.get("ERROR_LOG_JSONL", "logs/moxnas-errors.jsonl")
+    try:
+        shipped = ship_error_log(path)
+        return {"success": True, "shipped": shipped}
+
+    except Exception as e:
+        db.session.rollback()
+        return {"success": False, "error": str(e)}
+
+
 def execute_backup(job, task):
     """Execute the actual backup operation"""
     try:
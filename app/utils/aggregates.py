@@ -0,0 +1,54 @@
+"""
+Aggregate queries shared by the MoxNAS dashboards
+"""
+import threading
+from collections import Counter
+
+from cachetools import TTLCache
+from flask import current_app
+from sqlalchemy import func
+
+from app import db
+from app.models import StorageDevice
+
+# Storage aggregates shared by the dashboard and overview API; polled UIs
+# hit these every few seconds, storage changes far less often
+_agg_cache = TTLCache(maxsize=16, ttl=5)
+_agg_cache_lock = threading.Lock()
+
+
+def status_counts(model):
+    """Row counts per status for model, as a Counter
+
+    Statuses with no rows count as zero.
+    """
+    return Counter(
+        dict(db.session.query(model.status, func.count(model.id)).group_by(model.status).all())
+    )
+
+
+def get_storage_aggregates(version=None):
+    """Cached device counts by status across all devices, pooled or not
+
+    Per-pool counts are kept on StoragePool itself. Pass the storage ETag
+    as version to get counts that match it exactly rather than ones up to
+    the cache TTL old. The returned Counter is shared between requests
+    and must not be modified by callers.
+    """
+    if not current_app.config.get("STORAGE_AGGREGATES_CACHE", True):
+        return status_counts(StorageDevice)
+    key = ("device_status", version)
+    with _agg_cache_lock:
+        hit = _agg_cache.get(key)
+    if hit is not None:
+        return hit
+    value = status_counts(StorageDevice)
+    with _agg_cache_lock:
+        _agg_cache[key] = value
+    return value
+
+
+def invalidate_storage_aggregates():
+    """Drop cached storage aggregates after pools or devices change"""
+    with _agg_cache_lock:
+        _agg_cache.clear()
@@ -1,14 +1,17 @@
 """Enhanced logging utilities with structured logging and correlation IDs"""
 import logging
+import logging.handlers
 import json
+import os
+import queue
 import uuid
 import threading
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Union
 from contextlib import contextmanager
 from functools import wraps
-from flask import request, g, current_app, has_request_context
+from flask import request, g, current_app, has_app_context, has_request_context
 
 
 class CorrelationContext:
@@ -258,6 +261,210 @@ class MoxNASLogger:
         )
 
 
+class SystemLogHandler(logging.Handler):
+    """Mirror log records into SystemLog through its write-behind queue
+    
+    Lets a module log once through its structured logger instead of calling
+    both the logger and SystemLog.log_event. Records whose category is in
+    exclude_categories are skipped.
+    """
+    
+    def __init__(self, level: int = logging.WARNING, exclude_categories=()):
+        super().__init__(level)
+        self.exclude_categories = frozenset(exclude_categories)
+    
+    def emit(self, record: logging.LogRecord):
+        if not has_app_context():
+            return
+        
+        category = getattr(record, 'category', 'general')
+        if category in self.exclude_categories:
+            return
+        
+        from app.models import SystemLog, LogLevel
+        
+        try:
+            SystemLog.log_event(
+                level=LogLevel(record.levelname.lower()),
+                category=category,
+                message=record.getMessage(),
+                user_id=getattr(record, 'user_id', None),
+                ip_address=getattr(record, 'ip_address', None),
+                details=getattr(record, 'details', None) or None,
+            )
+        except Exception:
+            self.handleError(record)
+
+
+# Logger feeding the JSON-lines error file; see setup_error_log_sink()
+ERROR_SINK_LOGGER = 'moxnas.error_sink'
+
+
+class JSONLineFormatter(logging.Formatter):
+    """Format error-sink records as one JSON object per line"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps({
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname.lower(),
+            'category': getattr(record, 'category', 'system'),
+            'message': record.getMessage(),
+            'user_id': getattr(record, 'user_id', None),
+            'ip_address': getattr(record, 'ip_address', None),
+            'details': getattr(record, 'details', None),
+        }, default=str)
+
+
+def setup_error_log_sink(app) -> logging.handlers.QueueListener:
+    """Route error-sink records through a queue to a rotating JSON-lines file
+    
+    The file is shipped into SystemLog by the ship_error_logs task, so error
+    handlers never touch the database themselves.
+    """
+    path = app.config.get('ERROR_LOG_JSONL', 'logs/moxnas-errors.jsonl')
+    log_dir = os.path.dirname(path)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+    
+    file_handler = logging.handlers.RotatingFileHandler(
+        path,
+        maxBytes=app.config.get('LOG_MAX_BYTES', 10485760),
+        backupCount=app.config.get('LOG_BACKUP_COUNT', 5)
+    )
+    file_handler.setFormatter(JSONLineFormatter())
+    
+    log_queue: queue.Queue = queue.Queue(-1)
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    
+    sink = logging.getLogger(ERROR_SINK_LOGGER)
+    sink.addHandler(logging.handlers.QueueHandler(log_queue))
+    sink.setLevel(logging.INFO)
+    sink.propagate = False
+    
+    listener.start()
+    return listener
+
+
+def log_error_event(level: int, category: str, message: str,
+                    user_id: Optional[int] = None, ip_address: Optional[str] = None,
+                    details: Optional[Dict[str, Any]] = None):
+    """Record an error event without a database write
+    
+    Use instead of SystemLog.log_event on paths where the database may be
+    the cause of the failure.
+    """
+    logging.getLogger(ERROR_SINK_LOGGER).log(
+        level,
+        message,
+        extra={
+            'category': category,
+            'user_id': user_id,
+            'ip_address': ip_address,
+            'details': details,
+        }
+    )
+
+
+def _read_error_log(f, offset: int) -> tuple:
+    """SystemLog rows for the complete lines of binary file f from offset
+
+    Returns (rows, offset after the last complete line). A partially
+    written last line is left for the next run; lines that do not parse
+    are skipped.
+    """
+    from app.models import LogLevel
+    
+    rows = []
+    f.seek(offset)
+    for line in f:
+        if not line.endswith(b"\n"):
+            break
+        offset += len(line)
+        try:
+            record = json.loads(line)
+            rows.append({
+                'timestamp': datetime.fromisoformat(record['timestamp']),
+                'level': LogLevel(record['level']),
+                'category': record.get('category') or 'system',
+                'message': record['message'],
+                'user_id': record.get('user_id'),
+                'ip_address': record.get('ip_address'),
+                'details': record.get('details'),
+            })
+        except (KeyError, TypeError, ValueError):
+            continue
+    return rows, offset
+
+
+def _rotated_error_logs(path: str, inode: int) -> list:
+    """Rotated copies of path from the one with inode to the newest, oldest first
+    
+    Empty if the file with inode has already been rotated out of the
+    RotatingFileHandler backups.
+    """
+    backups = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        backups.append(f"{path}.{index}")
+        if os.stat(backups[-1]).st_ino == inode:
+            return backups[::-1]
+        index += 1
+    return []
+
+
+def ship_error_log(path: str) -> int:
+    """Copy entries added to the JSON-lines error log since the last call into SystemLog
+    
+    Progress is kept next to the log as "<inode> <offset>". When the inode
+    no longer matches, the file was rotated: the rest of the old file is
+    read from its backup, then any newer backups and the new file from the
+    start. Returns the number of entries read; rows the database rejects
+    are logged and dropped rather than retried forever.
+    """
+    from app.models import SystemLog, _write_log_rows
+    
+    state_path = f"{path}.offset"
+    try:
+        with open(state_path) as f:
+            fields = f.read().split()
+        inode, offset = (int(fields[0]), int(fields[1])) if len(fields) == 2 else (None, int(fields[0]))
+    except (OSError, ValueError, IndexError):
+        inode, offset = None, 0
+    
+    try:
+        current = open(path, 'rb')
+    except FileNotFoundError:
+        return 0
+    
+    with current:
+        stat = os.fstat(current.fileno())
+        rows = []
+        if inode is not None and inode != stat.st_ino:
+            for index, backup in enumerate(_rotated_error_logs(path, inode)):
+                with open(backup, 'rb') as f:
+                    rows += _read_error_log(f, offset if index == 0 else 0)[0]
+            offset = 0
+        elif stat.st_size < offset:
+            offset = 0  # Truncated in place
+        new_rows, offset = _read_error_log(current, offset)
+        rows += new_rows
+    
+    if rows:
+        try:
+            SystemLog.bulk_log(rows)
+        except Exception:
+            # One bad row (e.g. a user_id for a deleted user) must not hold
+            # back the rest, or the offset would never advance
+            logging.getLogger(__name__).warning(
+                "Error log batch of %d rows failed, retrying row by row", len(rows), exc_info=True
+            )
+            _write_log_rows(rows)
+    
+    with open(state_path, 'w') as f:
+        f.write(f"{stat.st_ino} {offset}")
+    return len(rows)
+
+
 def get_logger(name: str) -> MoxNASLogger:
     """Get a MoxNAS logger instance"""
     return MoxNASLogger(name)
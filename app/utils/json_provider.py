@@ -0,0 +1,43 @@
+"""
+orjson-backed JSON provider for MoxNAS
+Serializes jsonify() responses, sessions and request bodies with orjson
+"""
+import typing as t
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider that encodes and decodes with orjson
+
+    Output matches Flask's default provider: keys are sorted and dates go
+    through DefaultJSONProvider.default (HTTP date strings), as do Decimal
+    and any other type orjson does not handle natively.
+    """
+
+    def _options(self, indent: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        """Serialize obj to a JSON string; stdlib json kwargs are ignored
+        apart from indent"""
+        return orjson.dumps(
+            obj, default=self.default, option=self._options(bool(kwargs.get("indent")))
+        ).decode()
+
+    def loads(self, s: t.Union[str, bytes], **kwargs: t.Any) -> t.Any:
+        """Deserialize a JSON string or bytes"""
+        return orjson.loads(s)
+
+    def response(self, *args: t.Any, **kwargs: t.Any):
+        """Build a JSON response without a bytes -> str -> bytes round trip"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
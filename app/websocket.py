@@ -10,7 +10,9 @@ from flask import request, current_app
 from flask_socketio import emit, disconnect
 from flask_login import current_user
 import psutil
-from app.models import SystemLog, LogLevel, StoragePool, StorageDevice, Alert
+from app.models import (
+    SystemLog, LogLevel, StoragePool, StorageDevice, Alert, DeviceStatus, PoolStatus,
+)
 from app import db
 from sqlalchemy.orm import joinedload
 
@@ -239,9 +241,9 @@ def get_storage_status_secure():
             "devices": [],
             "summary": {
                 "total_pools": len(pools),
-                "healthy_pools": len([p for p in pools if p.status.value == "healthy"]),
+                "healthy_pools": sum(1 for p in pools if p.status is PoolStatus.HEALTHY),
                 "total_devices": len(devices),
-                "healthy_devices": len([d for d in devices if d.status.value == "healthy"]),
+                "healthy_devices": sum(1 for d in devices if d.status is DeviceStatus.HEALTHY),
             },
         }
 
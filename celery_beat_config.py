@@ -144,6 +144,19 @@ beat_schedule = {
         'options': {'queue': 'system'}
     },
     
+    # Clear expired account lockouts - every 15 minutes
+    'clear-expired-lockouts': {
+        'task': 'app.tasks.clear_expired_lockouts',
+        'schedule': crontab(minute='*/15'),
+        'options': {'queue': 'maintenance'}
+    },
+    
+    # Ship request error events from the JSON-lines log into SystemLog - every minute
+    'ship-error-logs': {
+        'task': 'app.tasks.ship_error_logs',
+        'schedule': crontab(minute='*'),
+    },
+    
     # Generate storage usage trends - weekly on Monday at 7 AM
     'storage-usage-trends': {
         'task': 'app.tasks.generate_storage_trends',
@@ -181,6 +194,7 @@ celery.conf.task_routes = {
     'app.tasks.cleanup_expired_sessions': {'queue': 'maintenance'},
     'app.tasks.update_system_packages': {'queue': 'system'},
     'app.tasks.generate_storage_trends': {'queue': 'reports'},
+    'app.tasks.clear_expired_lockouts': {'queue': 'maintenance'},
 }
 
 # Additional Beat configuration
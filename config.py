@@ -23,10 +23,14 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_RECORD_QUERIES = True
+    # Sized for dashboard/api_status pollers plus error-handler writes;
+    # pool_timeout keeps a request from hanging when the pool is exhausted
     SQLALCHEMY_ENGINE_OPTIONS = {
         'pool_size': 20,
-        'pool_recycle': 3600,
-        'pool_pre_ping': True
+        'max_overflow': 10,
+        'pool_recycle': 1800,
+        'pool_pre_ping': True,
+        'pool_timeout': 5
     }
     
     # Redis and Celery
@@ -60,6 +64,11 @@ class Config:
     MOXNAS_STORAGE_ROOT = os.environ.get('MOXNAS_STORAGE_ROOT') or '/mnt/storage'
     MOXNAS_BACKUP_ROOT = os.environ.get('MOXNAS_BACKUP_ROOT') or '/mnt/backups'
     MOXNAS_LOG_LEVEL = os.environ.get('MOXNAS_LOG_LEVEL') or 'INFO'
+    STORAGE_AGGREGATES_CACHE = os.environ.get('STORAGE_AGGREGATES_CACHE', 'true').lower() == 'true'
+    
+    # Werkzeug hash method for new passwords, e.g. 'scrypt' or
+    # 'pbkdf2:sha256:600000'; existing hashes keep verifying with their own
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt'
     
     # Enhanced logging settings
     LOG_TO_STDOUT = os.environ.get('LOG_TO_STDOUT', 'false').lower() == 'true'
@@ -67,8 +76,11 @@ class Config:
     LOG_MAX_BYTES = int(os.environ.get('LOG_MAX_BYTES') or '10485760')  # 10MB
     LOG_BACKUP_COUNT = int(os.environ.get('LOG_BACKUP_COUNT') or '5')
     LOG_REQUEST_ID_HEADER = os.environ.get('LOG_REQUEST_ID_HEADER') or 'X-Request-ID'
+    SYSTEM_LOG_ASYNC = os.environ.get('SYSTEM_LOG_ASYNC', 'true').lower() == 'true'
+    ERROR_LOG_JSONL = os.environ.get('ERROR_LOG_JSONL') or 'logs/moxnas-errors.jsonl'
     
     # Error handling settings
+    CAPTURE_TRACEBACKS = os.environ.get('CAPTURE_TRACEBACKS', 'false').lower() == 'true'
     ERROR_RETRY_MAX_ATTEMPTS = int(os.environ.get('ERROR_RETRY_MAX_ATTEMPTS') or '3')
     ERROR_RETRY_DELAY = float(os.environ.get('ERROR_RETRY_DELAY') or '1.0')
     ERROR_RETRY_BACKOFF_FACTOR = float(os.environ.get('ERROR_RETRY_BACKOFF_FACTOR') or '2.0')
@@ -81,6 +93,10 @@ class Config:
     BACKUP_OPERATION_TIMEOUT = int(os.environ.get('BACKUP_OPERATION_TIMEOUT') or '3600')
     DATABASE_OPERATION_TIMEOUT = int(os.environ.get('DATABASE_OPERATION_TIMEOUT') or '30')
     
+    # Compiled template cache shared by all workers: unset uses Jinja's
+    # private per-user directory, empty disables it
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get('JINJA_BYTECODE_CACHE_DIR')
+    
     # File upload settings
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file upload
     UPLOAD_FOLDER = os.path.join(basedir, 'uploads')
@@ -170,6 +186,15 @@ class TestingConfig(Config):
     
     # Disable security hardening in tests
     SECURITY_HARDENING_ENABLED = False
+    
+    # Write SystemLog entries inline so tests can assert on them
+    SYSTEM_LOG_ASYNC = False
+
+    # Tests seed rows directly, bypassing the routes that invalidate it
+    STORAGE_AGGREGATES_CACHE = False
+
+    # Hashing strength is irrelevant in tests and dominates fixture setup
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
 
 class ProductionConfig(Config):
     """Production configuration"""
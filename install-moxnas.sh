@@ -635,7 +635,7 @@ stdout_logfile_backups=5
 environment=PATH="$MOXNAS_HOME/venv/bin"
 
 [program:moxnas-worker]
-command=$MOXNAS_HOME/venv/bin/celery -A celery_worker.celery worker --loglevel=info --concurrency=4
+command=$MOXNAS_HOME/venv/bin/celery -A celery_worker.celery worker -Ofair --loglevel=info --concurrency=4
 directory=$MOXNAS_HOME
 user=$MOXNAS_USER
 autostart=true
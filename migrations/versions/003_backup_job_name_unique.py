@@ -0,0 +1,64 @@
+"""Enforce unique backup job names at the database level
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def _backup_jobs_table(inspector):
+    """Return the backup jobs table name used by this database, if any"""
+    for table_name in ('backup_jobs', 'backup_job'):
+        if inspector.has_table(table_name):
+            return table_name
+    return None
+
+
+def upgrade() -> None:
+    # The create view relies on this index to reject duplicate names
+    # instead of checking with a SELECT first
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    
+    table_name = _backup_jobs_table(inspector)
+    if not table_name:
+        return
+    
+    # Older databases already carry a unique index on name under another
+    # name (ix_backup_job_name); a second one would only slow down writes
+    indexes = inspector.get_indexes(table_name)
+    unique_on_name = [ix for ix in indexes if ix.get('unique') and ix['column_names'] == ['name']]
+    unique_on_name += [
+        uc for uc in inspector.get_unique_constraints(table_name) if uc['column_names'] == ['name']
+    ]
+    if unique_on_name:
+        return
+    if any(ix['name'] == 'ix_backup_jobs_name' for ix in indexes):
+        op.drop_index('ix_backup_jobs_name', table_name=table_name)
+    
+    op.create_index('ix_backup_jobs_name', table_name, ['name'], unique=True)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    
+    table_name = _backup_jobs_table(inspector)
+    if not table_name:
+        return
+    
+    # Nothing to undo when upgrade kept an existing unique index instead
+    indexes = {ix['name']: ix for ix in inspector.get_indexes(table_name)}
+    if not indexes.get('ix_backup_jobs_name', {}).get('unique'):
+        return
+    op.drop_index('ix_backup_jobs_name', table_name=table_name)
+    op.create_index('ix_backup_jobs_name', table_name, ['name'], unique=False)
@@ -0,0 +1,77 @@
+"""Store JSON documents in native JSON columns
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = (
+    ('users', 'backup_codes'),
+    ('storage_devices', 'smart_data'),
+    ('shares', 'allowed_hosts'),
+    ('system_logs', 'details'),
+)
+
+
+def _existing_columns(inspector):
+    """Yield (table, column) pairs from JSON_COLUMNS present in this database"""
+    for table_name, column_name in JSON_COLUMNS:
+        if not inspector.has_table(table_name):
+            continue
+        columns = {col['name'] for col in inspector.get_columns(table_name)}
+        if column_name in columns:
+            yield table_name, column_name
+
+
+def upgrade() -> None:
+    # Other backends keep JSON as text, so the stored values already match
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+    inspector = sa.inspect(conn)
+
+    for table_name, column_name in _existing_columns(inspector):
+        op.alter_column(
+            table_name,
+            column_name,
+            type_=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using=f'{column_name}::jsonb',
+        )
+
+    if inspector.has_table('storage_devices'):
+        op.create_index(
+            'ix_storage_devices_smart_data',
+            'storage_devices',
+            ['smart_data'],
+            postgresql_using='gin',
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+    inspector = sa.inspect(conn)
+
+    if inspector.has_table('storage_devices'):
+        op.drop_index('ix_storage_devices_smart_data', table_name='storage_devices')
+
+    for table_name, column_name in _existing_columns(inspector):
+        op.alter_column(
+            table_name,
+            column_name,
+            type_=sa.Text(),
+            existing_nullable=True,
+            postgresql_using=f'{column_name}::text',
+        )
@@ -0,0 +1,54 @@
+"""Add a (pool_id, status) index on storage devices
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Lets the dashboard's per-pool status counts be answered from the index
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if not inspector.has_table('storage_devices'):
+        return
+    if 'ix_storage_devices_pool_status' in {ix['name'] for ix in inspector.get_indexes('storage_devices')}:
+        return
+
+    if conn.dialect.name == 'postgresql':
+        # CONCURRENTLY avoids locking the table but cannot run in a transaction
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_storage_devices_pool_status',
+                'storage_devices',
+                ['pool_id', 'status'],
+                postgresql_concurrently=True,
+            )
+    else:
+        op.create_index('ix_storage_devices_pool_status', 'storage_devices', ['pool_id', 'status'])
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if not inspector.has_table('storage_devices'):
+        return
+
+    if conn.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                'ix_storage_devices_pool_status',
+                table_name='storage_devices',
+                postgresql_concurrently=True,
+            )
+    else:
+        op.drop_index('ix_storage_devices_pool_status', table_name='storage_devices')
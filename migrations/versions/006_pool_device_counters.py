@@ -0,0 +1,66 @@
+"""Add denormalized device counters to storage pools
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+COUNTER_COLUMNS = {
+    'device_count': None,
+    'healthy_count': ('HEALTHY',),
+    'warning_count': ('WARNING',),
+    'failed_count': ('FAILED', 'SMART_FAIL'),
+}
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if not inspector.has_table('storage_pools'):
+        return
+
+    existing = {col['name'] for col in inspector.get_columns('storage_pools')}
+    for column_name in COUNTER_COLUMNS:
+        if column_name not in existing:
+            op.add_column(
+                'storage_pools',
+                sa.Column(column_name, sa.Integer(), nullable=False, server_default='0'),
+            )
+
+    if not inspector.has_table('storage_devices'):
+        return
+
+    # Backfill from the current device rows; the application keeps the
+    # counters in step from here on
+    for column_name, statuses in COUNTER_COLUMNS.items():
+        condition = ''
+        if statuses:
+            condition = ' AND storage_devices.status IN ({})'.format(
+                ', '.join(f"'{status}'" for status in statuses)
+            )
+        op.execute(
+            f'UPDATE storage_pools SET {column_name} = ('
+            f'SELECT COUNT(*) FROM storage_devices '
+            f'WHERE storage_devices.pool_id = storage_pools.id{condition})'
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if not inspector.has_table('storage_pools'):
+        return
+
+    existing = {col['name'] for col in inspector.get_columns('storage_pools')}
+    for column_name in COUNTER_COLUMNS:
+        if column_name in existing:
+            op.drop_column('storage_pools', column_name)
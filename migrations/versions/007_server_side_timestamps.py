@@ -0,0 +1,62 @@
+"""Fill timestamp columns with database-side defaults
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+UTC_NOW = sa.text("TIMEZONE('utc', CURRENT_TIMESTAMP)")
+
+TIMESTAMP_COLUMNS = {
+    'users': ('created_at', 'updated_at', 'last_password_change'),
+    'storage_devices': ('created_at', 'updated_at'),
+    'storage_pools': ('created_at', 'updated_at'),
+    'datasets': ('created_at', 'updated_at'),
+    'shares': ('created_at', 'updated_at'),
+    'backup_jobs': ('created_at', 'updated_at'),
+    'system_logs': ('timestamp',),
+    'alerts': ('created_at', 'updated_at'),
+}
+
+
+def _existing_columns(inspector):
+    """Yield (table, column) pairs from TIMESTAMP_COLUMNS present in this database"""
+    for table_name, column_names in TIMESTAMP_COLUMNS.items():
+        if not inspector.has_table(table_name):
+            continue
+        columns = {col['name'] for col in inspector.get_columns(table_name)}
+        for column_name in column_names:
+            if column_name in columns:
+                yield table_name, column_name
+
+
+def upgrade() -> None:
+    # The models no longer set these from Python, so the database must.
+    # SQLite deployments are created with create_all, which emits the
+    # defaults from the models directly.
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+    inspector = sa.inspect(conn)
+
+    for table_name, column_name in _existing_columns(inspector):
+        op.alter_column(table_name, column_name, server_default=UTC_NOW)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != 'postgresql':
+        return
+    inspector = sa.inspect(conn)
+
+    for table_name, column_name in _existing_columns(inspector):
+        op.alter_column(table_name, column_name, server_default=None)
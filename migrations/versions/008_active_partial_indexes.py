@@ -0,0 +1,63 @@
+"""Add partial indexes for active backup jobs and alerts
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+PARTIAL_INDEXES = (
+    ('ix_backup_jobs_active_next_run', 'backup_jobs', 'next_run'),
+    ('ix_alerts_active_created_at', 'alerts', 'created_at'),
+)
+
+
+def upgrade() -> None:
+    # Only rows with is_active set are indexed, which is all the scheduler
+    # and the alert lists ever read
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    postgresql = conn.dialect.name == 'postgresql'
+
+    for index_name, table_name, column_name in PARTIAL_INDEXES:
+        if not inspector.has_table(table_name):
+            continue
+        if index_name in {ix['name'] for ix in inspector.get_indexes(table_name)}:
+            continue
+        if postgresql:
+            # CONCURRENTLY avoids locking the table but cannot run in a transaction
+            with op.get_context().autocommit_block():
+                op.create_index(
+                    index_name,
+                    table_name,
+                    [column_name],
+                    postgresql_where=sa.text('is_active'),
+                    postgresql_concurrently=True,
+                )
+        else:
+            op.create_index(
+                index_name, table_name, [column_name], sqlite_where=sa.text('is_active')
+            )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    postgresql = conn.dialect.name == 'postgresql'
+
+    for index_name, table_name, _ in PARTIAL_INDEXES:
+        if not inspector.has_table(table_name):
+            continue
+        if postgresql:
+            with op.get_context().autocommit_block():
+                op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True)
+        else:
+            op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,51 @@
+"""Add a (level, category, timestamp) index on system logs
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'ix_system_logs_level_category_timestamp'
+INDEX_COLUMNS = ['level', 'category', 'timestamp']
+
+
+def upgrade() -> None:
+    # Serves the logs page's level/category filter and its timestamp ordering
+    # from one index; a backward scan covers ORDER BY timestamp DESC
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if not inspector.has_table('system_logs'):
+        return
+    if INDEX_NAME in {ix['name'] for ix in inspector.get_indexes('system_logs')}:
+        return
+
+    if conn.dialect.name == 'postgresql':
+        # CONCURRENTLY avoids locking the table but cannot run in a transaction
+        with op.get_context().autocommit_block():
+            op.create_index(
+                INDEX_NAME, 'system_logs', INDEX_COLUMNS, postgresql_concurrently=True
+            )
+    else:
+        op.create_index(INDEX_NAME, 'system_logs', INDEX_COLUMNS)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    if not inspector.has_table('system_logs'):
+        return
+
+    if conn.dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(INDEX_NAME, table_name='system_logs', postgresql_concurrently=True)
+    else:
+        op.drop_index(INDEX_NAME, table_name='system_logs')
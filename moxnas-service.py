@@ -28,7 +28,7 @@ class MoxNASService:
                 'required': True
             },
             'worker': {
-                'command': [str(self.venv_python), '-m', 'celery', '-A', 'celery_worker.celery', 'worker', '--loglevel=info'],
+                'command': [str(self.venv_python), '-m', 'celery', '-A', 'celery_worker.celery', 'worker', '-Ofair', '--loglevel=info'],
                 'cwd': str(self.base_dir),
                 'env': self._get_env(),
                 'process': None,
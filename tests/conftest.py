@@ -7,7 +7,8 @@ from datetime import datetime
 from app import create_app, db
 from app.models import (
     User, UserRole, StoragePool, StorageDevice, Share, 
-    ShareProtocol, Alert, AlertSeverity, BackupJob, SourceType, DestinationType
+    ShareProtocol, Alert, AlertSeverity, BackupJob, SourceType, DestinationType,
+    DeviceStatus
 )
 
 @pytest.fixture
@@ -197,6 +198,23 @@ def authenticated_user_client(client, app):
             sess['_fresh'] = True
     return client
 
+@pytest.fixture
+def admin_client(client, app, admin_user):
+    """Client logged in as admin that also passes strong session protection
+
+    Flask-Login clears any session whose '_id' does not match the
+    requesting address and User-Agent, so the identifier is set as well.
+    """
+    from flask_login.utils import _create_identifier
+
+    with app.test_request_context(environ_base=client.environ_base):
+        identifier = _create_identifier()
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(admin_user.id)
+        sess['_fresh'] = True
+        sess['_id'] = identifier
+    return client
+
 @pytest.fixture
 def storage_pool(app):
     """Create test storage pool"""
@@ -252,6 +270,41 @@ def storage_device(app, storage_pool):
         db.session.commit()
         return device
 
+class StorageFactory:
+    """Builds committed storage pools and devices inside an app context"""
+
+    def pool(self, name, statuses=()):
+        """Create a pool holding one device per entry in statuses"""
+        pool = StoragePool(
+            name=name,
+            raid_level='raid1',
+            filesystem_type='ext4',
+            mount_point=f'/mnt/{name}',
+        )
+        db.session.add(pool)
+        db.session.commit()
+        for index, status in enumerate(statuses):
+            self.device(f'/dev/{name}{index}', pool, status)
+        return pool
+
+    def device(self, path, pool=None, status=DeviceStatus.HEALTHY):
+        """Create a device, optionally placed in pool"""
+        device = StorageDevice(
+            device_name=path,
+            device_path=path,
+            device_size=500000000,  # 500MB
+            status=status,
+            pool_id=pool.id if pool else None,
+        )
+        db.session.add(device)
+        db.session.commit()
+        return device
+
+@pytest.fixture
+def storage_factory(app):
+    """Factory for storage pools and devices with chosen statuses"""
+    return StorageFactory()
+
 @pytest.fixture
 def nfs_share(app):
     """Create test NFS share"""
@@ -312,6 +312,39 @@ class TestUserModel:
             admin_user.failed_login_attempts = 0
             assert admin_user.failed_login_attempts == 0
     
+    def test_failed_login_increment_is_atomic(self, app, admin_user):
+        """The count is incremented in the database, not from the loaded value"""
+        with app.app_context():
+            user = db.session.get(User, admin_user.id)
+            assert user.failed_login_attempts == 0
+
+            # Another request counts two failures behind this session's back
+            db.session.execute(
+                db.update(User).where(User.id == user.id).values(failed_login_attempts=2)
+                .execution_options(synchronize_session=False)
+            )
+
+            user.increment_failed_login_attempts()
+            db.session.commit()
+
+            assert user.failed_login_attempts == 3
+            assert db.session.scalar(
+                db.select(User.failed_login_attempts).where(User.id == user.id)
+            ) == 3
+            assert not user.is_locked()
+
+    def test_failed_login_increment_locks_at_five(self, app, admin_user):
+        """The fifth failure sets locked_until in the same UPDATE"""
+        with app.app_context():
+            user = db.session.get(User, admin_user.id)
+            for _ in range(5):
+                user.increment_failed_login_attempts()
+            db.session.commit()
+
+            assert user.failed_login_attempts == 5
+            assert user.locked_until is not None
+            assert user.is_locked()
+
     def test_user_activity_tracking(self, app):
         """Test user activity tracking"""
         from datetime import datetime
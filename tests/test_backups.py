@@ -0,0 +1,129 @@
+"""Tests for backup job views"""
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy.exc import IntegrityError
+from app.models import BackupJob, BackupStatus
+from app.backups.routes import _is_duplicate_name
+from app import db
+
+
+def _integrity_error(**fields):
+    """Insert a backup job built from fields and return the IntegrityError"""
+    values = {'source_path': '/mnt/storage', 'destination_path': '/mnt/backups/dup'}
+    values.update(fields)
+    db.session.add(BackupJob(**values))
+    with pytest.raises(IntegrityError) as excinfo:
+        db.session.commit()
+    db.session.rollback()
+    return excinfo.value
+
+
+class TestCreateBackupJob:
+    """Test backup job creation"""
+
+    def test_duplicate_name_detected(self, app, backup_job):
+        """A clash on the name index is reported as a duplicate name"""
+        with app.app_context():
+            error = _integrity_error(name='Test Backup Job')
+            assert _is_duplicate_name(error)
+
+    def test_other_integrity_errors_not_duplicates(self, app):
+        """Constraint failures other than the name index are not duplicates"""
+        with app.app_context():
+            error = _integrity_error(name='other job', source_path=None)  # NOT NULL
+            assert not _is_duplicate_name(error)
+
+    def test_create_duplicate_name_flashes(self, app, admin_client, backup_job, tmp_path):
+        """Posting an existing name flashes the duplicate name error"""
+        with app.app_context():
+            response = admin_client.post('/backups/create', data={
+                'name': 'Test Backup Job',
+                'source_path': str(tmp_path),
+                'destination_path': str(tmp_path / 'dest'),
+                'backup_type': 'full',
+            }, follow_redirects=True)
+            assert b'Backup job name already exists' in response.data
+            assert BackupJob.query.filter_by(name='Test Backup Job').count() == 1
+
+
+def _job_id(name='Test Backup Job'):
+    """Id of a backup job; the backup_job fixture's instance is detached"""
+    return db.session.scalar(db.select(BackupJob.id).where(BackupJob.name == name))
+
+
+def _job_status(job_id):
+    """Stored status of a backup job, or None once it is deleted"""
+    db.session.expire_all()
+    job = db.session.get(BackupJob, job_id)
+    return job.status if job else None
+
+
+@pytest.fixture
+def celery_client():
+    """Celery client stub for the start view; send_task returns task-1"""
+    client = MagicMock()
+    client.send_task.return_value.id = 'task-1'
+    with patch('app.backups.routes._get_celery', return_value=client):
+        yield client
+
+
+class TestStartBackupJob:
+    """Test the conditional UPDATE ... RETURNING start"""
+
+    def test_start_claims_job_once(self, app, admin_client, backup_job, celery_client):
+        """The first start marks the job running, a second one is refused"""
+        with app.app_context():
+            job_id = _job_id()
+            response = admin_client.post(f'/backups/{job_id}/start')
+            assert response.status_code == 200
+            assert response.get_json()['task_id'] == 'task-1'
+            # Deployed workers only consume the default queue
+            assert 'queue' not in celery_client.send_task.call_args.kwargs
+            assert _job_status(job_id) == BackupStatus.RUNNING
+
+            response = admin_client.post(f'/backups/{job_id}/start')
+            assert response.status_code == 400
+            assert celery_client.send_task.call_count == 1
+
+    def test_start_unknown_job(self, app, admin_client, celery_client):
+        """Starting a job that does not exist is a 404"""
+        with app.app_context():
+            assert admin_client.post('/backups/999999/start').status_code == 404
+
+    def test_failed_dispatch_releases_job(self, app, admin_client, backup_job, celery_client):
+        """If the task cannot be sent the job is not left marked running"""
+        with app.app_context():
+            job_id = _job_id()
+            celery_client.send_task.side_effect = ConnectionError('broker down')
+            response = admin_client.post(f'/backups/{job_id}/start')
+            assert response.status_code == 500
+            assert _job_status(job_id) == BackupStatus.SCHEDULED
+
+
+class TestDeleteBackupJob:
+    """Test the conditional DELETE ... RETURNING"""
+
+    def test_delete_idle_job(self, app, admin_client, backup_job):
+        """An idle job is deleted"""
+        with app.app_context():
+            job_id = _job_id()
+            response = admin_client.post(f'/backups/{job_id}/delete')
+            assert response.status_code == 200
+            assert _job_status(job_id) is None
+
+    def test_delete_running_job_refused(self, app, admin_client, backup_job):
+        """A running job is kept"""
+        with app.app_context():
+            job_id = _job_id()
+            job = db.session.get(BackupJob, job_id)
+            job.status = BackupStatus.RUNNING
+            db.session.commit()
+
+            response = admin_client.post(f'/backups/{job_id}/delete')
+            assert response.status_code == 400
+            assert _job_status(job_id) == BackupStatus.RUNNING
+
+    def test_delete_unknown_job(self, app, admin_client):
+        """Deleting a job that does not exist is a 404"""
+        with app.app_context():
+            assert admin_client.post('/backups/999999/delete').status_code == 404
@@ -0,0 +1,56 @@
+"""Tests for error handlers"""
+import os
+from unittest.mock import patch
+from flask import Flask
+from jinja2 import FileSystemBytecodeCache
+from app import _setup_template_cache
+from app.errors.handlers import internal_error
+
+
+class TestInternalError:
+    """Test the 500 handler"""
+
+    def test_rollback_failure_not_written_to_system_log(self, app):
+        """A failing database is not written to from the 500 path"""
+        with app.test_request_context('/broken'):
+            with patch('app.db.session.rollback', side_effect=RuntimeError('db down')), \
+                    patch('app.models.SystemLog.log_event') as log_event:
+                response, status = internal_error(RuntimeError('boom'))
+
+            assert status == 500
+            log_event.assert_not_called()
+
+
+def _bytecode_cache(cache_dir):
+    """Bytecode cache _setup_template_cache configures for cache_dir, if any"""
+    flask_app = Flask(__name__)
+    flask_app.config['JINJA_BYTECODE_CACHE_DIR'] = cache_dir
+    _setup_template_cache(flask_app)
+    return flask_app.jinja_options.get('bytecode_cache')
+
+
+class TestTemplateCache:
+    """Test the Jinja bytecode cache directory checks"""
+
+    def test_default_uses_jinja_private_directory(self):
+        """Without a setting Jinja's own per-user directory is used"""
+        cache = _bytecode_cache(None)
+        assert isinstance(cache, FileSystemBytecodeCache)
+        assert os.stat(cache.directory).st_mode & 0o077 == 0
+
+    def test_private_directory_used(self, tmp_path):
+        """A directory created for this user is used"""
+        cache_dir = str(tmp_path / 'jinja')
+        assert _bytecode_cache(cache_dir).directory == cache_dir
+        assert os.stat(cache_dir).st_mode & 0o777 == 0o700
+
+    def test_shared_directory_rejected(self, tmp_path):
+        """A directory others can write to is not trusted"""
+        cache_dir = tmp_path / 'jinja'
+        cache_dir.mkdir()
+        cache_dir.chmod(0o777)
+        assert _bytecode_cache(str(cache_dir)) is None
+
+    def test_empty_setting_disables(self):
+        """An empty setting turns the cache off"""
+        assert _bytecode_cache('') is None
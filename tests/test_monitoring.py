@@ -0,0 +1,166 @@
+"""Tests for monitoring views and APIs"""
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+import pytest
+from unittest.mock import patch
+from app.monitoring import routes as monitoring_routes
+from app.models import (
+    StorageDevice, DeviceStatus, Alert, AlertSeverity, SystemLog, LogLevel,
+)
+from app import db
+
+
+def _alert(title):
+    """Create an active alert"""
+    alert = Alert(
+        title=title,
+        message=f'{title} message',
+        severity=AlertSeverity.MEDIUM,
+        category='test',
+    )
+    db.session.add(alert)
+    db.session.commit()
+    return alert
+
+
+class TestStorageHealthAPI:
+    """Test /monitoring/api/storage/health"""
+
+    def test_pool_device_count_matches_devices(self, app, admin_client, storage_factory):
+        """Per-pool device counts agree with the device rows"""
+        with app.app_context():
+            pool = storage_factory.pool('health_pool', [DeviceStatus.HEALTHY, DeviceStatus.FAILED])
+            device = StorageDevice.query.filter_by(pool_id=pool.id).first()
+            db.session.delete(device)
+            db.session.commit()
+
+            response = admin_client.get('/monitoring/api/storage/health')
+            assert response.status_code == 200
+            data = json.loads(response.data)
+
+            pools = {entry['name']: entry for entry in data['pools']}
+            assert pools['health_pool']['device_count'] == 1
+            assert data['summary']['total_devices'] == 1
+
+    def test_pools_page_shows_device_count(self, app, admin_client, storage_factory):
+        """The pools page renders the stored device count"""
+        with app.app_context():
+            storage_factory.pool('page_pool', [DeviceStatus.HEALTHY] * 3)
+
+            response = admin_client.get('/storage/pools')
+            assert response.status_code == 200
+            assert b'3 devices' in response.data
+
+    def test_summary_only_flag(self, app, admin_client, storage_factory):
+        """summary_only=0 keeps the listings, summary_only=1 drops them"""
+        with app.app_context():
+            storage_factory.pool('flag_pool', [DeviceStatus.HEALTHY])
+
+            data = json.loads(admin_client.get('/monitoring/api/storage/health?summary_only=0').data)
+            assert len(data['pools']) == 1
+            assert len(data['devices']) == 1
+
+            data = json.loads(admin_client.get('/monitoring/api/storage/health?summary_only=1').data)
+            assert data['pools'] == []
+            assert data['devices'] == []
+            assert data['summary']['total_devices'] == 1
+
+
+class TestNetworkActivityAPI:
+    """Test /monitoring/api/network/activity"""
+
+    def test_summary_only_flag(self, app, admin_client, smb_share):
+        """summary_only=0 keeps the share listing, summary_only=1 drops it"""
+        with app.app_context():
+            data = json.loads(admin_client.get('/monitoring/api/network/activity?summary_only=0').data)
+            assert [share['name'] for share in data['shares']] == ['test_smb_share']
+
+            data = json.loads(admin_client.get('/monitoring/api/network/activity?summary_only=1').data)
+            assert data['shares'] == []
+            assert 'smb' in data['protocols']
+
+
+class TestProcessSampler:
+    """Test the background process sampler"""
+
+    def test_failed_scan_unregisters_thread(self):
+        """A scan that raises leaves no stale thread behind"""
+        state = monitoring_routes._proc_state
+        with patch.dict(state, {"thread": threading.current_thread()}), \
+                patch.object(monitoring_routes, "_sample_processes", side_effect=OSError("proc")):
+            with pytest.raises(OSError):
+                monitoring_routes._process_sampler()
+            assert state["thread"] is None
+
+
+class TestAlertAcknowledge:
+    """Test acknowledging alerts"""
+
+    def test_acknowledge_route(self, app, admin_client, admin_user):
+        """The route acknowledges the alert and 404s for unknown ids"""
+        with app.app_context():
+            alert_id = _alert('route alert').id
+
+            response = admin_client.post(f'/monitoring/alerts/{alert_id}/acknowledge')
+            assert response.status_code == 200
+
+            db.session.expire_all()
+            alert = db.session.get(Alert, alert_id)
+            assert alert.is_active is False
+            assert alert.acknowledged_by_id == admin_user.id
+            assert alert.acknowledged_at is not None
+
+            response = admin_client.post('/monitoring/alerts/999999/acknowledge')
+            assert response.status_code == 404
+
+    def test_acknowledge_instance(self, app, admin_user):
+        """Alert.acknowledge updates the row and the loaded instance alike"""
+        with app.app_context():
+            alert = _alert('model alert')
+            alert.acknowledge(admin_user.id)
+            assert alert.is_active is False
+            assert alert.acknowledged_at is not None
+            db.session.commit()
+
+            row = db.session.execute(
+                db.select(Alert.is_active, Alert.acknowledged_by_id).where(Alert.id == alert.id)
+            ).one()
+            assert row == (False, admin_user.id)
+
+
+class TestLogsPaging:
+    """Test keyset paging of the logs page"""
+
+    def _page(self, admin_client, **params):
+        """Fetch one logs page and return what it would render"""
+        with patch.object(monitoring_routes, 'render_template', return_value='') as render:
+            response = admin_client.get('/monitoring/logs', query_string=dict(category='paging', **params))
+        assert response.status_code == 200
+        return render.call_args.kwargs
+
+    def test_pages_cover_every_row_once(self, app, admin_client):
+        """Following next_cursor visits each row exactly once, newest first"""
+        with app.app_context():
+            per_page = monitoring_routes.LOGS_PER_PAGE
+            base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+            # Pairs of rows share a timestamp so the id tiebreak is exercised
+            SystemLog.bulk_log([
+                {'level': LogLevel.INFO, 'category': 'paging', 'message': f'row {n}',
+                 'timestamp': base + timedelta(seconds=n // 2)}
+                for n in range(per_page + 5)
+            ])
+
+            first = self._page(admin_client)
+            assert len(first['logs']) == per_page
+            assert first['is_first_page']
+            assert first['next_cursor'] is not None
+
+            second = self._page(admin_client, **first['next_cursor'])
+            assert len(second['logs']) == 5
+            assert not second['is_first_page']
+            assert second['next_cursor'] is None
+
+            rows = [(log.timestamp, log.id) for log in first['logs'] + second['logs']]
+            assert len(set(rows)) == per_page + 5
+            assert rows == sorted(rows, reverse=True)
@@ -0,0 +1,236 @@
+"""Tests for the Proxmox API client"""
+import orjson
+import requests
+from unittest.mock import Mock, patch
+from urllib3.response import HTTPResponse
+from app.proxmox.integration import (
+    ProxmoxAPIClient, ProxmoxCredentials, ProxmoxTemplateManager, RETRY_MAX_WAIT,
+    _AUTH_CACHE, _BoundedRetry,
+)
+
+
+def _response(status_code, body=None, headers=None):
+    """A requests.Response as the Proxmox API would send it"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = orjson.dumps(body) if body is not None else b""
+    response.headers.update(headers or {})
+    return response
+
+
+def _client():
+    """Client for a host that is never contacted; tests stub its session"""
+    return ProxmoxAPIClient(ProxmoxCredentials(host="pve.test", password="secret"))
+
+
+class TestRequestLogging:
+    """Test what failed requests write to SystemLog"""
+
+    def test_failed_put_redacts_credentials(self, app):
+        """Passwords and tokens in the request body are masked in the log"""
+        with app.app_context():
+            client = _client()
+            client.session.request = Mock(return_value=_response(500, {"errors": "boom"}))
+            with patch("app.proxmox.integration.SystemLog.log_event") as log_event:
+                success, _ = client.put("storage/nas", {
+                    "server": "10.0.0.5",
+                    "password": "hunter2",
+                    "api_token_secret": "abc",
+                })
+
+            assert not success
+            logged = log_event.call_args.kwargs["details"]["data"]
+            assert logged == {"server": "10.0.0.5", "password": "***", "api_token_secret": "***"}
+
+    def test_request_error_redacts_credentials(self, app):
+        """The exception path masks credentials too"""
+        with app.app_context():
+            client = _client()
+            client.session.request = Mock(side_effect=requests.ConnectionError("down"))
+            with patch("app.proxmox.integration.SystemLog.log_event") as log_event:
+                success, _ = client.put("storage/nas", {"password": "hunter2"})
+
+            assert not success
+            assert log_event.call_args.kwargs["details"]["data"] == {"password": "***"}
+
+
+class TestRetryWaits:
+    """Test that retries never wait longer than RETRY_MAX_WAIT in total"""
+
+    def test_post_retry_after_capped(self, app):
+        """A long Retry-After uses up the budget and stops further retries"""
+        with app.app_context():
+            client = _client()
+            throttled = _response(429, headers={"Retry-After": "60"})
+            client.session.post = Mock(side_effect=[throttled, throttled, _response(200, {"data": 1})])
+            with patch("app.proxmox.integration.time.sleep") as sleep:
+                success, result = client.post("nodes/pve/qemu", {"vmid": 100})
+
+            assert not success
+            waits = [call.args[0] for call in sleep.call_args_list]
+            assert waits == [RETRY_MAX_WAIT]
+            assert client.session.post.call_count == 2
+
+    def test_post_retried_after_short_wait(self, app):
+        """A throttled POST is resent and its result returned"""
+        with app.app_context():
+            client = _client()
+            throttled = _response(503, headers={"Retry-After": "1"})
+            client.session.post = Mock(side_effect=[throttled, _response(200, {"data": "UPID"})])
+            with patch("app.proxmox.integration.time.sleep") as sleep:
+                success, result = client.post("nodes/pve/qemu", {"vmid": 100})
+
+            assert success and result == {"data": "UPID"}
+            sleep.assert_called_once_with(1.0)
+
+    def test_urllib3_retry_after_capped(self):
+        """The idempotent-method Retry cuts Retry-After to the remaining budget"""
+        response = HTTPResponse(status=503, headers={"Retry-After": "120"})
+        assert _BoundedRetry(total=3).get_retry_after(response) == RETRY_MAX_WAIT
+
+        retry = _BoundedRetry(total=3, waited=RETRY_MAX_WAIT - 2).new(total=2)
+        assert retry.get_retry_after(response) == 2
+        assert retry.get_backoff_time() <= 2
+
+
+class TestTemplateManager:
+    """Test ProxmoxTemplateManager"""
+
+    def test_list_templates_filters_server_side(self):
+        """Only container templates are requested from Proxmox"""
+        api = Mock()
+        api.get.return_value = (True, {"data": [{"volid": "local:vztmpl/debian.tar.zst"}]})
+
+        templates = ProxmoxTemplateManager(api).list_templates("pve", "local")
+
+        assert templates == [{"volid": "local:vztmpl/debian.tar.zst"}]
+        api.get.assert_called_once_with(
+            "/nodes/pve/storage/local/content", params={"content": "vztmpl"}
+        )
+
+
+class TestGetCache:
+    """Test the short-lived cache of status reads"""
+
+    def test_status_reads_reused(self, app):
+        """Repeat reads of a cacheable endpoint hit Proxmox once"""
+        with app.app_context():
+            client = _client()
+            client.session.request = Mock(return_value=_response(200, {"data": [{"id": "node/pve"}]}))
+
+            first = client.get("cluster/resources")
+            second = client.get("/cluster/resources/")
+
+            assert first == second == (True, {"data": [{"id": "node/pve"}]})
+            assert client.session.request.call_count == 1
+
+    def test_writes_clear_cache(self, app):
+        """A write drops cached reads so the next read is fresh"""
+        with app.app_context():
+            client = _client()
+            client.session.request = Mock(return_value=_response(200, {"data": []}))
+
+            client.get("storage")
+            client.put("storage/nas", {"content": "backup"})
+            client.get("storage")
+
+            methods = [call.args[0] for call in client.session.request.call_args_list]
+            assert methods == ["GET", "PUT", "GET"]
+
+    def test_other_endpoints_not_cached(self, app):
+        """Endpoints outside the status allow-list are always fetched"""
+        with app.app_context():
+            client = _client()
+            client.session.request = Mock(return_value=_response(200, {"data": []}))
+
+            client.get("nodes/pve/qemu")
+            client.get("nodes/pve/qemu")
+
+            assert client.session.request.call_count == 2
+
+
+class TestAuthCache:
+    """Test reuse of tickets and token checks between clients"""
+
+    _TICKET = {"data": {"ticket": "PVE:root@pam:1", "CSRFPreventionToken": "csrf"}}
+
+    def test_ticket_reused_by_new_client(self, app):
+        """A second client with the same credentials skips the login"""
+        with app.app_context(), patch.dict(_AUTH_CACHE, clear=True), \
+                patch("app.proxmox.integration.SystemLog.log_event"):
+            first = _client()
+            first.session.post = Mock(return_value=_response(200, self._TICKET))
+            assert first.authenticate()[0]
+
+            second = _client()
+            second.session.post = Mock()
+            ok, message = second.authenticate()
+
+            assert ok and "cached" in message
+            second.session.post.assert_not_called()
+            assert second.session.cookies.get("PVEAuthCookie") == "PVE:root@pam:1"
+
+    def test_changed_password_not_reused(self, app):
+        """A ticket is only reused for the password it was issued for"""
+        with app.app_context(), patch.dict(_AUTH_CACHE, clear=True), \
+                patch("app.proxmox.integration.SystemLog.log_event"):
+            first = _client()
+            first.session.post = Mock(return_value=_response(200, self._TICKET))
+            first.authenticate()
+
+            other = ProxmoxAPIClient(ProxmoxCredentials(host="pve.test", password="changed"))
+            other.session.post = Mock(return_value=_response(401))
+            assert not other.authenticate()[0]
+            other.session.post.assert_called_once()
+
+    def test_rejected_ticket_forgotten(self, app):
+        """A 401 from Proxmox drops the remembered ticket"""
+        with app.app_context(), patch.dict(_AUTH_CACHE, clear=True), \
+                patch("app.proxmox.integration.SystemLog.log_event"):
+            client = _client()
+            client.session.post = Mock(return_value=_response(200, self._TICKET))
+            client.authenticate()
+            assert _AUTH_CACHE
+
+            client.session.request = Mock(return_value=_response(401))
+            assert not client.get("nodes/pve/qemu")[0]
+            assert not _AUTH_CACHE
+
+
+class TestETagRevalidation:
+    """Test conditional GETs once a cached status read expires"""
+
+    def test_not_modified_reuses_body(self, app):
+        """After expiry the read is revalidated and a 304 reuses the old body"""
+        with app.app_context():
+            client = _client()
+            body = {"data": [{"storage": "local"}]}
+            client.session.request = Mock(side_effect=[
+                _response(200, body, headers={"ETag": '"v1"'}),
+                _response(304),
+            ])
+
+            assert client.get("storage") == (True, body)
+            client._get_cache.clear()  # as if GET_CACHE_TTL had passed
+            assert client.get("storage") == (True, body)
+
+            first, second = client.session.request.call_args_list
+            assert first.kwargs["headers"] is None
+            assert second.kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    def test_changed_resource_replaces_body(self, app):
+        """A 200 on revalidation returns and remembers the new body"""
+        with app.app_context():
+            client = _client()
+            client.session.request = Mock(side_effect=[
+                _response(200, {"data": 1}, headers={"ETag": '"v1"'}),
+                _response(200, {"data": 2}, headers={"ETag": '"v2"'}),
+                _response(304),
+            ])
+
+            client.get("storage")
+            client._get_cache.clear()
+            assert client.get("storage") == (True, {"data": 2})
+            client._get_cache.clear()
+            assert client.get("storage") == (True, {"data": 2})
+            assert client.session.request.call_args.kwargs["headers"] == {"If-None-Match": '"v2"'}
@@ -0,0 +1,73 @@
+"""Tests for security hardening helpers"""
+import threading
+from unittest.mock import patch
+from app.security.hardening import RateLimiter
+
+
+class TestRateLimiter:
+    """Test RateLimiter"""
+
+    def test_limits_within_window(self):
+        """Attempts past max_attempts inside the window are refused"""
+        limiter = RateLimiter()
+        with patch('app.security.hardening.time.time', return_value=1000.0):
+            results = [limiter.is_rate_limited('10.0.0.1', max_attempts=3, window=60) for _ in range(4)]
+        assert results == [False, False, False, True]
+
+    def test_old_attempts_expire(self):
+        """Attempts older than the window no longer count"""
+        limiter = RateLimiter()
+        with patch('app.security.hardening.time.time') as clock:
+            for now in (1000.0, 1010.0, 1020.0):
+                clock.return_value = now
+                assert not limiter.is_rate_limited('10.0.0.1', max_attempts=3, window=60)
+
+            clock.return_value = 1030.0
+            assert limiter.is_rate_limited('10.0.0.1', max_attempts=3, window=60)
+
+            # The attempt at 1000 has left the window; 1010 and 1020 remain
+            clock.return_value = 1061.0
+            assert not limiter.is_rate_limited('10.0.0.1', max_attempts=3, window=60)
+            assert limiter.is_rate_limited('10.0.0.1', max_attempts=3, window=60)
+
+    def test_identifiers_counted_separately(self):
+        """One client hitting its limit does not limit another"""
+        limiter = RateLimiter()
+        assert not limiter.is_rate_limited('10.0.0.1', max_attempts=1)
+        assert limiter.is_rate_limited('10.0.0.1', max_attempts=1)
+        assert not limiter.is_rate_limited('10.0.0.2', max_attempts=1)
+
+    def test_concurrent_attempts_counted_exactly(self):
+        """Racing requests for one identifier get exactly max_attempts through"""
+        limiter = RateLimiter()
+        start = threading.Barrier(20)
+        allowed = []
+
+        def attempt():
+            start.wait()
+            for _ in range(10):
+                if not limiter.is_rate_limited('10.0.0.1', max_attempts=50, window=300):
+                    allowed.append(True)
+
+        threads = [threading.Thread(target=attempt) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(allowed) == 50
+
+    def test_idle_identifiers_evicted(self):
+        """Past RATE_LIMIT_MAX_IDENTIFIERS the least recently seen client is dropped"""
+        with patch('app.security.hardening.RATE_LIMIT_SHARDS', 1), \
+                patch('app.security.hardening.RATE_LIMIT_MAX_IDENTIFIERS', 2):
+            limiter = RateLimiter()
+            assert not limiter.is_rate_limited('10.0.0.1', max_attempts=1)
+            assert not limiter.is_rate_limited('10.0.0.2', max_attempts=1)
+            assert not limiter.is_rate_limited('10.0.0.3', max_attempts=1)
+
+            _, store = limiter._shards[0]
+            assert len(store) == 2
+            # 10.0.0.1 was evicted, so its history is gone
+            assert not limiter.is_rate_limited('10.0.0.1', max_attempts=1)
+            assert limiter.is_rate_limited('10.0.0.3', max_attempts=1)
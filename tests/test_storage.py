@@ -407,4 +407,104 @@ class TestStorageIntegration:
             # Pool should be degraded if any device is failed
             # This would require implementing the health calculation logic
             # For now, just verify devices are associated
-            assert len(storage_pool.devices) >= 2
\ No newline at end of file
+            assert len(storage_pool.devices) >= 2
+
+class TestPoolDeviceCounters:
+    """Test the denormalized device counters on StoragePool"""
+
+    def _counters(self, pool):
+        db.session.expire(pool)
+        return (pool.device_count, pool.healthy_count, pool.warning_count, pool.failed_count)
+
+    def test_counters_follow_insert_update_and_delete(self, app, storage_factory):
+        """Counters track devices added to, changed in and removed from a pool"""
+        with app.app_context():
+            pool = storage_factory.pool('counter_pool')
+            other = storage_factory.pool('other_pool')
+            healthy = storage_factory.device('/dev/sdb', pool)
+            failed = storage_factory.device('/dev/sdc', pool, DeviceStatus.SMART_FAIL)
+            assert self._counters(pool) == (2, 1, 0, 1)
+
+            healthy.status = DeviceStatus.WARNING
+            db.session.commit()
+            assert self._counters(pool) == (2, 0, 1, 1)
+
+            failed.pool_id = other.id
+            db.session.commit()
+            assert self._counters(pool) == (1, 0, 1, 0)
+            assert self._counters(other) == (1, 0, 0, 1)
+
+            db.session.delete(healthy)
+            db.session.commit()
+            assert self._counters(pool) == (0, 0, 0, 0)
+
+    def test_assigning_unpooled_device(self, app, storage_factory):
+        """A device placed in a pool for the first time is counted"""
+        with app.app_context():
+            pool = storage_factory.pool('counter_pool')
+            device = storage_factory.device('/dev/sdb')
+            assert self._counters(pool) == (0, 0, 0, 0)
+
+            device.pool_id = pool.id
+            db.session.commit()
+            assert self._counters(pool) == (1, 1, 0, 0)
+
+    def test_delete_partially_loaded_device(self, app, storage_factory):
+        """Deleting a device whose pool and status were never loaded"""
+        with app.app_context():
+            pool_id = storage_factory.pool('counter_pool').id
+            device_id = storage_factory.device('/dev/sdb', db.session.get(StoragePool, pool_id)).id
+            storage_factory.device('/dev/sdc', db.session.get(StoragePool, pool_id), DeviceStatus.WARNING)
+            db.session.expunge_all()
+
+            device = db.session.scalars(
+                db.select(StorageDevice)
+                .options(db.load_only(StorageDevice.id))
+                .where(StorageDevice.id == device_id)
+            ).one()
+            db.session.delete(device)
+            db.session.commit()
+
+            assert self._counters(db.session.get(StoragePool, pool_id)) == (1, 0, 1, 0)
+
+    def test_device_scan_resets_counters(self, app, admin_client, storage_factory):
+        """The bulk delete in the device scan does not leave stale counters"""
+        with app.app_context():
+            pool = storage_factory.pool('counter_pool')
+            storage_factory.device('/dev/sdb', pool)
+            storage_factory.device('/dev/sdc', pool, DeviceStatus.FAILED)
+            assert self._counters(pool) == (2, 1, 0, 1)
+
+            with patch('app.storage.routes.SystemStorageDetector') as detector:
+                detector.return_value.scan_all_devices.return_value = []
+                response = admin_client.post('/storage/devices/scan')
+
+            assert response.status_code == 200
+            assert json.loads(response.data)['success']
+            assert self._counters(pool) == (0, 0, 0, 0)
+
+
+class TestStorageAggregates:
+    """Test the shared storage aggregates cache"""
+
+    def test_invalidate_refreshes_cached_counts(self, app):
+        """Cached counts are reused until invalidate_storage_aggregates"""
+        from app.utils.aggregates import get_storage_aggregates, invalidate_storage_aggregates
+
+        with app.app_context():
+            app.config['STORAGE_AGGREGATES_CACHE'] = True
+            invalidate_storage_aggregates()
+            assert get_storage_aggregates()[DeviceStatus.HEALTHY] == 0
+
+            db.session.add(StorageDevice(
+                device_name='/dev/agg0',
+                device_path='/dev/agg0',
+                device_size=500000000,
+                status=DeviceStatus.HEALTHY,
+            ))
+            db.session.commit()
+            assert get_storage_aggregates()[DeviceStatus.HEALTHY] == 0
+
+            invalidate_storage_aggregates()
+            assert get_storage_aggregates()[DeviceStatus.HEALTHY] == 1
+            invalidate_storage_aggregates()
@@ -0,0 +1,182 @@
+"""Tests for SystemLog writes"""
+import json
+import logging
+import os
+import pytest
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timezone
+from unittest.mock import patch
+from app.models import SystemLog, LogLevel, _write_log_batch, flush_logs
+from app.utils.enhanced_logging import JSONLineFormatter, ship_error_log
+from app import db
+
+
+def _row(message, **overrides):
+    """A queued SystemLog row as log_event builds it"""
+    row = {
+        'timestamp': datetime.now(timezone.utc),
+        'level': LogLevel.INFO,
+        'category': 'test',
+        'message': message,
+        'user_id': None,
+        'ip_address': None,
+        'details': None,
+    }
+    row.update(overrides)
+    return row
+
+
+class TestSystemLogQueue:
+    """Test the SystemLog write-behind queue"""
+
+    def test_log_event_inline(self, app):
+        """With async logging off the entry is written before log_event returns"""
+        with app.app_context():
+            SystemLog.log_event(level=LogLevel.INFO, category='test', message='inline')
+            assert SystemLog.query.filter_by(message='inline').count() == 1
+
+    def test_queued_entries_written_on_flush(self, app):
+        """Queued entries reach the table once the queue is flushed"""
+        with app.app_context():
+            app.config['SYSTEM_LOG_ASYNC'] = True
+            # Keep the writer thread out of it so the flush does the write
+            with patch('app.models._ensure_log_writer'):
+                SystemLog.log_event(
+                    level=LogLevel.WARNING, category='test', message='queued',
+                    details={'key': 'value'},
+                )
+                assert SystemLog.query.filter_by(message='queued').count() == 0
+                flush_logs()
+
+            db.session.expire_all()
+            entry = SystemLog.query.filter_by(message='queued').one()
+            assert entry.level == LogLevel.WARNING
+            assert entry.details == {'key': 'value'}
+
+    def test_failed_batch_keeps_good_rows(self, app, caplog):
+        """One bad row does not drop the rest of its batch"""
+        with app.app_context():
+            batch = [
+                (app, _row('first')),
+                (app, _row(None)),  # message is NOT NULL
+                (app, _row('third')),
+            ]
+            with caplog.at_level(logging.WARNING, logger='app.models'):
+                _write_log_batch(batch)
+
+            db.session.expire_all()
+            messages = {entry.message for entry in SystemLog.query.filter_by(category='test')}
+            assert messages == {'first', 'third'}
+            assert 'retrying row by row' in caplog.text
+            assert 'Dropped SystemLog entry' in caplog.text
+
+
+class TestSystemLogBulk:
+    """Test SystemLog.bulk_log"""
+
+    def test_bulk_log_writes_all_entries(self, app):
+        """Every entry is written, with its own timestamp when given"""
+        with app.app_context():
+            stamp = datetime(2026, 1, 1, tzinfo=timezone.utc)
+            SystemLog.bulk_log([
+                {'level': LogLevel.INFO, 'category': 'bulk', 'message': 'one'},
+                {'level': LogLevel.ERROR, 'category': 'bulk', 'message': 'two',
+                 'timestamp': stamp, 'details': {'n': 2}},
+            ])
+
+            entries = {entry.message: entry for entry in SystemLog.query.filter_by(category='bulk')}
+            assert set(entries) == {'one', 'two'}
+            assert entries['two'].level == LogLevel.ERROR
+            assert entries['two'].details == {'n': 2}
+            assert entries['two'].timestamp.replace(tzinfo=timezone.utc) == stamp
+
+    def test_bulk_log_error_rolls_back(self, app):
+        """A failing batch raises and writes nothing"""
+        with app.app_context():
+            with pytest.raises(IntegrityError):
+                SystemLog.bulk_log([
+                    {'level': LogLevel.INFO, 'category': 'bulk', 'message': 'valid'},
+                    {'level': LogLevel.INFO, 'category': 'bulk', 'message': None},
+                ])
+            assert SystemLog.query.filter_by(category='bulk').count() == 0
+
+
+def _append_error_lines(path, *messages):
+    """Append error-sink lines as JSONLineFormatter writes them"""
+    with open(path, 'a') as f:
+        for message in messages:
+            f.write(json.dumps({
+                'timestamp': '2026-01-01T00:00:00',
+                'level': 'error',
+                'category': 'shipping',
+                'message': message,
+            }) + '\n')
+
+
+def _shipped_messages():
+    db.session.expire_all()
+    return sorted(entry.message for entry in SystemLog.query.filter_by(category='shipping'))
+
+
+class TestErrorLogShipping:
+    """Test ship_error_log"""
+
+    def test_ships_each_line_once(self, app, tmp_path):
+        """Lines are shipped once; a partial last line waits for the next run"""
+        with app.app_context():
+            path = str(tmp_path / 'errors.jsonl')
+            _append_error_lines(path, 'a', 'b')
+            with open(path, 'a') as f:
+                f.write('{"timestamp": "2026-01-01T00:00:00", "lev')
+
+            assert ship_error_log(path) == 2
+            assert ship_error_log(path) == 0
+            assert _shipped_messages() == ['a', 'b']
+
+    def test_rotation_keeps_lines_of_old_file(self, app, tmp_path):
+        """Lines written before rotation are read from the backup, the new file from the start"""
+        with app.app_context():
+            path = str(tmp_path / 'errors.jsonl')
+            _append_error_lines(path, 'a')
+            ship_error_log(path)
+
+            _append_error_lines(path, 'b')
+            os.rename(path, f'{path}.1')
+            # The new file is already longer than the old offset
+            _append_error_lines(path, 'c', 'd', 'e')
+
+            assert ship_error_log(path) == 4
+            assert _shipped_messages() == ['a', 'b', 'c', 'd', 'e']
+
+    def test_bad_row_does_not_block_shipping(self, app, tmp_path, caplog):
+        """A row the database rejects is dropped and the rest are shipped"""
+        with app.app_context():
+            path = str(tmp_path / 'errors.jsonl')
+            _append_error_lines(path, 'a', None, 'c')  # message is NOT NULL
+
+            with caplog.at_level(logging.WARNING):
+                assert ship_error_log(path) == 3
+            assert _shipped_messages() == ['a', 'c']
+            assert 'Dropped SystemLog entry' in caplog.text
+
+            _append_error_lines(path, 'd')
+            ship_error_log(path)
+            assert _shipped_messages() == ['a', 'c', 'd']
+
+    def test_shipping_scheduled_on_worker_app(self, app):
+        """The Celery app the installer's beat runs schedules the shipper"""
+        from app import make_celery
+
+        celery = make_celery(app)
+        from app import tasks  # noqa: F401  registers the shared tasks
+
+        entry = celery.conf.beat_schedule['ship-error-logs']
+        assert entry['task'] in celery.tasks
+        assert 'options' not in entry  # default queue, which every worker consumes
+
+    def test_formatter_writes_utc_timestamps(self):
+        """Sink lines carry an explicit UTC offset"""
+        record = logging.LogRecord('moxnas.error_sink', logging.ERROR, __file__, 1, 'boom', None, None)
+        record.created = 0.0
+        line = json.loads(JSONLineFormatter().format(record))
+        assert datetime.fromisoformat(line['timestamp']) == datetime(1970, 1, 1, tzinfo=timezone.utc)